@@ -12,6 +12,8 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from app.database import Base
 from app.models.lead import Lead  # noqa: F401 — ensure models are registered
+from app.models.email_outbox import EmailOutbox  # noqa: F401
+from app.models.lead_counter import LeadCounter  # noqa: F401
 
 config = context.config
 if config.config_file_name is not None:
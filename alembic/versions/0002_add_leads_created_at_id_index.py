@@ -0,0 +1,31 @@
+"""add (created_at, id) index for keyset pagination
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build concurrently so an existing, large leads table stays writable.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_leads_created_at_id",
+            "leads",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_leads_created_at_id", table_name="leads", postgresql_concurrently=True)
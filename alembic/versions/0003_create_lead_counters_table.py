@@ -0,0 +1,41 @@
+"""create lead_counters rollup table
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "lead_counters",
+        sa.Column("name", sa.String(32), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    # Seed from live data under a share lock so no insert slips between the
+    # count and the first incremental update.
+    op.execute("LOCK TABLE leads IN SHARE MODE")
+    op.execute(
+        """
+        INSERT INTO lead_counters (name, value)
+        SELECT 'total', count(*) FROM leads
+        UNION ALL
+        SELECT 'PENDING', count(*) FROM leads WHERE status = 'PENDING'
+        UNION ALL
+        SELECT 'REACHED_OUT', count(*) FROM leads WHERE status = 'REACHED_OUT'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("lead_counters")
@@ -0,0 +1,44 @@
+"""create email_outbox table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+outboxstatus_enum = sa.Enum("PENDING", "SENT", "DEAD", name="outboxstatus")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), primary_key=True),
+        sa.Column("recipient", sa.String(255), nullable=False),
+        sa.Column("subject", sa.String(255), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("status", outboxstatus_enum, nullable=False, server_default="PENDING"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_email_outbox_status_next_attempt_at", "email_outbox", ["status", "next_attempt_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_email_outbox_status_next_attempt_at", table_name="email_outbox")
+    op.drop_table("email_outbox")
+    op.execute("DROP TYPE IF EXISTS outboxstatus")
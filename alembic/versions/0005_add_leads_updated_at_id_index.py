@@ -0,0 +1,31 @@
+"""add (updated_at, id) index for the change feed
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build concurrently so an existing, large leads table stays writable.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_leads_updated_at_id",
+            "leads",
+            ["updated_at", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_leads_updated_at_id", table_name="leads", postgresql_concurrently=True)
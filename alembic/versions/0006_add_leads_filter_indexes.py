@@ -0,0 +1,37 @@
+"""add indexes behind the lead list filters
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_leads_status_created_at_id": ["status", "created_at", "id"],
+    "ix_leads_lower_email": [sa.text("lower(email)")],
+    # text_pattern_ops so LIKE 'prefix%' is an index range under any collation.
+    "ix_leads_lower_first_name": [sa.text("lower(first_name) text_pattern_ops")],
+    "ix_leads_lower_last_name": [sa.text("lower(last_name) text_pattern_ops")],
+}
+
+
+def upgrade() -> None:
+    # Build concurrently so an existing, large leads table stays writable.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(name, "leads", columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in reversed(INDEXES):
+            op.drop_index(name, table_name="leads", postgresql_concurrently=True)
@@ -1,41 +1,147 @@
+import math
+import time
 from collections.abc import AsyncGenerator
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.core.email import ConsoleEmailBackend, EmailBackend
-from app.core.storage import LocalStorageBackend, StorageBackend
-from app.database import async_session_factory
+from app.core.events import EventBroker
+from app.core.hashing import PasswordHasher
+from app.core.storage import StorageBackend
+from app.repositories.lead_batch_writer import LeadBatchWriter
 from app.repositories.lead_repository import LeadRepository
-from app.services.auth_service import verify_token
+from app.repositories.outbox_repository import OutboxRepository
+from app.resources import Resources
+from app.services.auth_service import token_cache, verify_token
+from app.services.email_dispatcher import EmailDispatcher
 from app.services.lead_service import LeadService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Set on responses to writes while a read replica is configured: until the
+# time it holds, the client's reads go to the primary (read-your-writes).
+READ_PRIMARY_COOKIE = "read_primary_until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_factory() as session:
+
+def get_resources(request: Request) -> Resources:
+    # Built with the app; without a lifespan (in-process test clients) it is
+    # used unstarted, so the background workers stay off.
+    return request.app.state.resources
+
+
+async def get_db(resources: Resources = Depends(get_resources)) -> AsyncGenerator[AsyncSession, None]:
+    async with resources.session_factory() as session:
+        yield session
+
+
+def _reads_pinned_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def pin_reads_to_primary(response: Response) -> None:
+    window = settings.READ_AFTER_WRITE_SECONDS
+    response.set_cookie(
+        READ_PRIMARY_COOKIE,
+        f"{time.time() + window:.3f}",
+        max_age=math.ceil(window),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+async def get_read_db(
+    request: Request,
+    resources: Resources = Depends(get_resources),
+    primary: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """A session on the read replica, or on the primary when there is none.
+
+    A client that wrote within ``READ_AFTER_WRITE_SECONDS`` reads from the
+    primary too, so it sees its own write despite replication lag.  The
+    primary session is only opened if used, so asking for it costs nothing.
+    """
+    if resources.read_session_factory is None or _reads_pinned_to_primary(request):
+        yield primary
+        return
+    async with resources.read_session_factory() as session:
         yield session
 
 
-def get_storage() -> StorageBackend:
-    return LocalStorageBackend(settings.UPLOAD_DIR)
+def get_storage(resources: Resources = Depends(get_resources)) -> StorageBackend:
+    return resources.storage
+
 
+def get_password_hasher(resources: Resources = Depends(get_resources)) -> PasswordHasher:
+    return resources.password_hasher
 
-def get_email() -> EmailBackend:
-    return ConsoleEmailBackend()
+
+def get_lead_batch_writer(resources: Resources = Depends(get_resources)) -> LeadBatchWriter | None:
+    return resources.lead_batch_writer
+
+
+def get_event_broker(resources: Resources = Depends(get_resources)) -> EventBroker | None:
+    return resources.event_broker
+
+
+def require_event_broker(broker: EventBroker | None = Depends(get_event_broker)) -> EventBroker:
+    if broker is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Live events are not enabled",
+        )
+    return broker
 
 
 async def get_lead_service(
+    request: Request,
+    response: Response,
+    resources: Resources = Depends(get_resources),
     db: AsyncSession = Depends(get_db),
     storage: StorageBackend = Depends(get_storage),
-    email: EmailBackend = Depends(get_email),
+    batch_writer: LeadBatchWriter | None = Depends(get_lead_batch_writer),
+    events: EventBroker | None = Depends(get_event_broker),
 ) -> LeadService:
+    if resources.read_session_factory is not None and request.method not in SAFE_METHODS:
+        pin_reads_to_primary(response)
     repo = LeadRepository(db)
-    return LeadService(repo=repo, storage=storage, email=email)
+    return LeadService(
+        repo=repo,
+        storage=storage,
+        outbox=OutboxRepository(db),
+        batch_writer=batch_writer,
+        events=events,
+    )
+
+
+async def get_lead_reader(
+    db: AsyncSession = Depends(get_read_db),
+    storage: StorageBackend = Depends(get_storage),
+) -> LeadService:
+    """A :class:`LeadService` for read-only endpoints, on the replica when there is one."""
+    return LeadService(repo=LeadRepository(db), storage=storage, outbox=OutboxRepository(db))
+
+
+def get_email_dispatcher(resources: Resources = Depends(get_resources)) -> EmailDispatcher:
+    dispatcher = resources.email_dispatcher
+    if dispatcher is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Email dispatcher is not running",
+        )
+    return dispatcher
 
 
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
-    return verify_token(token)
+    if not settings.TOKEN_CACHE_ENABLED:
+        return verify_token(token)
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = verify_token(token)
+        token_cache.put(token, claims)
+    return claims
@@ -1,15 +1,14 @@
 from fastapi import APIRouter, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi import Depends
-from passlib.context import CryptContext
 
+from app.api.dependencies import get_password_hasher
+from app.core.hashing import HasherBusyError, PasswordHasher
 from app.schemas.auth import TokenResponse
 from app.services.auth_service import create_access_token
 
 router = APIRouter()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # Production would validate against a user database.
 # For this take-home, a single hardcoded attorney account is sufficient.
 HARDCODED_USER = {
@@ -22,13 +21,26 @@ HARDCODED_USER = {
     "/login",
     response_model=TokenResponse,
     summary="Obtain access token",
-    description="Authenticate with username and password to receive a JWT access token.",
+    description=(
+        "Authenticate with username and password to receive a JWT access token. "
+        "Returns 429 when too many logins are already being verified."
+    ),
 )
-async def login(form_data: OAuth2PasswordRequestForm = Depends()) -> TokenResponse:
-    if (
-        form_data.username != HARDCODED_USER["username"]
-        or not pwd_context.verify(form_data.password, HARDCODED_USER["hashed_password"])
-    ):
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    password_hasher: PasswordHasher = Depends(get_password_hasher),
+) -> TokenResponse:
+    valid = False
+    if form_data.username == HARDCODED_USER["username"]:
+        try:
+            valid = await password_hasher.verify(form_data.password, HARDCODED_USER["hashed_password"])
+        except HasherBusyError:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many concurrent login attempts, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -1,31 +1,130 @@
+import asyncio
 import uuid
+from datetime import datetime
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import ValidationError
 
-from app.api.dependencies import get_current_user, get_lead_service
-from app.schemas.lead import LeadCreate, LeadListResponse, LeadResponse, LeadStatusUpdate
+from app.api.dependencies import get_current_user, get_lead_reader, get_lead_service, require_event_broker
+from app.config import settings
+from app.core.bulk_import import MANIFEST_FORMATS, ManifestReader, ResumeArchive
+from app.core.compression import gzip_stream
+from app.core.events import EventBroker
+from app.core.timing import span
+from app.core.uploads import StreamedForm, UploadRejected, receive_multipart
+from app.models.lead import LeadStatus
+from app.repositories.lead_repository import LeadFilter
+from app.schemas.lead import (
+    MAX_BULK_STATUS_IDS,
+    BulkStatusOutcome,
+    CountMode,
+    ExportFormat,
+    ImportOutcome,
+    LeadBulkStatusItem,
+    LeadBulkStatusResponse,
+    LeadBulkStatusUpdate,
+    LeadChangesResponse,
+    LeadCreate,
+    LeadImportSummary,
+    LeadListResponse,
+    LeadResponse,
+    LeadStatusUpdate,
+    dump_lead_changes,
+    dump_lead_list,
+    dump_lead_rows_csv,
+    dump_lead_rows_ndjson,
+    lead_csv_header,
+)
 from app.services.lead_service import LeadService
 
 router = APIRouter()
 
-ALLOWED_EXTENSIONS = {".pdf", ".doc", ".docx"}
+# Leading bytes each accepted resume format must start with.
+RESUME_SIGNATURES: dict[str, tuple[bytes, ...]] = {
+    ".pdf": (b"%PDF-",),
+    ".doc": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",),  # OLE2 compound document
+    ".docx": (b"PK\x03\x04",),  # OOXML zip container
+}
+ALLOWED_EXTENSIONS = set(RESUME_SIGNATURES)
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
+LEAD_FORM_FIELDS = ("first_name", "last_name", "email")
+MAX_CHANGES_LIMIT = 1000
+# Manifests carry no signature to sniff; the archive must be a zip.
+IMPORT_SIGNATURES: dict[str, tuple[bytes, ...]] = {
+    **{ext: (b"",) for ext in MANIFEST_FORMATS},
+    ".zip": (b"PK\x03\x04", b"PK\x05\x06"),
+}
+IMPORT_FORM_FILES = ("manifest", "resumes")
 
+# The form is parsed by hand (see create_lead), so describe it for OpenAPI.
+_LEAD_FORM_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": [*LEAD_FORM_FIELDS, "resume"],
+                    "properties": {
+                        **{name: {"type": "string"} for name in LEAD_FORM_FIELDS},
+                        "resume": {"type": "string", "format": "binary"},
+                    },
+                }
+            }
+        },
+    }
+}
 
-def _validate_resume(file: UploadFile) -> None:
-    ext = Path(file.filename or "").suffix.lower()
-    if ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=f"Invalid file type '{ext}'. Allowed: {', '.join(sorted(ALLOWED_EXTENSIONS))}",
-        )
-    if file.size is not None and file.size > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=f"File too large. Maximum size is {MAX_FILE_SIZE // (1024 * 1024)} MB",
-        )
+
+_IMPORT_FORM_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": list(IMPORT_FORM_FILES),
+                    "properties": {
+                        name: {"type": "string", "format": "binary"} for name in IMPORT_FORM_FILES
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+def _lead_filter(
+    status_filter: LeadStatus | None = Query(None, alias="status"),
+    created_after: datetime | None = Query(None, description="Exclusive lower bound on created_at"),
+    created_before: datetime | None = Query(None, description="Exclusive upper bound on created_at"),
+    email: str | None = Query(None, min_length=1, description="Exact match, case-insensitive"),
+    name: str | None = Query(
+        None, min_length=1, max_length=100, description="Prefix of first or last name, case-insensitive"
+    ),
+) -> LeadFilter:
+    return LeadFilter(
+        status=status_filter,
+        created_after=created_after,
+        created_before=created_before,
+        email=email,
+        name=name,
+    )
+
+
+def _missing_fields(
+    form: StreamedForm,
+    fields: tuple[str, ...] = LEAD_FORM_FIELDS,
+    files: tuple[str, ...] = ("resume",),
+) -> list[dict]:
+    missing = [name for name in fields if name not in form.fields]
+    missing.extend(name for name in files if name not in form.files)
+    return [
+        {"type": "missing", "loc": ["body", name], "msg": "Field required", "input": None}
+        for name in missing
+    ]
 
 
 # ---------------------------------------------------------------------------
@@ -38,21 +137,39 @@ def _validate_resume(file: UploadFile) -> None:
     response_model=LeadResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Submit a new lead",
-    description="Public endpoint. Accepts prospect information and a resume file.",
+    description=(
+        "Public endpoint. Accepts prospect information and a resume file "
+        f"({', '.join(sorted(ALLOWED_EXTENSIONS))}, at most {MAX_FILE_SIZE // (1024 * 1024)} MB)."
+    ),
+    openapi_extra=_LEAD_FORM_OPENAPI,
 )
 async def create_lead(
-    first_name: str = Form(...),
-    last_name: str = Form(...),
-    email: str = Form(...),
-    resume: UploadFile = File(...),
+    request: Request,
     service: LeadService = Depends(get_lead_service),
 ) -> LeadResponse:
-    _validate_resume(resume)
+    # Parse the body as it streams in so oversized or mistyped resumes are
+    # refused early and accepted ones are written to disk exactly once.
+    try:
+        with span("multipart"):
+            form = await receive_multipart(
+                request,
+                spool_dir=Path(settings.UPLOAD_DIR) / ".incoming",
+                max_file_size=MAX_FILE_SIZE,
+                signatures=RESUME_SIGNATURES,
+            )
+    except UploadRejected as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+
     try:
-        data = LeadCreate(first_name=first_name, last_name=last_name, email=email)
-    except ValidationError as exc:
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=exc.errors())
-    lead = await service.submit_lead(data, resume)
+        if missing := _missing_fields(form):
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=missing)
+        try:
+            data = LeadCreate(**{name: form.fields[name] for name in LEAD_FORM_FIELDS})
+        except ValidationError as exc:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=exc.errors())
+        lead = await service.submit_lead(data, form.files["resume"])
+    finally:
+        form.discard()
     return LeadResponse.model_validate(lead)
 
 
@@ -65,18 +182,237 @@ async def create_lead(
     "/",
     response_model=LeadListResponse,
     summary="List all leads",
-    description="Returns a paginated list of leads. Requires authentication.",
+    description=(
+        "Returns a paginated list of leads, newest first. Requires authentication. "
+        "Pass the returned `next_cursor` as `cursor` to fetch the following page; "
+        "`skip` is ignored when a cursor is given. `status`, `created_after`/"
+        "`created_before`, `email` and `name` narrow the list and can be combined. "
+        "`count_mode` selects how `count` is computed: `cached` (default) reads a "
+        "rollup counter, `exact` runs COUNT(*), `estimate` uses planner statistics "
+        "on Postgres. A list filtered by `status` alone reads that status's counter; "
+        "any other filter is counted exactly."
+    ),
 )
 async def list_leads(
-    skip: int = 0,
-    limit: int = 50,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1),
+    cursor: str | None = None,
+    count_mode: CountMode = CountMode.CACHED,
+    where: LeadFilter = Depends(_lead_filter),
+    _user: dict = Depends(get_current_user),
+    service: LeadService = Depends(get_lead_reader),
+) -> Response:
+    rows, total, next_cursor = await service.list_leads(
+        skip=skip, limit=limit, cursor=cursor, count_mode=count_mode, where=where
+    )
+    # Encoded directly rather than through response_model, which would build
+    # and re-validate a LeadResponse per row; response_model still documents
+    # the shape.
+    with span("serialize"):
+        body = dump_lead_list(rows, total, next_cursor)
+    return Response(body, media_type="application/json")
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    summary="Live lead events",
+    description=(
+        "Server-Sent Events stream of `lead.created` and `lead.status_changed` "
+        "(data: a `LeadResponse`), `leads.imported` (data: `{\"created\": n}`) and "
+        "`leads.status_changed` from bulk updates (data: `{\"updated\": n, \"status\": ...}`). "
+        "Each lead event's `id` is a change-feed watermark, so a client that was "
+        "disconnected can catch up with `GET /changes?since=<last id>`. Clients "
+        "that fall too far behind are disconnected. Requires authentication."
+    ),
+)
+async def stream_lead_events(
+    _user: dict = Depends(get_current_user),
+    broker: EventBroker = Depends(require_event_broker),
+) -> StreamingResponse:
+    subscription = broker.subscribe(settings.LEAD_EVENTS_MAX_PENDING)
+
+    async def frames():
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                try:
+                    async with asyncio.timeout(settings.LEAD_EVENTS_HEARTBEAT_SECONDS):
+                        frame = await subscription.get()
+                except TimeoutError:
+                    # Comment line: keeps proxies from timing out an idle stream.
+                    yield b": keepalive\n\n"
+                    continue
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/changes",
+    response_model=LeadChangesResponse,
+    summary="List leads changed since a watermark",
+    description=(
+        "Returns leads created or updated after `since`, oldest change first, and "
+        "the `next_since` watermark to pass on the next call. Omit `since` to start "
+        "from the beginning; while `has_more` is true, call again straight away. "
+        "Changes become visible after a short settle delay. Requires authentication."
+    ),
+)
+async def list_lead_changes(
+    since: str | None = None,
+    limit: int = Query(500, ge=1, le=MAX_CHANGES_LIMIT),
+    _user: dict = Depends(get_current_user),
+    service: LeadService = Depends(get_lead_service),
+) -> Response:
+    rows, next_since, has_more = await service.list_changes(since=since, limit=limit)
+    return Response(dump_lead_changes(rows, next_since, has_more), media_type="application/json")
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export leads",
+    description=(
+        "Streams every lead matching the filters (as on the list endpoint), oldest "
+        "first, as CSV or NDJSON with the same fields as `LeadResponse`. With "
+        "`gzip=true` the body is sent with `Content-Encoding: gzip`. Requires "
+        "authentication."
+    ),
+)
+async def export_leads(
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    where: LeadFilter = Depends(_lead_filter),
+    gzip: bool = False,
     _user: dict = Depends(get_current_user),
     service: LeadService = Depends(get_lead_service),
-) -> LeadListResponse:
-    leads, total = await service.list_leads(skip=skip, limit=limit)
-    return LeadListResponse(
-        items=[LeadResponse.model_validate(l) for l in leads],
-        count=total,
+) -> StreamingResponse:
+    batches = service.export_leads(where)
+
+    async def body():
+        if export_format == ExportFormat.CSV:
+            yield lead_csv_header()
+            async for rows in batches:
+                yield dump_lead_rows_csv(rows)
+        else:
+            async for rows in batches:
+                yield dump_lead_rows_ndjson(rows)
+
+    headers = {"Content-Disposition": f'attachment; filename="leads.{export_format.value}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        gzip_stream(body()) if gzip else body(),
+        media_type="text/csv" if export_format == ExportFormat.CSV else "application/x-ndjson",
+        headers=headers,
+    )
+
+
+@router.post(
+    "/import",
+    response_class=StreamingResponse,
+    summary="Bulk import leads",
+    description=(
+        "Accepts a `manifest` (CSV with a header row, or NDJSON) whose rows carry "
+        "`first_name`, `last_name`, `email` and `resume`, plus a `resumes` zip in "
+        "which each `resume` names a member. Rows are validated like single "
+        "submissions and inserted in batches. The response is NDJSON: one "
+        "`LeadImportResult` per manifest row, in order, then a `LeadImportSummary`. "
+        "Each prospect gets a confirmation email; the attorney gets one summary. "
+        "Requires authentication."
+    ),
+    openapi_extra=_IMPORT_FORM_OPENAPI,
+)
+async def import_leads(
+    request: Request,
+    response: Response,
+    _user: dict = Depends(get_current_user),
+    service: LeadService = Depends(get_lead_service),
+) -> StreamingResponse:
+    spool_dir = Path(settings.UPLOAD_DIR) / ".incoming"
+    try:
+        form = await receive_multipart(
+            request,
+            spool_dir=spool_dir,
+            max_file_size=settings.LEAD_IMPORT_MAX_BYTES,
+            signatures=IMPORT_SIGNATURES,
+            max_files=len(IMPORT_FORM_FILES),
+        )
+    except UploadRejected as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+
+    manifest = None
+    try:
+        if missing := _missing_fields(form, fields=(), files=IMPORT_FORM_FILES):
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=missing)
+        manifest = ManifestReader(form.files["manifest"].path, form.files["manifest"].filename)
+        archive = await ResumeArchive.open(
+            form.files["resumes"].path,
+            spool_dir=spool_dir,
+            max_file_size=MAX_FILE_SIZE,
+            signatures=RESUME_SIGNATURES,
+        )
+    except BaseException as exc:
+        if manifest is not None:
+            manifest.close()
+        form.discard()
+        if isinstance(exc, UploadRejected):
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+        raise
+
+    async def results():
+        summary = LeadImportSummary(created=0, rejected=0)
+        try:
+            async for batch in service.import_leads(
+                manifest, archive, batch_size=settings.LEAD_IMPORT_BATCH_SIZE
+            ):
+                lines = []
+                for result in batch:
+                    if result.outcome == ImportOutcome.CREATED:
+                        summary.created += 1
+                    else:
+                        summary.rejected += 1
+                    lines.append(result.model_dump_json(exclude_none=True))
+                yield "\n".join(lines) + "\n"
+            yield summary.model_dump_json() + "\n"
+        finally:
+            manifest.close()
+            archive.close()
+            form.discard()
+
+    # Returned directly, so carry over the headers dependencies set (the
+    # read-your-writes cookie), which FastAPI only adds to responses it builds.
+    return StreamingResponse(results(), media_type="application/x-ndjson", headers=response.headers)
+
+
+@router.patch(
+    "/status",
+    response_model=LeadBulkStatusResponse,
+    summary="Update the status of many leads",
+    description=(
+        f"Mark up to {MAX_BULK_STATUS_IDS} leads as REACHED_OUT in one statement. "
+        "Reports `updated`, `conflict` (already REACHED_OUT) or `not_found` per id. "
+        "Requires authentication."
+    ),
+)
+async def bulk_update_lead_status(
+    body: LeadBulkStatusUpdate,
+    _user: dict = Depends(get_current_user),
+    service: LeadService = Depends(get_lead_service),
+) -> LeadBulkStatusResponse:
+    outcomes = await service.mark_many_reached_out(body.ids)
+    results = [LeadBulkStatusItem(id=lead_id, outcome=outcome) for lead_id, outcome in outcomes]
+    return LeadBulkStatusResponse(
+        updated=sum(1 for r in results if r.outcome == BulkStatusOutcome.UPDATED),
+        results=results,
     )
 
 
@@ -89,7 +425,7 @@ async def list_leads(
 async def get_lead(
     lead_id: uuid.UUID,
     _user: dict = Depends(get_current_user),
-    service: LeadService = Depends(get_lead_service),
+    service: LeadService = Depends(get_lead_reader),
 ) -> LeadResponse:
     lead = await service.get_lead(lead_id)
     return LeadResponse.model_validate(lead)
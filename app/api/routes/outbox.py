@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+
+from app.api.dependencies import get_current_user, get_email_dispatcher
+from app.schemas.outbox import OutboxStats
+from app.services.email_dispatcher import EmailDispatcher
+
+router = APIRouter()
+
+
+@router.get(
+    "/stats",
+    response_model=OutboxStats,
+    summary="Email outbox statistics",
+    description=(
+        "Queue depth (pending and dead-lettered messages) plus this process's "
+        "delivery counters and drain rate. Requires authentication."
+    ),
+)
+async def outbox_stats(
+    _user: dict = Depends(get_current_user),
+    dispatcher: EmailDispatcher = Depends(get_email_dispatcher),
+) -> OutboxStats:
+    return OutboxStats(**await dispatcher.stats())
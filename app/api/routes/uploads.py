@@ -0,0 +1,120 @@
+import os
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+
+from app.api.dependencies import get_current_user, get_storage
+from app.core.storage import StorageBackend
+
+router = APIRouter()
+
+# Stored names are immutable (a new upload always gets a new name), so clients
+# may keep a copy but must revalidate it, which is a cheap 304.
+CACHE_CONTROL = "private, no-cache"
+
+
+def _is_stored_name(filename: str) -> bool:
+    """Reject anything that is not a plain stored file name (traversal, spool files)."""
+    return bool(filename) and "/" not in filename and "\\" not in filename and not filename.startswith(".")
+
+
+def _etag(st: os.stat_result) -> str:
+    # Strong validator: any rewrite of the file changes inode, size or mtime.
+    return f'"{st.st_ino:x}-{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match uses weak comparison and takes precedence over dates.
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since.timestamp()
+    return False
+
+
+async def _stream_remote(storage: StorageBackend, filename: str) -> StreamingResponse:
+    chunks = storage.open_stream(filename)
+    try:
+        first = await anext(chunks)
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+    except StopAsyncIteration:
+        first = b""
+
+    async def body():
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return StreamingResponse(body(), media_type="application/octet-stream")
+
+
+@router.get(
+    "/{filename}",
+    summary="Download a resume",
+    description=(
+        "Serves a stored resume referenced by a lead's `resume_url`. Supports byte "
+        "ranges and conditional requests (`ETag` / `Last-Modified`, answered with "
+        "304 when unchanged). Requires authentication. With object storage the "
+        "response may instead be a 307 redirect to a short-lived signed URL."
+    ),
+    responses={
+        206: {"description": "Partial content"},
+        304: {"description": "Not modified"},
+        307: {"description": "Redirect to a signed object-storage URL"},
+    },
+)
+async def download_resume(
+    filename: str,
+    request: Request,
+    _user: dict = Depends(get_current_user),
+    storage: StorageBackend = Depends(get_storage),
+) -> Response:
+    if not _is_stored_name(filename):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    path = await storage.get_path(filename)
+    if path is None:
+        url = await storage.get_url(filename)
+        if url is not None:
+            # The object store serves the bytes, ranges and validators itself;
+            # the signed URL expires, so the redirect must not be cached.
+            return RedirectResponse(url, status_code=307, headers={"Cache-Control": "no-store"})
+        return await _stream_remote(storage, filename)
+
+    try:
+        st = await anyio.to_thread.run_sync(os.stat, path)
+    except FileNotFoundError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    headers = {
+        "ETag": _etag(st),
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+        "X-Content-Type-Options": "nosniff",
+    }
+    if _not_modified(request, headers["ETag"], st.st_mtime):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # FileResponse handles Range / If-Range.  It only passes the path to the
+    # server for sendfile through the ASGI pathsend extension, which uvicorn
+    # does not implement, so the body is read and sent in 64 KiB chunks.
+    return FileResponse(
+        path,
+        stat_result=st,
+        headers=headers,
+        filename=filename,
+        content_disposition_type="inline",
+    )
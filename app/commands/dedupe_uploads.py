@@ -0,0 +1,65 @@
+"""Fold existing uploads into content-addressed storage and report the savings.
+
+Run once when switching ``STORAGE_BACKEND`` to ``dedup`` (and again at any
+time; files already folded in are skipped without being re-read):
+
+    python -m app.commands.dedupe_uploads [--report-only]
+
+Every stored name keeps working, so this is safe to run while the API is
+serving: a duplicate is replaced in place by a hard link to the first copy
+of its content, which frees its space without touching the database or any
+``resume_url`` clients already hold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from app.config import settings
+from app.core.storage import ContentAddressedStorageBackend, DedupReport
+
+
+def _mib(size: int) -> str:
+    return f"{size / (1024 * 1024):,.1f} MiB"
+
+
+def format_report(report: DedupReport) -> str:
+    ratio = report.saved_bytes / report.referenced_bytes if report.referenced_bytes else 0.0
+    return (
+        f"{report.references:,} stored resumes in {report.files:,} files: "
+        f"{_mib(report.stored_bytes)} on disk, {_mib(report.saved_bytes)} saved ({ratio:.0%})"
+    )
+
+
+async def dedupe_uploads(storage: ContentAddressedStorageBackend) -> tuple[int, int]:
+    """Adopt every file stored before deduplication; returns (scanned, deduplicated)."""
+    names = await asyncio.to_thread(lambda: list(storage.stored_names()))
+    deduplicated = 0
+    for name in names:
+        try:
+            deduplicated += await storage.adopt(name)
+        except FileNotFoundError:
+            continue  # deleted since the scan
+    return len(names), deduplicated
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--upload-dir", default=settings.UPLOAD_DIR)
+    parser.add_argument(
+        "--report-only", action="store_true", help="print the space report and change nothing"
+    )
+    args = parser.parse_args()
+
+    storage = ContentAddressedStorageBackend(args.upload_dir)
+    print(f"before: {format_report(await storage.report())}")
+    if args.report_only:
+        return
+    scanned, deduplicated = await dedupe_uploads(storage)
+    print(f"scanned {scanned:,} files, replaced {deduplicated:,} duplicates with links")
+    print(f"after:  {format_report(await storage.report())}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+"""Move uploads from the flat UPLOAD_DIR layout into shard directories.
+
+Safe to run while the API is serving: every file stays readable by its
+stored name while it moves, and nothing in the database changes.  Files are
+moved in batches with a pause in between to bound the I/O taken from live
+traffic.  Progress is the directory itself: an interrupted run simply
+continues where it stopped when started again.
+
+    python -m app.commands.shard_uploads [--batch-size 1000] [--pause 0.1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from app.core.storage import LocalStorageBackend
+from app.resources import build_storage
+
+
+async def shard_uploads(
+    storage: LocalStorageBackend, batch_size: int = 1000, pause: float = 0.0, progress=None
+) -> int:
+    """Move every flat-layout file into its shard directory; returns how many moved."""
+    moved = 0
+    while names := await asyncio.to_thread(storage.flat_names, batch_size):
+        count = await storage.reshard(names)
+        if not count:
+            break  # only files deleted since they were listed are left
+        moved += count
+        if progress is not None:
+            progress(moved)
+        if pause:
+            await asyncio.sleep(pause)
+    return moved
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--pause", type=float, default=0.1, help="seconds between batches")
+    args = parser.parse_args()
+
+    storage = build_storage()
+    if not isinstance(storage, LocalStorageBackend):
+        parser.error("STORAGE_BACKEND does not keep files in UPLOAD_DIR")
+
+    started = time.perf_counter()
+
+    def progress(moved: int) -> None:
+        elapsed = time.perf_counter() - started
+        print(f"moved {moved:,} files ({moved / elapsed:,.0f}/s)", flush=True)
+
+    moved = await shard_uploads(storage, args.batch_size, args.pause, progress)
+    print(f"done: {moved:,} files moved in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
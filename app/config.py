@@ -8,6 +8,104 @@ class Settings(BaseSettings):
     EMAIL_FROM: str = "noreply@alma.local"
     ATTORNEY_EMAIL: str = "attorney@alma.local"
 
+    # Database pool: DB_POOL_SIZE connections stay open and up to
+    # DB_MAX_OVERFLOW more are opened under load; a checkout waits at most
+    # DB_POOL_TIMEOUT seconds. Connections are replaced after DB_POOL_RECYCLE
+    # seconds (-1 never), and PRE_PING tests each one on checkout. DB_POOL_WARMUP
+    # connections are opened at startup so the first requests don't pay for them.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_WARMUP: int = 5
+
+    # Read replica for the lead list and detail endpoints; empty reads from
+    # DATABASE_URL. After a write, that client reads from the primary for
+    # READ_AFTER_WRITE_SECONDS so replication lag never hides its own changes.
+    READ_DATABASE_URL: str = ""
+    READ_AFTER_WRITE_SECONDS: float = 5.0
+
+    # Statements slower than this are logged with their parameters redacted.
+    SLOW_QUERY_SECONDS: float = 0.2
+
+    # Prepared statements cached per asyncpg connection; set 0 behind PgBouncer
+    # in transaction mode, where a connection's statements don't follow it.
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    # Resume storage: "local" stores every upload under a fresh name, "dedup"
+    # stores identical files once, named by the SHA-256 of their content, "s3"
+    # stores them in an S3-compatible bucket shared by every app node.
+    STORAGE_BACKEND: str = "local"
+
+    # S3 storage: files larger than one part are uploaded as concurrent
+    # multipart parts. Downloads redirect to a presigned URL valid for
+    # PRESIGN_SECONDS, or are proxied through the app in ranged GETs when it is 0.
+    # An empty endpoint means AWS in S3_REGION.
+    S3_BUCKET: str = ""
+    S3_ENDPOINT_URL: str = ""
+    S3_REGION: str = "us-east-1"
+    S3_ACCESS_KEY_ID: str = ""
+    S3_SECRET_ACCESS_KEY: str = ""
+    S3_KEY_PREFIX: str = "resumes/"
+    S3_PART_SIZE: int = 8 * 1024 * 1024
+    S3_UPLOAD_CONCURRENCY: int = 4
+    S3_MAX_CONNECTIONS: int = 64
+    S3_PRESIGN_SECONDS: int = 300
+
+    # Verified JWT claims are cached until the token's exp.
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_SIZE: int = 1024
+
+    # bcrypt runs on a dedicated pool; logins beyond workers + max pending get 429.
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 16
+
+    # Group commit for lead submissions: concurrent inserts within the window
+    # (or until the batch is full) share one multi-row INSERT and one commit.
+    LEAD_BATCH_WRITER_ENABLED: bool = False
+    LEAD_BATCH_MAX_SIZE: int = 100
+    LEAD_BATCH_MAX_WAIT_MS: float = 5.0
+
+    # Bulk import: leads are validated, stored and inserted this many at a time;
+    # the manifest and the resume archive may each be up to the byte limit.
+    LEAD_IMPORT_BATCH_SIZE: int = 1000
+    LEAD_IMPORT_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+
+    # The change feed only reports changes at least this old, so writes still in
+    # flight when a watermark is issued are not skipped.
+    LEAD_CHANGES_SETTLE_SECONDS: float = 1.0
+
+    # Export streams rows from a server-side cursor this many at a time.
+    LEAD_EXPORT_BATCH_SIZE: int = 1000
+
+    # Live lead events (SSE): "memory" fans out within this process, "postgres"
+    # relays through LISTEN/NOTIFY to every worker, "auto" picks by DATABASE_URL,
+    # "off" disables the stream. Subscribers more than MAX_PENDING frames behind
+    # are disconnected.
+    LEAD_EVENTS_BACKEND: str = "auto"
+    LEAD_EVENTS_MAX_PENDING: int = 256
+    LEAD_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+
+    # python -m app.serve: WEB_WORKERS processes (0: one per available CPU)
+    # share one listening socket. A worker is replaced after WEB_MAX_REQUESTS
+    # requests plus up to the jitter (0: never), and gets WEB_GRACEFUL_TIMEOUT
+    # seconds to finish its requests on shutdown.
+    WEB_WORKERS: int = 0
+    WEB_MAX_REQUESTS: int = 10000
+    WEB_MAX_REQUESTS_JITTER: int = 1000
+    WEB_GRACEFUL_TIMEOUT: int = 30
+
+    # Responses carry a Server-Timing header with each stage's duration; turn
+    # off where clients should not see server-side timings.
+    SERVER_TIMING_ENABLED: bool = True
+
+    # Outbox dispatcher: delivers queued emails out of band of the request.
+    EMAIL_DISPATCHER_ENABLED: bool = True
+    EMAIL_DISPATCH_BATCH_SIZE: int = 50
+    EMAIL_DISPATCH_MAX_ATTEMPTS: int = 5
+    EMAIL_DISPATCH_POLL_SECONDS: float = 1.0
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
@@ -0,0 +1,185 @@
+"""Readers for bulk lead imports: a CSV/NDJSON manifest and a zip of resumes.
+
+Both are read from files already spooled to local disk.  The blocking parsing
+and decompression run in worker threads one batch at a time, so the event loop
+never waits on either and only one batch of rows is held in memory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import uuid
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path, PurePosixPath
+
+from app.core.uploads import SNIFF_BYTES, SpooledUpload, UploadRejected, too_large
+
+MANIFEST_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+COPY_CHUNK = 64 * 1024
+
+
+class ManifestReader:
+    """Yields ``(row_number, record)`` pairs from a CSV or NDJSON manifest.
+
+    *record* is a ``dict`` of column values, or a ``str`` describing why the
+    row could not be parsed.  Rows are numbered from 1; blank NDJSON lines are
+    skipped without consuming a number.
+    """
+
+    def __init__(self, path: Path, filename: str) -> None:
+        suffix = Path(filename).suffix.lower()
+        if suffix not in MANIFEST_FORMATS:
+            raise UploadRejected(
+                f"Invalid manifest type '{suffix}'. Allowed: {', '.join(sorted(MANIFEST_FORMATS))}"
+            )
+        self.format = MANIFEST_FORMATS[suffix]
+        self._file = open(path, encoding="utf-8-sig", newline="")
+        self._records = self._csv() if self.format == "csv" else self._ndjson()
+
+    def _csv(self) -> Iterator[dict | str]:
+        reader = csv.DictReader(self._file)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as exc:
+                yield f"Malformed CSV: {exc}"
+                continue
+            if None in row:
+                yield "Row has more fields than the header"
+                continue
+            yield row
+
+    def _ndjson(self) -> Iterator[dict | str]:
+        for line in self._file:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield f"Malformed JSON: {exc.msg}"
+                continue
+            yield record if isinstance(record, dict) else "Each line must be a JSON object"
+
+    def _take(self, size: int, start: int) -> list[tuple[int, dict | str]]:
+        batch: list[tuple[int, dict | str]] = []
+        try:
+            for number, record in enumerate(self._records, start):
+                batch.append((number, record))
+                if len(batch) == size:
+                    break
+        except UnicodeDecodeError:
+            # The decoder cannot resynchronise; report it once and stop.
+            batch.append((start + len(batch), "Manifest is not valid UTF-8"))
+            self._records = iter(())
+        return batch
+
+    async def next_batch(self, size: int, start: int) -> list[tuple[int, dict | str]]:
+        """Read up to *size* records, numbering them from *start*."""
+        return await asyncio.to_thread(self._take, size, start)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ResumeArchive:
+    """A zip of resumes, extracted member by member into *spool_dir*.
+
+    Each member is held to the same limits as a single upload: an allowed
+    extension, a matching signature, and at most *max_file_size* bytes, where
+    the size is enforced on the decompressed stream rather than trusted from
+    the archive's directory.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        spool_dir: Path,
+        max_file_size: int,
+        signatures: dict[str, tuple[bytes, ...]],
+    ) -> None:
+        try:
+            self._zip = zipfile.ZipFile(path)
+        except (zipfile.BadZipFile, OSError) as exc:
+            raise UploadRejected("Resume archive is not a valid zip file") from exc
+        self.spool_dir = spool_dir
+        self.max_file_size = max_file_size
+        self.signatures = signatures
+
+    @classmethod
+    async def open(cls, path: Path, **kwargs) -> ResumeArchive:
+        """Construct off the event loop; reading the zip directory is blocking."""
+        return await asyncio.to_thread(cls, path, **kwargs)
+
+    def _extract_one(self, name: str) -> SpooledUpload:
+        try:
+            info = self._zip.getinfo(name)
+        except KeyError:
+            raise UploadRejected(f"Resume '{name}' is not in the archive") from None
+        if info.is_dir():
+            raise UploadRejected(f"Resume '{name}' is a directory")
+        extension = PurePosixPath(name).suffix.lower()
+        if extension not in self.signatures:
+            raise UploadRejected(
+                f"Invalid file type '{extension}'. Allowed: {', '.join(sorted(self.signatures))}"
+            )
+        if info.file_size > self.max_file_size:
+            raise too_large(self.max_file_size)
+
+        upload = SpooledUpload(
+            path=self.spool_dir / f".{uuid.uuid4().hex}.part",
+            filename=PurePosixPath(name).name,
+        )
+        try:
+            with self._zip.open(info) as src:
+                head = src.read(SNIFF_BYTES)
+                if not any(head.startswith(sig) for sig in self.signatures[extension]):
+                    raise UploadRejected(
+                        f"Invalid file type: content is not a valid '{extension}' file"
+                    )
+                try:
+                    dest = open(upload.path, "wb")
+                except FileNotFoundError:
+                    self.spool_dir.mkdir(parents=True, exist_ok=True)
+                    dest = open(upload.path, "wb")
+                with dest:
+                    dest.write(head)
+                    upload.hasher.update(head)
+                    upload.size = len(head)
+                    while chunk := src.read(COPY_CHUNK):
+                        upload.size += len(chunk)
+                        if upload.size > self.max_file_size:
+                            raise too_large(self.max_file_size)
+                        upload.hasher.update(chunk)
+                        dest.write(chunk)
+        except UploadRejected:
+            upload.discard()
+            raise
+        except (zipfile.BadZipFile, OSError, EOFError, NotImplementedError) as exc:
+            upload.discard()
+            raise UploadRejected(f"Resume '{name}' could not be extracted") from exc
+        return upload
+
+    def _extract_many(self, names: list[str]) -> list[SpooledUpload | UploadRejected]:
+        results: list[SpooledUpload | UploadRejected] = []
+        for name in names:
+            try:
+                results.append(self._extract_one(name))
+            except UploadRejected as exc:
+                results.append(exc)
+        return results
+
+    async def extract_many(self, names: list[str]) -> list[SpooledUpload | UploadRejected]:
+        """Extract each named member to a spooled file, or the reason it was refused.
+
+        The caller owns the returned uploads.
+        """
+        return await asyncio.to_thread(self._extract_many, names)
+
+    def close(self) -> None:
+        self._zip.close()
@@ -0,0 +1,22 @@
+"""Incremental gzip for streamed response bodies."""
+
+from __future__ import annotations
+
+import asyncio
+import zlib
+from collections.abc import AsyncIterator
+
+GZIP_LEVEL = 6
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes], level: int = GZIP_LEVEL) -> AsyncIterator[bytes]:
+    """Compress *chunks* into a single gzip member as they arrive.
+
+    Compression runs in a worker thread (zlib releases the GIL), so large
+    chunks do not stall the event loop.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        if out := await asyncio.to_thread(compressor.compress, chunk):
+            yield out
+    yield compressor.flush()
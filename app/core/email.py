@@ -71,3 +71,15 @@ def attorney_notification_email(
         "Please review and follow up."
     )
     return subject, body
+
+
+def attorney_import_summary_email(created: int, failed: int) -> tuple[str, str]:
+    """Return (subject, body) summarising a bulk import for an attorney."""
+    subject = f"Bulk import: {created} new leads"
+    body = (
+        "A bulk lead import has finished.\n\n"
+        f"Imported: {created}\n"
+        f"Rejected: {failed}\n\n"
+        "Please review and follow up."
+    )
+    return subject, body
@@ -0,0 +1,202 @@
+"""Live event fan-out for Server-Sent Events.
+
+EventBroker defines the interface: publishers hand it a ready-encoded SSE
+frame and every current subscriber receives it.  InProcessBroker fans out
+within one process — enough for SQLite or a single worker.  PostgresBroker
+relays frames through ``LISTEN/NOTIFY`` so every worker's subscribers see
+every event.
+
+Fan-out is a synchronous loop that appends the shared frame to each
+subscriber's bounded buffer: no task is created per message or per
+subscriber, so thousands of idle subscribers cost one deque each.  A
+subscriber whose buffer is full is dropped rather than allowed to hold
+memory or slow the publisher; its stream ends and the client reconnects.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Protocol, runtime_checkable
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "lead_events"
+
+
+def format_sse(event: str, data: str | bytes, event_id: str | None = None) -> bytes:
+    """Encode one Server-Sent Events frame. *data* must be a single line."""
+    if isinstance(data, str):
+        data = data.encode()
+    frame = b"event: " + event.encode() + b"\n"
+    if event_id is not None:
+        frame += b"id: " + event_id.encode() + b"\n"
+    return frame + b"data: " + data + b"\n\n"
+
+
+class Subscription:
+    """One subscriber's bounded buffer of pending frames."""
+
+    def __init__(self, broker: InProcessBroker, max_pending: int) -> None:
+        self._broker = broker
+        self._frames: deque[bytes] = deque()
+        self._max_pending = max_pending
+        self._waiter: asyncio.Future | None = None
+        self.dropped = False
+
+    def _push(self, frame: bytes) -> None:
+        if len(self._frames) >= self._max_pending:
+            self._broker.dropped_total += 1
+            self._drop()
+            return
+        self._frames.append(frame)
+        self._wake()
+
+    def _drop(self) -> None:
+        self.dropped = True
+        self._broker._discard(self)
+        self._frames.clear()
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def get(self) -> bytes | None:
+        """Wait for the next frame; ``None`` once this subscriber has been dropped."""
+        while not self._frames:
+            if self.dropped:
+                return None
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self._frames.popleft()
+
+    def close(self) -> None:
+        self._broker._discard(self)
+        self._frames.clear()
+
+
+@runtime_checkable
+class EventBroker(Protocol):
+    """Protocol for live event brokers."""
+
+    async def publish(self, frame: bytes) -> None:
+        """Deliver an encoded SSE frame to every current subscriber."""
+        ...
+
+    def subscribe(self, max_pending: int) -> Subscription:
+        """Register a subscriber that is dropped once *max_pending* frames back up."""
+        ...
+
+    async def start(self) -> None: ...
+
+    async def stop(self) -> None: ...
+
+
+class InProcessBroker:
+    """Fans frames out to subscribers in this process only."""
+
+    def __init__(self) -> None:
+        self._subscribers: set[Subscription] = set()
+        self.published_total = 0
+        self.dropped_total = 0  # subscribers disconnected for falling behind
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, max_pending: int) -> Subscription:
+        subscription = Subscription(self, max_pending)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def _discard(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def fan_out(self, frame: bytes) -> None:
+        self.published_total += 1
+        for subscription in list(self._subscribers):
+            subscription._push(frame)
+
+    async def publish(self, frame: bytes) -> None:
+        self.fan_out(frame)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        """End every subscriber's stream."""
+        for subscription in list(self._subscribers):
+            subscription._drop()
+
+
+class PostgresBroker(InProcessBroker):
+    """Relays frames between workers with Postgres ``LISTEN/NOTIFY``.
+
+    Publishing sends ``pg_notify`` and does not touch local subscribers
+    directly: every worker, this one included, receives the frame on its
+    listening connection and fans it out locally.  The payload limit (8000
+    bytes) is far above a lead event.  If the listening connection is lost,
+    events are missed until it is re-established, so clients should catch up
+    through the change feed using the last event id they saw.
+    """
+
+    def __init__(self, dsn: str, channel: str = CHANNEL, reconnect_delay: float = 1.0) -> None:
+        super().__init__()
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._listener = None
+        self._notifier = None
+        self._notify_lock = asyncio.Lock()
+        self._reconnect: asyncio.Task | None = None
+        self._stopping = False
+
+    async def start(self) -> None:
+        await self._listen()
+
+    async def _listen(self) -> None:
+        self._listener = await asyncpg.connect(self.dsn)
+        self._listener.add_termination_listener(self._on_terminated)
+        await self._listener.add_listener(self.channel, self._on_notify)
+
+    def _on_notify(self, _conn, _pid, _channel, payload: str) -> None:
+        self.fan_out(payload.encode())
+
+    def _on_terminated(self, _conn) -> None:
+        if not self._stopping and self._reconnect is None:
+            logger.warning("Lost the %s LISTEN connection; reconnecting", self.channel)
+            self._reconnect = asyncio.get_running_loop().create_task(self._reconnect_loop())
+
+    async def _reconnect_loop(self) -> None:
+        try:
+            while not self._stopping:
+                await asyncio.sleep(self.reconnect_delay)
+                try:
+                    await self._listen()
+                    return
+                except Exception:
+                    logger.exception("Reconnecting the %s listener failed", self.channel)
+        finally:
+            self._reconnect = None
+
+    async def publish(self, frame: bytes) -> None:
+        async with self._notify_lock:
+            if self._notifier is None or self._notifier.is_closed():
+                self._notifier = await asyncpg.connect(self.dsn)
+            await self._notifier.execute("SELECT pg_notify($1, $2)", self.channel, frame.decode())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._reconnect is not None:
+            self._reconnect.cancel()
+        for conn in (self._listener, self._notifier):
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+        await super().stop()
+
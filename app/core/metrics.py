@@ -0,0 +1,183 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Counters, gauges and histograms keep one series per tuple of label values in
+a plain dict, so recording is a dict lookup and an add; histograms find their
+bucket with ``bisect``.  Everything is updated from the event loop thread
+(SQLAlchemy's pool runs there too, inside its greenlet), so there are no
+locks.  Gauges may be bound to a function that is read at scrape time, which
+is how live values such as pool occupancy are exported without bookkeeping.
+
+``registry`` is the process-wide registry served at ``/metrics``.  Each
+worker process exposes its own values; Prometheus aggregates across them.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+
+# Seconds, from sub-millisecond queries up to request timeouts.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{self.name}{suffix}{labels} {_number(value)}" for suffix, labels, value in self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """A monotonically increasing count; by convention *name* ends in ``_total``."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        for labels, value in self._values.items():
+            yield "", _labels(self.labelnames, labels), value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float | Callable[[], float]] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def set_function(self, fn: Callable[[], float], *labels: str) -> None:
+        """Read the series from *fn* at scrape time; replaces any earlier value."""
+        self._values[labels] = fn
+
+    def value(self, *labels: str) -> float:
+        value = self._values.get(labels, 0.0)
+        return value() if callable(value) else value
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        for labels in list(self._values):
+            yield "", _labels(self.labelnames, labels), self.value(*labels)
+
+
+class _Series:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.buckets = [0] * size
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.bounds = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], _Series] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = _Series(len(self.bounds) + 1)
+        # Per-bucket counts; they are made cumulative when rendered.
+        series.buckets[bisect_left(self.bounds, value)] += 1
+        series.count += 1
+        series.sum += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return series.count if series is not None else 0
+
+    def sum(self, *labels: str) -> float:
+        series = self._series.get(labels)
+        return series.sum if series is not None else 0.0
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        for labels, series in list(self._series.items()):
+            running = 0
+            for bound, hits in zip((*self.bounds, float("inf")), series.buckets):
+                running += hits
+                yield "_bucket", _labels(self.labelnames, labels, f'le="{_number(bound)}"'), running
+            yield "_sum", _labels(self.labelnames, labels), series.sum
+            yield "_count", _labels(self.labelnames, labels), series.count
+
+
+class MetricsRegistry:
+    """Named metrics, created on first use and shared by later callers."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def _get(self, cls: type[_Metric], name: str, *args, **kwargs) -> _Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, *args, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"metric {name!r} is already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._get(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._get(Gauge, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get(Histogram, name, help, labelnames, buckets)
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = MetricsRegistry()
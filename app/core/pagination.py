@@ -0,0 +1,31 @@
+"""Opaque keyset cursors.
+
+A cursor encodes the ``(timestamp, id)`` sort key of the last row a client has
+seen, so the next page can seek past it with an indexed range condition instead
+of re-scanning every earlier row with OFFSET.  Clients must treat the value as
+opaque; the encoding may change between releases.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+
+
+def encode_keyset(timestamp: datetime, row_id: uuid.UUID) -> str:
+    """Return an opaque, URL-safe cursor for the ``(timestamp, row_id)`` key."""
+    raw = json.dumps([timestamp.isoformat(), row_id.hex], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_keyset(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Inverse of :func:`encode_keyset`. Raises ``ValueError`` on malformed input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(timestamp), uuid.UUID(hex=row_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise ValueError("Malformed cursor") from exc
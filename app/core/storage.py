@@ -1,11 +1,22 @@
 """File storage abstraction.
 
 StorageBackend defines the interface for persisting uploaded files.
-LocalStorageBackend writes to the local filesystem — swap in an S3 or GCS
-implementation by providing any class that satisfies the Protocol.
+LocalStorageBackend writes to the local filesystem, and
+ContentAddressedStorageBackend is a local variant that keeps one copy of
+each distinct file.  S3StorageBackend (app/core/s3.py) shares uploads between
+app nodes through an S3-compatible bucket.  Any class that satisfies the
+Protocol can be swapped in.
 """
 
+import asyncio
+import errno
+import fcntl
+import hashlib
+import os
+import shutil
 import uuid
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Protocol, runtime_checkable
 
@@ -21,8 +32,26 @@ class StorageBackend(Protocol):
         """Persist *file* and return its relative stored path."""
         ...
 
-    async def get_path(self, filename: str) -> Path:
-        """Return the absolute filesystem path for a stored file."""
+    async def save_from_path(self, path: Path, filename: str, digest: str | None = None) -> str:
+        """Persist the local file at *path*, taking ownership of it, and return
+        its relative stored path. *digest* is the hex SHA-256 of the file when
+        the caller already knows it."""
+        ...
+
+    async def get_path(self, filename: str) -> Path | None:
+        """Return the absolute filesystem path for a stored file, or ``None``
+        when the backend does not keep files on the local filesystem."""
+        ...
+
+    async def get_url(self, filename: str) -> str | None:
+        """Return a URL the client may fetch the file from directly (for
+        example a presigned object URL), or ``None`` to serve it through the
+        app."""
+        ...
+
+    def open_stream(self, filename: str) -> AsyncIterator[bytes]:
+        """Yield a stored file's content in chunks. Raises ``FileNotFoundError``
+        on first iteration if it does not exist."""
         ...
 
     async def delete(self, filename: str) -> None:
@@ -30,27 +59,411 @@ class StorageBackend(Protocol):
         ...
 
 
+def shard_path(root: Path, name: str) -> Path:
+    """Where *name* lives under *root*: two directory levels taken from its
+    leading hex digits, e.g. ``root/3f/a2/3fa2….pdf``.
+
+    Stored names start with random or hash hex digits, so files spread
+    evenly over at most 65,536 leaf directories.
+    """
+    return root / name[:2] / name[2:4] / name
+
+
 class LocalStorageBackend:
-    """Stores uploads on the local filesystem under *upload_dir*."""
+    """Stores uploads on the local filesystem under *upload_dir*.
+
+    Files live in shard directories (see :func:`shard_path`) so that no
+    directory grows to millions of entries.  Files saved before sharding sit
+    directly in *upload_dir*; they are still found and deleted by name, and
+    :meth:`reshard` moves them into place.
+    """
 
     def __init__(self, upload_dir: str) -> None:
         self.upload_dir = Path(upload_dir)
         self.upload_dir.mkdir(parents=True, exist_ok=True)
 
+    def _path(self, filename: str) -> Path:
+        return shard_path(self.upload_dir, filename)
+
+    def _locate(self, filename: str) -> Path:
+        path = self._path(filename)
+        if path.exists():
+            return path
+        flat = self.upload_dir / filename
+        if flat.exists():
+            return flat
+        # Missing, or moved by reshard between the two checks: reshard links
+        # the new path before removing the old one.
+        return path
+
     async def save(self, file: UploadFile, filename: str) -> str:
         ext = Path(filename).suffix
         unique_name = f"{uuid.uuid4().hex}{ext}"
-        dest = self.upload_dir / unique_name
+        dest = self._path(unique_name)
 
-        async with aiofiles.open(dest, "wb") as f:
+        try:
+            f = await aiofiles.open(dest, "wb")
+        except FileNotFoundError:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            f = await aiofiles.open(dest, "wb")
+        try:
             while chunk := await file.read(1024 * 64):
                 await f.write(chunk)
+        finally:
+            await f.close()
+
+        return unique_name
+
+    async def save_from_path(self, path: Path, filename: str, digest: str | None = None) -> str:
+        ext = Path(filename).suffix
+        unique_name = f"{uuid.uuid4().hex}{ext}"
+        dest = self._path(unique_name)
+
+        # A spooled upload on the same filesystem is renamed into place; across
+        # filesystems, shutil.copyfile copies in-kernel (sendfile) on Linux.
+        try:
+            _replace(path, dest)
+        except OSError as exc:
+            if exc.errno != errno.EXDEV:
+                raise
+            await asyncio.to_thread(shutil.copyfile, path, dest)
+            path.unlink()
 
         return unique_name
 
-    async def get_path(self, filename: str) -> Path:
-        return self.upload_dir / filename
+    async def get_path(self, filename: str) -> Path | None:
+        return await asyncio.to_thread(self._locate, filename)
+
+    async def get_url(self, filename: str) -> str | None:
+        return None
+
+    async def open_stream(self, filename: str) -> AsyncIterator[bytes]:
+        async with aiofiles.open(await self.get_path(filename), "rb") as f:
+            while chunk := await f.read(1024 * 64):
+                yield chunk
+
+    async def delete(self, filename: str) -> None:
+        self._path(filename).unlink(missing_ok=True)
+        (self.upload_dir / filename).unlink(missing_ok=True)
+
+    # -- layout maintenance ---------------------------------------------------
+
+    def flat_names(self, limit: int | None = None) -> list[str]:
+        """Up to *limit* files still stored directly in *upload_dir* (blocking)."""
+        names: list[str] = []
+        with os.scandir(self.upload_dir) as entries:
+            for entry in entries:
+                if _is_stored(entry):
+                    names.append(entry.name)
+                    if len(names) == limit:
+                        break
+        return names
+
+    def stored_names(self) -> Iterator[str]:
+        """Every stored file name, in either layout (blocking)."""
+        return (entry.name for entry in self._scan())
+
+    def _scan(self) -> Iterator[os.DirEntry]:
+        with os.scandir(self.upload_dir) as entries:
+            yield from filter(_is_stored, entries)
+        for first in _subdirs(self.upload_dir):
+            for second in _subdirs(first):
+                with os.scandir(second) as entries:
+                    yield from filter(_is_stored, entries)
+
+    async def reshard(self, names: list[str]) -> int:
+        """Move files from the flat layout into their shard directories.
+
+        Each file is linked at its new path before the old name is removed,
+        so it can be read by name throughout.  Safe to repeat after an
+        interruption.  Returns how many files were moved.
+        """
+        return await asyncio.to_thread(lambda: sum(self._reshard(name) for name in names))
+
+    def _reshard(self, filename: str) -> bool:
+        flat = self.upload_dir / filename
+        try:
+            _link(flat, self._path(filename))
+        except FileExistsError:
+            pass  # linked by an interrupted run
+        except FileNotFoundError:
+            return False  # deleted since it was listed
+        flat.unlink(missing_ok=True)
+        return True
+
+
+def _is_stored(entry: os.DirEntry) -> bool:
+    # Dot-files are spool, link and bookkeeping files, never stored names.
+    return not entry.name.startswith(".") and entry.is_file(follow_symlinks=False)
+
+
+def _subdirs(path: Path) -> list[Path]:
+    with os.scandir(path) as entries:
+        return [
+            Path(entry.path)
+            for entry in entries
+            if len(entry.name) == 2 and entry.is_dir(follow_symlinks=False)
+        ]
+
+
+def _replace(path: Path, dest: Path) -> None:
+    """``os.replace``, creating *dest*'s shard directory on first use."""
+    try:
+        os.replace(path, dest)
+    except FileNotFoundError:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, dest)
+
+
+def _link(path: Path, dest: Path) -> None:
+    """``os.link``, creating *dest*'s shard directory on first use."""
+    try:
+        os.link(path, dest)
+    except FileNotFoundError:
+        if not path.exists():
+            raise
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        os.link(path, dest)
+
+
+def file_digest(path: Path) -> str:
+    """Hex SHA-256 of the file at *path* (blocking)."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _move_file(path: Path, dest: Path) -> None:
+    try:
+        _replace(path, dest)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        # Copy beside the destination first so *dest* never holds a partial file.
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{uuid.uuid4().hex}.part")
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, dest)
+        path.unlink()
+
+
+@dataclass
+class DedupReport:
+    """Space accounting for a content-addressed upload directory."""
+
+    files: int  # distinct files on disk
+    references: int  # stored names handed out, counting every reference
+    stored_bytes: int
+    referenced_bytes: int  # what the references would occupy without dedup
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.referenced_bytes - self.stored_bytes
+
+
+class ContentAddressedStorageBackend(LocalStorageBackend):
+    """Stores each distinct upload once, named by the SHA-256 of its content.
+
+    Saving content that is already stored discards the new copy and returns
+    the existing name, so prospects who resubmit the same resume share one
+    file.  Each name's reference count lives in ``.refs`` (sharded like the
+    files) and is only changed under an exclusive ``flock`` on its count
+    file, which keeps workers sharing the directory consistent; ``delete``
+    drops one reference and removes the file with the last one.
+
+    Files stored before deduplication was enabled keep their names and have
+    no reference count of their own; one never adopted is deleted outright.
+    :meth:`adopt` links one to the shared copy of its content, counting the
+    name as a reference on that copy, so it no longer takes space and
+    deleting it drops that reference.
+    """
+
+    def __init__(self, upload_dir: str) -> None:
+        super().__init__(upload_dir)
+        self.refs_dir = self.upload_dir / ".refs"
+        self.refs_dir.mkdir(exist_ok=True)
+
+    async def save(self, file: UploadFile, filename: str) -> str:
+        tmp = self.upload_dir / f".{uuid.uuid4().hex}.part"
+        hasher = hashlib.sha256()
+        try:
+            async with aiofiles.open(tmp, "wb") as f:
+                while chunk := await file.read(1024 * 64):
+                    hasher.update(chunk)
+                    await f.write(chunk)
+            return await asyncio.to_thread(
+                self._add_ref, tmp, f"{hasher.hexdigest()}{Path(filename).suffix}"
+            )
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    async def save_from_path(self, path: Path, filename: str, digest: str | None = None) -> str:
+        if digest is None:
+            digest = await asyncio.to_thread(file_digest, path)
+        return await asyncio.to_thread(self._add_ref, path, f"{digest}{Path(filename).suffix}")
 
     async def delete(self, filename: str) -> None:
-        path = self.upload_dir / filename
-        path.unlink(missing_ok=True)
+        await asyncio.to_thread(self._drop_ref, filename)
+
+    async def adopt(self, filename: str) -> bool:
+        """Fold a file stored before deduplication into the shared copies.
+
+        The file keeps its name.  Returns ``True`` when it was a duplicate and
+        now shares storage with an earlier copy, ``False`` when it became the
+        shared copy of its content or had been adopted already.
+        """
+        return await asyncio.to_thread(self._adopt, filename)
+
+    async def report(self) -> DedupReport:
+        """Count stored files and the bytes deduplication saves."""
+        return await asyncio.to_thread(self._report)
+
+    # -- blocking helpers, run in a worker thread ----------------------------
+
+    def _counted(self, name: str) -> bool:
+        return shard_path(self.refs_dir, name).exists() or (self.refs_dir / name).exists()
+
+    def _lock_refs(self, name: str, create: bool = True) -> int:
+        """Open *name*'s reference count exclusively locked; returns the fd.
+
+        A count not yet moved by :meth:`reshard` is opened at its flat path;
+        both paths are links to one inode while it moves, and ``flock`` locks
+        the inode.  Raises ``FileNotFoundError`` when *create* is false and
+        *name* is not reference counted.
+        """
+        sharded = shard_path(self.refs_dir, name)
+        while True:
+            try:
+                fd = os.open(sharded, os.O_RDWR)
+            except FileNotFoundError:
+                try:
+                    fd = os.open(self.refs_dir / name, os.O_RDWR)
+                except FileNotFoundError:
+                    if not create:
+                        raise
+                    sharded.parent.mkdir(parents=True, exist_ok=True)
+                    fd = os.open(sharded, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if os.fstat(fd).st_nlink:
+                return fd
+            # Removed by the last delete while we waited: start over.
+            os.close(fd)
+
+    @staticmethod
+    def _read_refs(fd: int) -> int:
+        return int(os.pread(fd, 32, 0) or b"0")
+
+    @staticmethod
+    def _write_refs(fd: int, count: int) -> None:
+        data = str(count).encode()
+        os.pwrite(fd, data, 0)
+        os.ftruncate(fd, len(data))
+
+    def _add_ref(self, path: Path, name: str) -> str:
+        fd = self._lock_refs(name)
+        try:
+            # The name is the content's hash, so an existing file is this content.
+            if self._locate(name).exists():
+                path.unlink()
+            else:
+                _move_file(path, self._path(name))
+            self._write_refs(fd, self._read_refs(fd) + 1)
+        finally:
+            os.close(fd)
+        return name
+
+    def _drop_ref(self, name: str) -> None:
+        try:
+            fd = self._lock_refs(name, create=False)
+        except FileNotFoundError:
+            self._drop_legacy(name)
+            return
+        try:
+            count = self._read_refs(fd) - 1
+            if count > 0:
+                self._write_refs(fd, count)
+                return
+            for root in (self.upload_dir, self.refs_dir):
+                shard_path(root, name).unlink(missing_ok=True)
+                (root / name).unlink(missing_ok=True)
+        finally:
+            os.close(fd)
+
+    def _drop_legacy(self, filename: str) -> None:
+        path = self._locate(filename)
+        try:
+            adopted = path.stat().st_nlink > 1
+        except FileNotFoundError:
+            return
+        name = f"{file_digest(path)}{path.suffix}" if adopted else None
+        self._path(filename).unlink(missing_ok=True)
+        (self.upload_dir / filename).unlink(missing_ok=True)
+        # An adopted name is one reference on the shared copy of its content.
+        if name is not None and self._counted(name):
+            self._drop_ref(name)
+
+    def _adopt(self, filename: str) -> bool:
+        path = self._locate(filename)
+        if path.stat().st_nlink > 1 or self._counted(filename):
+            return False
+        name = f"{file_digest(path)}{path.suffix}"
+        fd = self._lock_refs(name)
+        try:
+            if path.stat().st_nlink > 1:
+                return False  # adopted by a concurrent run while we hashed
+            shared = self._locate(name)
+            duplicate = shared.exists()
+            if duplicate:
+                # Swap the duplicate for a link atomically; readers never see a gap.
+                tmp = path.with_name(f".{uuid.uuid4().hex}.link")
+                os.link(shared, tmp)
+                os.replace(tmp, path)
+            else:
+                # First copy of this content: it becomes the shared copy.
+                _link(path, shared)
+            self._write_refs(fd, self._read_refs(fd) + 1)
+            return duplicate
+        finally:
+            os.close(fd)
+
+    def _reshard(self, filename: str) -> bool:
+        if not self._counted(filename):
+            return super()._reshard(filename)
+        # Move the count with the file, under its lock, so that no save or
+        # delete sees the file and its count in different places.
+        fd = self._lock_refs(filename)
+        try:
+            flat = self.refs_dir / filename
+            try:
+                _link(flat, shard_path(self.refs_dir, filename))
+            except (FileExistsError, FileNotFoundError):
+                pass  # moved already
+            flat.unlink(missing_ok=True)
+            return super()._reshard(filename)
+        finally:
+            os.close(fd)
+
+    def _read_refs_at(self, name: str, nlink: int) -> int:
+        for path in (shard_path(self.refs_dir, name), self.refs_dir / name):
+            try:
+                return int(path.read_bytes() or b"0")
+            except FileNotFoundError:
+                continue
+        # Stored before deduplication: the name is its only reference, unless
+        # adopt() linked it and counted it on the shared copy.
+        return 1 if nlink == 1 else 0
+
+    def _report(self) -> DedupReport:
+        sizes: dict[int, int] = {}
+        references = referenced_bytes = 0
+        for entry in self._scan():
+            st = entry.stat(follow_symlinks=False)
+            refs = self._read_refs_at(entry.name, st.st_nlink)
+            sizes[st.st_ino] = st.st_size
+            references += refs
+            referenced_bytes += refs * st.st_size
+        return DedupReport(
+            files=len(sizes),
+            references=references,
+            stored_bytes=sum(sizes.values()),
+            referenced_bytes=referenced_bytes,
+        )
@@ -0,0 +1,133 @@
+"""Per-request latency, broken down by stage.
+
+``TimingMiddleware`` is a plain ASGI middleware (no per-request task or
+``BaseHTTPMiddleware`` body buffering).  For every HTTP request it:
+
+- starts a :class:`RequestTimer` in a context variable, so :class:`span`
+  blocks anywhere below it (routes, services, backends) add to it without
+  anything being passed around;
+- adds a ``Server-Timing`` header when the response starts, listing each
+  stage's total and ``app``, the time until the headers were sent;
+- when the response ends, records the request in
+  ``http_request_duration_seconds{method,route,status}`` and each stage in
+  ``http_request_stage_seconds{route,stage}``.
+
+``route`` is the matched route template (``/api/v1/leads/{lead_id}``), never
+the raw path, so label cardinality stays bounded.  A span entered outside a
+request (e.g. in a background worker) is recorded under ``route="background"``.
+A span costs two ``perf_counter`` calls and a dict update.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+from time import perf_counter
+
+from app.core.metrics import registry
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, until the last body byte was sent.",
+    ("method", "route", "status"),
+)
+STAGE_DURATION = registry.histogram(
+    "http_request_stage_seconds",
+    "Time spent in each instrumented stage of a request.",
+    ("route", "stage"),
+)
+
+_current: ContextVar[RequestTimer | None] = ContextVar("request_timer", default=None)
+
+
+class RequestTimer:
+    __slots__ = ("started", "stages")
+
+    def __init__(self) -> None:
+        self.started = perf_counter()
+        self.stages: dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def server_timing(self, elapsed: float) -> bytes:
+        header = b"app;dur=%.2f" % (elapsed * 1000)
+        if not self.stages:
+            return header
+        stages = ", ".join(["%s;dur=%.2f" % (stage, seconds * 1000) for stage, seconds in self.stages.items()])
+        return stages.encode("latin-1") + b", " + header
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Add *seconds* to *stage* of the current request, for time measured elsewhere."""
+    timer = _current.get()
+    if timer is not None:
+        timer.add(stage, seconds)
+    else:
+        STAGE_DURATION.observe(seconds, "background", stage)
+
+
+class span:
+    """Time a block as *stage* of the current request: ``with span("storage.save"): ...``.
+
+    Repeated spans of one stage within a request add up.
+    """
+
+    __slots__ = ("stage", "started")
+
+    def __init__(self, stage: str) -> None:
+        self.stage = stage
+
+    def __enter__(self) -> span:
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        record_stage(self.stage, perf_counter() - self.started)
+
+
+def route_template(scope) -> str:
+    """The matched route's full template, e.g. ``/api/v1/leads/{lead_id}``.
+
+    Routes of an included router report their path relative to the router's
+    prefix, so the prefix is taken from the request path: everything before
+    the template's own segments.  Prefixes are static, so this stays bounded.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    return scope["path"].rsplit("/", template.count("/"))[0] + template
+
+
+class TimingMiddleware:
+    def __init__(self, app, server_timing: bool = True) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = RequestTimer()
+        token = _current.set(timer)
+        status = 500
+
+        async def send_with_timing(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    header = timer.server_timing(perf_counter() - timer.started)
+                    message["headers"] = [*message.get("headers", ()), (b"server-timing", header)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = perf_counter() - timer.started
+            _current.reset(token)
+            label = route_template(scope)
+            REQUEST_DURATION.observe(elapsed, scope["method"], label, str(status))
+            for stage, seconds in timer.stages.items():
+                STAGE_DURATION.observe(seconds, label, stage)
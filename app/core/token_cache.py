@@ -0,0 +1,63 @@
+"""Cache of verified JWT claims.
+
+Decoding a JWT re-parses it and recomputes its HMAC on every request, even
+though a dashboard sends the same token many times.  TokenCache remembers the
+claims of tokens that already passed verification, keyed by the SHA-256 of the
+token so raw credentials are never held as dict keys.  Entries are dropped at
+the token's ``exp`` and the least recently used entry goes first once the cache
+is full.  Only successful verifications are cached, so expired or tampered
+tokens always fall through to full verification.  Every lookup is counted in
+``auth_token_cache_lookups_total`` by result, so the hit rate shows on
+``/metrics``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+
+from app.core.metrics import registry
+
+LOOKUPS = registry.counter(
+    "auth_token_cache_lookups_total", "Verified-token cache lookups, by hit or miss.", ("result",)
+)
+
+
+class TokenCache:
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict | None:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, claims = entry
+            if time.time() < expires_at:
+                self._entries.move_to_end(key)
+                LOOKUPS.inc("hit")
+                return dict(claims)
+            del self._entries[key]
+        LOOKUPS.inc("miss")
+        return None
+
+    def put(self, token: str, claims: dict) -> None:
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)) or self.maxsize <= 0:
+            return
+        key = self._key(token)
+        self._entries[key] = (float(expires_at), dict(claims))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,287 @@
+"""Streaming multipart ingest.
+
+FastAPI's ``UploadFile`` parameters are only populated after python-multipart
+has spooled the entire request body, so size and type checks run after the
+cost of receiving an oversized or bogus file has already been paid, and the
+spooled copy then has to be copied again into storage.
+
+receive_multipart parses the body as it arrives instead.  File parts are
+written straight into *spool_dir* (which should live on the same filesystem as
+the storage directory so the file can later be renamed into place), their
+extension is checked as soon as the part headers arrive, their leading bytes
+are sniffed against known signatures, and the upload is abandoned the moment
+it grows past the size limit.  Each file is SHA-256 hashed as it is written,
+so content-addressed storage never has to read it back.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import aiofiles
+from fastapi import Request
+
+try:
+    import python_multipart as multipart
+    from python_multipart.exceptions import FormParserError
+    from python_multipart.multipart import parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    import multipart
+    from multipart.exceptions import FormParserError
+    from multipart.multipart import parse_options_header
+
+# Headroom for boundaries, part headers and text fields on top of the file.
+FORM_OVERHEAD = 64 * 1024
+MAX_FIELD_SIZE = 16 * 1024
+SNIFF_BYTES = 8
+
+
+class UploadRejected(ValueError):
+    """The request body was refused while it was being received."""
+
+
+def too_large(max_file_size: int) -> UploadRejected:
+    """The rejection for a file over *max_file_size* bytes, worded for the client."""
+    return UploadRejected(f"File too large. Maximum size is {max_file_size // (1024 * 1024)} MB")
+
+
+@dataclass
+class SpooledUpload:
+    """A file part written to local disk, awaiting hand-off to storage."""
+
+    path: Path
+    filename: str
+    size: int = 0
+    hasher: Any = field(default_factory=hashlib.sha256, repr=False, compare=False)
+
+    @property
+    def digest(self) -> str:
+        """Hex SHA-256 of the bytes written so far."""
+        return self.hasher.hexdigest()
+
+    def discard(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+@dataclass
+class StreamedForm:
+    fields: dict[str, str] = field(default_factory=dict)
+    files: dict[str, SpooledUpload] = field(default_factory=dict)
+
+    def discard(self) -> None:
+        """Remove any spooled files that were not handed off to storage."""
+        for upload in self.files.values():
+            upload.discard()
+
+
+class _Receiver:
+    """python-multipart callbacks plus the async file writes they schedule."""
+
+    def __init__(
+        self,
+        spool_dir: Path,
+        max_file_size: int,
+        signatures: dict[str, tuple[bytes, ...]],
+        max_files: int = 1,
+    ) -> None:
+        self.spool_dir = spool_dir
+        self.max_file_size = max_file_size
+        self.signatures = signatures
+        self.max_files = max_files
+        self.form = StreamedForm()
+
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._field_name = ""
+        self._field_data = bytearray()
+        self._upload: SpooledUpload | None = None
+        self._extension = ""
+        self._head = bytearray()
+        self._sniffed = False
+        self._file_count = 0
+        # Set once the closing boundary has been parsed.
+        self.complete = False
+
+        # File I/O requested by the callbacks, in order: a SpooledUpload to
+        # open, bytes to write to the open one, or None to close it.
+        self._sink = None
+        self._pending: list[SpooledUpload | bytes | None] = []
+
+    # -- parser callbacks (synchronous) -------------------------------------
+
+    def on_part_begin(self) -> None:
+        self._disposition = b""
+        self._field_data = bytearray()
+        self._upload = None
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        if b"name" not in options:
+            raise UploadRejected("Malformed multipart body: part without a name")
+        self._field_name = options[b"name"].decode("utf-8", "replace")
+        if b"filename" not in options:
+            return
+
+        if self._file_count >= self.max_files:
+            if self.max_files == 1:
+                raise UploadRejected("Only one file may be uploaded")
+            raise UploadRejected(f"At most {self.max_files} files may be uploaded")
+        self._file_count += 1
+        filename = options[b"filename"].decode("utf-8", "replace")
+        self._extension = Path(filename).suffix.lower()
+        if self._extension not in self.signatures:
+            raise UploadRejected(
+                f"Invalid file type '{self._extension}'. "
+                f"Allowed: {', '.join(sorted(self.signatures))}"
+            )
+        self._upload = SpooledUpload(
+            path=self.spool_dir / f".{uuid.uuid4().hex}.part", filename=filename
+        )
+        self._head = bytearray()
+        self._sniffed = False
+        self._pending.append(self._upload)
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        chunk = data[start:end]
+        if self._upload is None:
+            if len(self._field_data) + len(chunk) > MAX_FIELD_SIZE:
+                raise UploadRejected(f"Form field '{self._field_name}' is too large")
+            self._field_data.extend(chunk)
+            return
+
+        self._upload.size += len(chunk)
+        if self._upload.size > self.max_file_size:
+            raise too_large(self.max_file_size)
+        if not self._sniffed:
+            self._head.extend(chunk[:SNIFF_BYTES])
+            if len(self._head) >= SNIFF_BYTES:
+                self._sniff()
+        self._upload.hasher.update(chunk)
+        self._pending.append(chunk)
+
+    def on_part_end(self) -> None:
+        if self._upload is None:
+            self.form.fields[self._field_name] = self._field_data.decode("utf-8", "replace")
+            return
+        if not self._sniffed:
+            self._sniff()
+        self.form.files[self._field_name] = self._upload
+        self._pending.append(None)
+
+    def on_end(self) -> None:
+        self.complete = True
+
+    def _sniff(self) -> None:
+        if not any(self._head.startswith(sig) for sig in self.signatures[self._extension]):
+            raise UploadRejected(
+                f"Invalid file type: content is not a valid '{self._extension}' file"
+            )
+        self._sniffed = True
+
+    # -- async I/O between parser writes ------------------------------------
+
+    async def flush(self) -> None:
+        pending, self._pending = self._pending, []
+        chunks: list[bytes] = []
+        for op in pending:
+            if isinstance(op, bytes):
+                chunks.append(op)
+                continue
+            if chunks:
+                await self._sink.write(b"".join(chunks))
+                chunks.clear()
+            if op is None:
+                await self._sink.close()
+                self._sink = None
+                continue
+            try:
+                self._sink = await aiofiles.open(op.path, "wb")
+            except FileNotFoundError:
+                self.spool_dir.mkdir(parents=True, exist_ok=True)
+                self._sink = await aiofiles.open(op.path, "wb")
+        if chunks:
+            await self._sink.write(b"".join(chunks))
+
+    async def abort(self) -> None:
+        if self._sink is not None:
+            await self._sink.close()
+            self._sink = None
+        if self._upload is not None:
+            self._upload.discard()
+        self.form.discard()
+
+
+async def receive_multipart(
+    request: Request,
+    *,
+    spool_dir: Path,
+    max_file_size: int,
+    signatures: dict[str, tuple[bytes, ...]],
+    max_files: int = 1,
+) -> StreamedForm:
+    """Parse a ``multipart/form-data`` body, spooling at most *max_files* file parts.
+
+    *signatures* maps each allowed (lower-case) file extension to the byte
+    prefixes its content may start with; *max_file_size* applies per file.  Raises :class:`UploadRejected` as
+    soon as the body is known to be unacceptable; nothing is left on disk in
+    that case.  On success the caller owns the spooled files and must hand them
+    to storage or call :meth:`StreamedForm.discard`.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise UploadRejected("Expected a multipart/form-data request body")
+
+    # Refuse a declared-oversize body before reading any of it.
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_file_size * max_files + FORM_OVERHEAD:
+        raise too_large(max_file_size)
+
+    receiver = _Receiver(spool_dir, max_file_size, signatures, max_files)
+
+    parser = multipart.MultipartParser(
+        params[b"boundary"],
+        callbacks={
+            "on_part_begin": receiver.on_part_begin,
+            "on_part_data": receiver.on_part_data,
+            "on_part_end": receiver.on_part_end,
+            "on_header_field": receiver.on_header_field,
+            "on_header_value": receiver.on_header_value,
+            "on_header_end": receiver.on_header_end,
+            "on_headers_finished": receiver.on_headers_finished,
+            "on_end": receiver.on_end,
+        },
+    )
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            await receiver.flush()
+        parser.finalize()
+        await receiver.flush()
+        # finalize() accepts a body cut off before its closing boundary, and a
+        # file part still being written would never reach form.files.
+        if not receiver.complete:
+            raise UploadRejected("Malformed multipart body")
+    except FormParserError as exc:
+        await receiver.abort()
+        raise UploadRejected("Malformed multipart body") from exc
+    except BaseException:
+        await receiver.abort()
+        raise
+    return receiver.form
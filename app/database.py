@@ -1,18 +1,219 @@
-from collections.abc import AsyncGenerator
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event, exc
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
+from app.core.metrics import registry
+from app.core.timing import record_stage, route_template
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
-async_session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+logger = logging.getLogger(__name__)
 
+POOL_WAIT = registry.histogram(
+    "db_pool_wait_seconds",
+    "Time to acquire a pooled connection, including opening one when the pool grows.",
+    ("pool",),
+)
+POOL_TIMEOUTS = registry.counter(
+    "db_pool_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT.", ("pool",)
+)
+POOL_CONNECTS = registry.counter(
+    "db_pool_connections_opened_total", "New database connections opened.", ("pool",)
+)
+POOL_INVALIDATIONS = registry.counter(
+    "db_pool_invalidations_total", "Connections discarded as broken or stale.", ("pool",)
+)
+POOL_CHECKED_OUT = registry.gauge("db_pool_checked_out", "Connections currently in use.", ("pool",))
+POOL_CHECKED_IN = registry.gauge("db_pool_checked_in", "Idle connections in the pool.", ("pool",))
+POOL_OVERFLOW = registry.gauge(
+    "db_pool_overflow", "Connections open beyond DB_POOL_SIZE (negative while the pool fills).", ("pool",)
+)
+POOL_SIZE = registry.gauge("db_pool_size", "Configured DB_POOL_SIZE.", ("pool",))
+STATEMENT_DURATION = registry.histogram(
+    "db_statement_duration_seconds", "Execution time of each SQL statement.", ("pool",)
+)
+STATEMENTS_PER_REQUEST = registry.histogram(
+    "db_statements_per_request",
+    "SQL statements executed while handling one HTTP request.",
+    ("route",),
+    buckets=(0, 1, 2, 3, 4, 5, 8, 13, 21, 50, 100),
+)
+
+_STARTED = "query_started"
+
+
+class QueryStats:
+    """Statements executed, and seconds spent executing them, inside :func:`track_queries`."""
+
+    __slots__ = ("statements", "seconds", "parent")
+
+    def __init__(self, parent: "QueryStats | None" = None) -> None:
+        self.statements = 0
+        self.seconds = 0.0
+        self.parent = parent
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count the statements run by this task (and tasks it starts) inside the block.
+
+    Trackers nest: a statement counts towards every enclosing tracker, so a
+    test can measure one request while the middleware measures it too.
+    """
+    stats = QueryStats(_query_stats.get())
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def _redacted(parameters) -> str:
+    """Parameter types only: values may be personal data and never reach the log."""
+    rows = parameters if isinstance(parameters, (list, tuple)) else ()
+    if rows and isinstance(rows[0], (list, tuple, dict)):
+        return f"{len(parameters)} rows of {_redacted(parameters[0])}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    return "(" + ", ".join(type(value).__name__ for value in parameters or ()) + ")"
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """The default async queue pool, timing every checkout.
+
+    SQLAlchemy's pool events fire once a connection has been handed out, so
+    the time spent queueing for one is measured here instead.
+    """
+
+    label = "primary"
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc(self.label)
+            raise
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - started, self.label)
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.label = self.label
+        return pool
 
-class Base(DeclarativeBase):
-    pass
 
+# SQLAlchemy names a pool's logger after its class and quiets everything under
+# "sqlalchemy" to WARN; this subclass's logger is under "app" instead.
+logging.getLogger(f"{__name__}.{InstrumentedQueuePool.__name__}").setLevel(logging.WARNING)
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_factory() as session:
-        yield session
+
+def _is_memory_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def instrument_engine(engine: AsyncEngine, label: str) -> None:
+    """Export *engine*'s pool and statement timings under ``pool=label``.
+
+    Pool gauges replace those of an earlier engine with the same label.
+    Every statement is also counted towards the enclosing :func:`track_queries`
+    blocks and the request's ``sql`` stage, and logged when slower than
+    ``SLOW_QUERY_SECONDS``.  Transaction control (BEGIN/COMMIT) is not a
+    cursor statement and is not counted.
+    """
+    sync_engine = engine.sync_engine
+    if isinstance(sync_engine.pool, InstrumentedQueuePool):
+        sync_engine.pool.label = label
+        POOL_CHECKED_OUT.set_function(lambda: sync_engine.pool.checkedout(), label)
+        POOL_CHECKED_IN.set_function(lambda: sync_engine.pool.checkedin(), label)
+        POOL_OVERFLOW.set_function(lambda: sync_engine.pool.overflow(), label)
+        POOL_SIZE.set_function(lambda: sync_engine.pool.size(), label)
+
+    @event.listens_for(sync_engine, "connect")
+    def _connect(_dbapi_conn, _record):
+        POOL_CONNECTS.inc(label)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+        # A stack, as SQLAlchemy's recipe has it: a shared connection (StaticPool)
+        # may see another session's statement start before this one ends.
+        conn.info.setdefault(_STARTED, []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn, _cursor, statement, parameters, _context, _executemany):
+        elapsed = time.perf_counter() - conn.info[_STARTED].pop()
+        STATEMENT_DURATION.observe(elapsed, label)
+        record_stage("sql", elapsed)
+        stats = _query_stats.get()
+        while stats is not None:
+            stats.statements += 1
+            stats.seconds += elapsed
+            stats = stats.parent
+        if elapsed >= settings.SLOW_QUERY_SECONDS:
+            logger.warning(
+                "Slow query on %s (%.1f ms): %s -- parameters: %s",
+                label, elapsed * 1000, " ".join(statement.split()), _redacted(parameters),
+            )
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _invalidate(_dbapi_conn, _record, _exception):
+        POOL_INVALIDATIONS.inc(label)
+
+
+def build_engine(url: str | None = None, label: str = "primary") -> AsyncEngine:
+    url = make_url(url or settings.DATABASE_URL)
+    kwargs: dict = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    # In-memory SQLite is one connection by definition; its StaticPool takes
+    # no sizing arguments.
+    if not _is_memory_sqlite(url):
+        kwargs.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    if url.get_driver_name() == "asyncpg":
+        # SQLAlchemy keeps its own per-connection cache of prepared statements
+        # on top of asyncpg's; both must be 0 behind a transaction-mode pooler.
+        cache_size = settings.DB_STATEMENT_CACHE_SIZE
+        url = url.update_query_dict({"prepared_statement_cache_size": str(cache_size)})
+        kwargs["connect_args"] = {"statement_cache_size": cache_size}
+    engine = create_async_engine(url, echo=False, **kwargs)
+    instrument_engine(engine, label)
+    return engine
+
+
+class QueryAccountingMiddleware:
+    """Record how many SQL statements each HTTP request executes, per route."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                STATEMENTS_PER_REQUEST.observe(stats.statements, route_template(scope))
+
+
+def build_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+class Base(DeclarativeBase):
+    pass
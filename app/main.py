@@ -1,23 +1,39 @@
 import logging
 from contextlib import asynccontextmanager
-from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 
 logging.basicConfig(level=logging.INFO)
+# httpx logs every request at INFO, which would include each S3 call.
+logging.getLogger("httpx").setLevel(logging.WARNING)
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.routes import leads, auth
+from app.api.routes import leads, auth, outbox, uploads
 from app.config import settings
+from app.core.metrics import registry
+from app.core.timing import TimingMiddleware
+from app.database import QueryAccountingMiddleware
+from app.resources import Resources
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Path(settings.UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
-    yield
+    resources = app.state.resources
+    try:
+        await resources.start()
+        yield
+    finally:
+        # A drained container cannot serve again (its hashing pool is shut
+        # down), so requests arriving after shutdown get a fresh, unstarted one.
+        app.state.resources = Resources.build()
+        await resources.close()
 
 
 app = FastAPI(title="Alma Lead Management", lifespan=lifespan)
+# Built here, once per process, rather than by whichever request comes first:
+# concurrent first requests would each build an engine and leak all but one.
+# Building opens no connections; the lifespan starts it.
+app.state.resources = Resources.build()
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,11 +42,22 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryAccountingMiddleware)
+# Added last so it wraps everything else, CORS included.
+app.add_middleware(TimingMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
 
 app.include_router(leads.router, prefix="/api/v1/leads", tags=["leads"])
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
+app.include_router(outbox.router, prefix="/api/v1/outbox", tags=["outbox"])
+# Matches LeadResponse.resume_url, which is "/uploads/<stored name>".
+app.include_router(uploads.router, prefix="/uploads", tags=["uploads"])
 
 
 @app.get("/health", tags=["health"])
 async def health_check():
     return {"status": "ok"}
+
+
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def metrics():
+    return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
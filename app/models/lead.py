@@ -1,14 +1,18 @@
 import enum
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import String, DateTime, func, Enum as SAEnum
+from sqlalchemy import String, DateTime, Index, func, Enum as SAEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
 
 
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class LeadStatus(str, enum.Enum):
     PENDING = "PENDING"
     REACHED_OUT = "REACHED_OUT"
@@ -16,6 +20,12 @@ class LeadStatus(str, enum.Enum):
 
 class Lead(Base):
     __tablename__ = "leads"
+    __table_args__ = (
+        # Backs keyset pagination on (created_at DESC, id DESC); Postgres walks it backwards.
+        Index("ix_leads_created_at_id", "created_at", "id"),
+        # Backs the change feed's seek past an (updated_at, id) watermark.
+        Index("ix_leads_updated_at_id", "updated_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
@@ -29,7 +39,28 @@ class Lead(Base):
         nullable=False,
         server_default=LeadStatus.PENDING.value,
     )
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Python-side defaults give microsecond resolution on every backend (SQLite's
+    # CURRENT_TIMESTAMP is whole seconds), which keeps timestamp sort keys stable.
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utcnow, server_default=func.now()
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True), default=utcnow, server_default=func.now(), onupdate=utcnow
     )
+
+
+# Backs the list filters (see LeadFilter): status with newest-first paging,
+# exact email lookup, and name prefix search. text_pattern_ops lets Postgres
+# plan LIKE 'prefix%' as an index range under any collation.
+Index("ix_leads_status_created_at_id", Lead.status, Lead.created_at, Lead.id)
+Index("ix_leads_lower_email", func.lower(Lead.email))
+Index(
+    "ix_leads_lower_first_name",
+    func.lower(Lead.first_name).label("lower_first_name"),
+    postgresql_ops={"lower_first_name": "text_pattern_ops"},
+)
+Index(
+    "ix_leads_lower_last_name",
+    func.lower(Lead.last_name).label("lower_last_name"),
+    postgresql_ops={"lower_last_name": "text_pattern_ops"},
+)
@@ -0,0 +1,32 @@
+from sqlalchemy import BigInteger, DDL, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.lead import LeadStatus
+
+TOTAL_COUNTER = "total"
+COUNTER_NAMES = [TOTAL_COUNTER, *(s.value for s in LeadStatus)]
+
+
+class LeadCounter(Base):
+    """Rollup of lead counts, kept in step with ``leads`` by LeadRepository.
+
+    One row per counter: ``total`` plus one per ``LeadStatus`` value.
+    """
+
+    __tablename__ = "lead_counters"
+
+    name: Mapped[str] = mapped_column(String(32), primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+
+
+# Counters are only ever incremented in place, so the rows must exist up front.
+# Alembic seeds them from live data; this covers ``metadata.create_all`` (tests).
+event.listen(
+    LeadCounter.__table__,
+    "after_create",
+    DDL(
+        "INSERT INTO lead_counters (name, value) VALUES "
+        + ", ".join(f"('{name}', 0)" for name in COUNTER_NAMES)
+    ),
+)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.lead import Lead
+from app.repositories.lead_repository import LeadRepository
+from app.repositories.outbox_repository import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingLead:
+    row: dict
+    emails: list[tuple[str, str, str]]
+    future: asyncio.Future
+
+
+class LeadBatchWriter:
+    """Group-commit writer for lead submissions.
+
+    Concurrent :meth:`create` calls are collected for up to *max_wait* seconds
+    (or until *max_batch* are waiting) and written in one transaction: a single
+    multi-row ``INSERT ... RETURNING`` for the leads, their outbox emails, and
+    one counter update.  Under burst load this trades a few milliseconds of
+    latency for one commit (and one WAL flush) per batch instead of per lead.
+    Each caller still gets its own ``Lead`` back, or its own exception.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        max_batch: int = 100,
+        max_wait: float = 0.005,
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches_written = 0
+        self.leads_written = 0
+        self._pending: list[_PendingLead] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._in_flight: set[asyncio.Task] = set()
+
+    async def create(
+        self, lead_data: dict, resume_path: str, emails: list[tuple[str, str, str]]
+    ) -> Lead:
+        """Queue one lead plus its ``(to, subject, body)`` emails and wait for the commit."""
+        loop = asyncio.get_running_loop()
+        item = _PendingLead(
+            row={**lead_data, "id": uuid.uuid4(), "resume_path": resume_path},
+            emails=emails,
+            future=loop.create_future(),
+        )
+        self._pending.append(item)
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await item.future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._write(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _write(self, batch: list[_PendingLead]) -> None:
+        try:
+            leads = await self._insert(batch)
+        except Exception as exc:
+            if len(batch) == 1:
+                if not batch[0].future.done():
+                    batch[0].future.set_exception(exc)
+                return
+            # Isolate the offending row(s): retry each lead on its own.
+            logger.warning("Batch insert of %d leads failed, retrying individually", len(batch))
+            for item in batch:
+                await self._write([item])
+            return
+        for item, lead in zip(batch, leads):
+            if not item.future.done():
+                item.future.set_result(lead)
+
+    async def _insert(self, batch: list[_PendingLead]) -> list[Lead]:
+        async with self.session_factory() as session:
+            await OutboxRepository(session).enqueue_many(
+                [email for item in batch for email in item.emails]
+            )
+            leads = await LeadRepository(session).create_many([item.row for item in batch])
+        self.batches_written += 1
+        self.leads_written += len(leads)
+        return leads
+
+    async def close(self) -> None:
+        """Write anything still queued and wait for in-flight batches."""
+        self._flush()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
@@ -1,44 +1,330 @@
 from __future__ import annotations
 
+import string
 import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, fields
+from datetime import datetime
 
-from sqlalchemy import select, func
+from sqlalchemy import Row, Select, and_, case, insert, or_, select, func, text, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.lead import Lead, LeadStatus
+from app.models.lead_counter import TOTAL_COUNTER, LeadCounter
+
+
+# Columns behind a LeadResponse, in its field order (resume_path stands in for
+# resume_url).
+LEAD_LIST_COLUMNS = (
+    Lead.id,
+    Lead.first_name,
+    Lead.last_name,
+    Lead.email,
+    Lead.resume_path,
+    Lead.status,
+    Lead.created_at,
+    Lead.updated_at,
+)
+
+# Columns a bulk-imported row supplies itself; COPY applies no column defaults.
+_COPY_COLUMNS = (
+    "id",
+    "first_name",
+    "last_name",
+    "email",
+    "resume_path",
+    "created_at",
+    "updated_at",
+)
+
+
+@dataclass(frozen=True)
+class LeadFilter:
+    """Conditions shared by the list, count and export queries.
+
+    Each condition has an index behind it (see ``app/models/lead.py``).
+    """
+
+    status: LeadStatus | None = None
+    created_after: datetime | None = None  # exclusive
+    created_before: datetime | None = None  # exclusive
+    email: str | None = None  # exact, case-insensitive
+    name: str | None = None  # case-insensitive prefix of the first or last name
+
+    def __bool__(self) -> bool:
+        return any(getattr(self, f.name) is not None for f in fields(self))
+
+    def apply(self, stmt: Select, dialect: str) -> Select:
+        if self.status is not None:
+            stmt = stmt.where(Lead.status == self.status)
+        if self.created_after is not None:
+            stmt = stmt.where(Lead.created_at > self.created_after)
+        if self.created_before is not None:
+            stmt = stmt.where(Lead.created_at < self.created_before)
+        if self.email is not None:
+            stmt = stmt.where(func.lower(Lead.email) == _fold(self.email, dialect))
+        if self.name:
+            stmt = stmt.where(
+                or_(
+                    _prefix_match(Lead.first_name, self.name, dialect),
+                    _prefix_match(Lead.last_name, self.name, dialect),
+                )
+            )
+        return stmt
+
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _fold(value: str, dialect: str) -> str:
+    """*value* lowered the way *dialect*'s SQL ``lower()`` lowers the column.
+
+    Postgres folds every letter.  SQLite's built-in ``lower()`` folds ASCII
+    only, so there "Élo" still matches "Éloise" but "élo" does not.
+    """
+    return value.lower() if dialect == "postgresql" else value.translate(_ASCII_LOWER)
+
+
+def _prefix_match(column, prefix: str, dialect: str):
+    lowered, prefix = func.lower(column), _fold(prefix, dialect)
+    if dialect == "postgresql":
+        # Planned as a range scan on the text_pattern_ops expression index.
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return lowered.like(escaped + "%")
+    # SQLite only applies its LIKE optimisation to plain columns; a range in
+    # byte order is the same test and can use the expression index.
+    return and_(lowered >= prefix, lowered < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+
+def _page(stmt: Select, skip: int, limit: int, after: tuple[datetime, uuid.UUID] | None) -> Select:
+    stmt = stmt.order_by(Lead.created_at.desc(), Lead.id.desc()).limit(limit)
+    if after is not None:
+        return stmt.where(tuple_(Lead.created_at, Lead.id) < tuple_(*after))
+    return stmt.offset(skip)
 
 
 class LeadRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    @property
+    def _dialect(self) -> str:
+        return self.db.get_bind().dialect.name
+
     async def create(self, lead_data: dict, resume_path: str) -> Lead:
-        lead = Lead(**lead_data, resume_path=resume_path)
+        # Every column is set client-side (the timestamps by their Python
+        # defaults at flush), so the INSERT needs no RETURNING and the lead
+        # needs no refresh after the commit.
+        lead = Lead(
+            id=uuid.uuid4(), status=LeadStatus.PENDING, **lead_data, resume_path=resume_path
+        )
         self.db.add(lead)
+        await self._bump_counters({TOTAL_COUNTER: 1, LeadStatus.PENDING.value: 1})
         await self.db.commit()
-        await self.db.refresh(lead)
         return lead
 
+    async def create_many(self, rows: list[dict]) -> list[Lead]:
+        """Insert PENDING leads with one multi-row ``INSERT ... RETURNING``.
+
+        Each row needs every column without a server-generated value except
+        ``status``, including a client-generated ``id``. Leads come back in the
+        order of *rows*.
+        """
+        result = await self.db.execute(
+            insert(Lead).returning(Lead, sort_by_parameter_order=True),
+            [{**row, "status": LeadStatus.PENDING} for row in rows],
+        )
+        leads = list(result.scalars().all())
+        await self._bump_counters({TOTAL_COUNTER: len(leads), LeadStatus.PENDING.value: len(leads)})
+        await self.db.commit()
+        return leads
+
+    async def insert_many(self, rows: list[dict]) -> None:
+        """Insert PENDING leads in bulk without reading them back.
+
+        Each row needs every column except ``status``. Postgres loads the rows
+        with binary ``COPY``; other databases get a single executemany
+        ``INSERT``. The write joins the session's transaction and is committed
+        here along with anything else the caller staged.
+        """
+        # Runs first so that the transaction is open before COPY borrows the
+        # driver connection.
+        await self._bump_counters({TOTAL_COUNTER: len(rows), LeadStatus.PENDING.value: len(rows)})
+        if self._dialect == "postgresql":
+            conn = await self.db.connection()
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                Lead.__tablename__,
+                columns=[*_COPY_COLUMNS, "status"],
+                records=[
+                    (*(row[c] for c in _COPY_COLUMNS), LeadStatus.PENDING.value) for row in rows
+                ],
+            )
+        else:
+            await self.db.execute(
+                insert(Lead), [{**row, "status": LeadStatus.PENDING} for row in rows]
+            )
+        await self.db.commit()
+
     async def get_by_id(self, lead_id: uuid.UUID) -> Lead | None:
         result = await self.db.execute(select(Lead).where(Lead.id == lead_id))
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int = 0, limit: int = 50) -> tuple[list[Lead], int]:
-        count_result = await self.db.execute(select(func.count()).select_from(Lead))
-        total = count_result.scalar_one()
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 50,
+        after: tuple[datetime, uuid.UUID] | None = None,
+    ) -> list[Lead]:
+        """Return a page of leads, newest first.
+
+        When *after* is given it is the ``(created_at, id)`` key of the last row
+        already seen; the page seeks past it and *skip* is ignored.
+        """
+        rows_result = await self.db.execute(_page(select(Lead), skip, limit, after))
+        return list(rows_result.scalars().all())
+
+    async def get_page_rows(
+        self,
+        skip: int = 0,
+        limit: int = 50,
+        after: tuple[datetime, uuid.UUID] | None = None,
+        where: LeadFilter = LeadFilter(),
+    ) -> list[Row]:
+        """Same page as :meth:`get_all`, as plain tuples of ``LEAD_LIST_COLUMNS``.
 
-        rows_result = await self.db.execute(
-            select(Lead).order_by(Lead.created_at.desc()).offset(skip).limit(limit)
+        Skips ORM identity-map bookkeeping and attribute instrumentation,
+        which dominate the cost of materialising a large page of entities.
+        Only leads matching *where* are included.
+        """
+        stmt = where.apply(select(*LEAD_LIST_COLUMNS), self._dialect)
+        rows_result = await self.db.execute(_page(stmt, skip, limit, after))
+        return list(rows_result.all())
+
+    async def get_changes(
+        self,
+        after: tuple[datetime, uuid.UUID] | None,
+        limit: int,
+        until: datetime,
+    ) -> list[Row]:
+        """Leads whose ``(updated_at, id)`` key is past *after*, oldest change first.
+
+        Rows updated after *until* are left for a later call. The tuple
+        comparison keeps rows that share a timestamp apart, so a page boundary
+        inside a run of equal ``updated_at`` values neither skips nor repeats
+        any of them.
+        """
+        stmt = (
+            select(*LEAD_LIST_COLUMNS)
+            .where(Lead.updated_at <= until)
+            .order_by(Lead.updated_at, Lead.id)
+            .limit(limit)
         )
-        leads = list(rows_result.scalars().all())
+        if after is not None:
+            stmt = stmt.where(tuple_(Lead.updated_at, Lead.id) > tuple_(*after))
+        rows_result = await self.db.execute(stmt)
+        return list(rows_result.all())
+
+    async def stream_rows(
+        self, where: LeadFilter = LeadFilter(), batch_size: int = 1000
+    ) -> AsyncIterator[list[Row]]:
+        """Yield every lead matching *where*, oldest first, as ``LEAD_LIST_COLUMNS`` tuples.
+
+        Rows are read through a server-side cursor *batch_size* at a time, so
+        only one batch is ever held in memory whatever the table size.
+        """
+        stmt = where.apply(select(*LEAD_LIST_COLUMNS), self._dialect)
+        stmt = stmt.order_by(Lead.created_at, Lead.id)
+        result = await self.db.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield partition
+
+    async def count(self, where: LeadFilter = LeadFilter()) -> int:
+        """Exact count of leads matching *where*; unfiltered, a full scan on Postgres."""
+        stmt = where.apply(select(func.count()).select_from(Lead), self._dialect)
+        result = await self.db.execute(stmt)
+        return result.scalar_one()
+
+    async def count_cached(self, status: LeadStatus | None = None) -> int:
+        """Exact count of all leads, or of those in *status*, from one ``lead_counters`` row."""
+        name = TOTAL_COUNTER if status is None else status.value
+        result = await self.db.execute(select(LeadCounter.value).where(LeadCounter.name == name))
+        return result.scalar_one()
 
-        return leads, total
+    async def count_estimate(self) -> int:
+        """Planner estimate from ``pg_class.reltuples``; the cached count elsewhere.
 
-    async def update_status(self, lead_id: uuid.UUID, status: LeadStatus) -> Lead | None:
-        lead = await self.get_by_id(lead_id)
-        if lead is None:
-            return None
-        lead.status = status
+        Falls back to the cached count when the table has never been analyzed.
+        """
+        if self._dialect == "postgresql":
+            result = await self.db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'leads'::regclass")
+            )
+            estimate = result.scalar_one()
+            if estimate >= 0:
+                return estimate
+        return await self.count_cached()
+
+    async def exists(self, lead_id: uuid.UUID) -> bool:
+        result = await self.db.execute(select(Lead.id).where(Lead.id == lead_id))
+        return result.first() is not None
+
+    async def transition_status(
+        self, lead_id: uuid.UUID, from_status: LeadStatus, to_status: LeadStatus
+    ) -> Lead | None:
+        """Move a lead from *from_status* to *to_status* in one conditional UPDATE.
+
+        Returns the updated lead, or ``None`` when no lead with that id is
+        currently in *from_status*; the check and the write cannot interleave
+        with a concurrent transition.
+        """
+        result = await self.db.execute(
+            update(Lead)
+            .where(Lead.id == lead_id, Lead.status == from_status)
+            .values(status=to_status)
+            .returning(Lead)
+        )
+        lead = result.scalar_one_or_none()
+        if lead is not None:
+            await self._bump_counters({from_status.value: -1, to_status.value: 1})
         await self.db.commit()
-        await self.db.refresh(lead)
         return lead
+
+    async def transition_status_many(
+        self, lead_ids: list[uuid.UUID], from_status: LeadStatus, to_status: LeadStatus
+    ) -> tuple[list[Row], set[uuid.UUID]]:
+        """Bulk form of :meth:`transition_status`.
+
+        Returns ``(updated, skipped)``: the moved leads as ``LEAD_LIST_COLUMNS``
+        tuples, and the ids that exist but were not in *from_status*. Any
+        other id was not found.
+        """
+        result = await self.db.execute(
+            update(Lead)
+            .where(Lead.id.in_(lead_ids), Lead.status == from_status)
+            .values(status=to_status)
+            .returning(*LEAD_LIST_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        rows = list(result.all())
+        updated = {row.id for row in rows}
+        skipped: set[uuid.UUID] = set()
+        if updated:
+            await self._bump_counters({from_status.value: -len(updated), to_status.value: len(updated)})
+        if remaining := [i for i in lead_ids if i not in updated]:
+            result = await self.db.execute(select(Lead.id).where(Lead.id.in_(remaining)))
+            skipped = set(result.scalars().all())
+        await self.db.commit()
+        return rows, skipped
+
+    async def rollback(self) -> None:
+        await self.db.rollback()
+
+    async def _bump_counters(self, deltas: dict[str, int]) -> None:
+        """Apply *deltas* to the rollup counters inside the current transaction."""
+        await self.db.execute(
+            update(LeadCounter)
+            .where(LeadCounter.name.in_(deltas))
+            .values(value=LeadCounter.value + case(deltas, value=LeadCounter.name, else_=0))
+            .execution_options(synchronize_session=False)
+        )
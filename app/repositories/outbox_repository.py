@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.email_outbox import EmailOutbox, OutboxStatus
+from app.models.lead import utcnow
+
+
+class OutboxRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue_many(
+        self, messages: list[tuple[str, str, str]], *, commit: bool = False
+    ) -> None:
+        """Stage ``(to, subject, body)`` emails with one executemany ``INSERT``.
+
+        The rows join the current transaction and, unless *commit* is set,
+        commit with the caller's next write. No ORM objects are created, and
+        the rows need nothing read back, so this is one statement.
+        """
+        if messages:
+            await self.db.execute(
+                insert(EmailOutbox),
+                [{"recipient": to, "subject": subject, "body": body} for to, subject, body in messages],
+            )
+        if commit:
+            await self.db.commit()
+
+    async def claim_batch(self, limit: int, lease: timedelta) -> list[EmailOutbox]:
+        """Lease up to *limit* due messages for delivery.
+
+        Claimed rows are pushed ``lease`` into the future and committed before
+        any email is sent, so concurrent dispatchers skip them and a crashed
+        dispatcher's messages become due again once the lease runs out.
+        """
+        now = utcnow()
+        result = await self.db.execute(
+            select(EmailOutbox)
+            .where(
+                EmailOutbox.status == OutboxStatus.PENDING,
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        messages = list(result.scalars().all())
+        for message in messages:
+            message.attempts += 1
+            message.next_attempt_at = now + lease
+        await self.db.commit()
+        return messages
+
+    async def record_delivery(
+        self,
+        sent: list[EmailOutbox],
+        failed: list[tuple[EmailOutbox, str, datetime | None]],
+    ) -> None:
+        """Persist a batch's outcome. Failures with no retry time are dead-lettered."""
+        now = utcnow()
+        for message in sent:
+            message.status = OutboxStatus.SENT
+            message.sent_at = now
+            message.last_error = None
+        for message, error, retry_at in failed:
+            message.last_error = error
+            if retry_at is None:
+                message.status = OutboxStatus.DEAD
+            else:
+                message.next_attempt_at = retry_at
+        await self.db.commit()
+
+    async def count_by_status(self) -> dict[OutboxStatus, int]:
+        result = await self.db.execute(
+            select(EmailOutbox.status, func.count())
+            .where(EmailOutbox.status != OutboxStatus.SENT)
+            .group_by(EmailOutbox.status)
+        )
+        counts = {status: 0 for status in OutboxStatus if status != OutboxStatus.SENT}
+        counts.update(dict(result.all()))
+        return counts
@@ -0,0 +1,181 @@
+"""Application-lifetime resources.
+
+Everything that is expensive to build, or that holds connections or
+background tasks, is built once per process and shared by every request:
+the database engine and its pool (and the read replica's, when configured),
+the storage backend, the email backend, the password hashing pool, and the
+optional group-commit writer, event broker and outbox dispatcher.
+``app.main``'s lifespan starts a :class:`Resources` and closes it on
+shutdown; dependencies hand out its members.
+"""
+
+from __future__ import annotations
+
+import logging
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.core.email import ConsoleEmailBackend, EmailBackend
+from app.core.events import EventBroker, InProcessBroker, PostgresBroker
+from app.core.hashing import PasswordHasher
+from app.core.s3 import S3StorageBackend
+from app.core.storage import (
+    ContentAddressedStorageBackend,
+    LocalStorageBackend,
+    StorageBackend,
+)
+from app.database import build_engine, build_session_factory
+from app.repositories.lead_batch_writer import LeadBatchWriter
+from app.services.auth_service import pwd_context
+from app.services.email_dispatcher import EmailDispatcher
+
+logger = logging.getLogger(__name__)
+
+
+def build_storage() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "s3":
+        return S3StorageBackend(
+            settings.S3_BUCKET,
+            access_key=settings.S3_ACCESS_KEY_ID,
+            secret_key=settings.S3_SECRET_ACCESS_KEY,
+            region=settings.S3_REGION,
+            endpoint_url=settings.S3_ENDPOINT_URL or None,
+            key_prefix=settings.S3_KEY_PREFIX,
+            part_size=settings.S3_PART_SIZE,
+            upload_concurrency=settings.S3_UPLOAD_CONCURRENCY,
+            max_connections=settings.S3_MAX_CONNECTIONS,
+            presign_seconds=settings.S3_PRESIGN_SECONDS,
+        )
+    if settings.STORAGE_BACKEND == "dedup":
+        return ContentAddressedStorageBackend(settings.UPLOAD_DIR)
+    return LocalStorageBackend(settings.UPLOAD_DIR)
+
+
+def build_password_hasher() -> PasswordHasher:
+    return PasswordHasher(
+        pwd_context,
+        workers=settings.PASSWORD_HASH_WORKERS,
+        max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    )
+
+
+def build_event_broker() -> EventBroker | None:
+    backend = settings.LEAD_EVENTS_BACKEND
+    url = make_url(settings.DATABASE_URL)
+    if backend == "auto":
+        backend = "postgres" if url.get_backend_name() == "postgresql" else "memory"
+    if backend == "postgres":
+        return PostgresBroker(url.set(drivername="postgresql").render_as_string(hide_password=False))
+    if backend == "memory":
+        return InProcessBroker()
+    return None
+
+
+@dataclass
+class Resources:
+    """The shared instances behind the request dependencies.
+
+    :meth:`build` only constructs the passive members (no connections are
+    opened), so an unstarted container is usable as-is, e.g. by in-process
+    test clients that never run the lifespan.  :meth:`start` warms the pool
+    and starts the background workers; :meth:`close` drains them in reverse
+    order and is safe to call after a partial start.
+    """
+
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    storage: StorageBackend
+    email: EmailBackend
+    read_engine: AsyncEngine | None = None
+    read_session_factory: async_sessionmaker[AsyncSession] | None = None
+    # Its threads only start with the first login.
+    password_hasher: PasswordHasher = field(default_factory=build_password_hasher)
+    lead_batch_writer: LeadBatchWriter | None = None
+    event_broker: EventBroker | None = None
+    email_dispatcher: EmailDispatcher | None = None
+
+    @classmethod
+    def build(cls) -> Resources:
+        engine = build_engine()
+        read_engine = (
+            build_engine(settings.READ_DATABASE_URL, label="replica") if settings.READ_DATABASE_URL else None
+        )
+        return cls(
+            engine=engine,
+            session_factory=build_session_factory(engine),
+            storage=build_storage(),
+            email=ConsoleEmailBackend(),
+            read_engine=read_engine,
+            read_session_factory=build_session_factory(read_engine) if read_engine is not None else None,
+        )
+
+    async def warm_pool(self, connections: int, engine: AsyncEngine | None = None) -> int:
+        """Open up to *connections* pooled connections and return them to the pool.
+
+        Warms the primary's pool unless another *engine* is given.  Pools
+        without a fixed size (``NullPool``, ``StaticPool``) get a single
+        connection, which still fails startup early on a bad ``DATABASE_URL``.
+        Returns the number of connections opened.
+        """
+        engine = engine or self.engine
+        size = getattr(engine.pool, "size", None)
+        count = max(1, min(connections, size() if callable(size) else 1))
+        async with AsyncExitStack() as stack:
+            for _ in range(count):
+                await stack.enter_async_context(engine.connect())
+        return count
+
+    async def start(self) -> None:
+        Path(settings.UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
+        if settings.DB_POOL_WARMUP > 0:
+            warmed = await self.warm_pool(settings.DB_POOL_WARMUP)
+            logger.info("Opened %d database connections", warmed)
+            if self.read_engine is not None:
+                warmed = await self.warm_pool(settings.DB_POOL_WARMUP, self.read_engine)
+                logger.info("Opened %d read replica connections", warmed)
+
+        if settings.LEAD_BATCH_WRITER_ENABLED:
+            self.lead_batch_writer = LeadBatchWriter(
+                self.session_factory,
+                max_batch=settings.LEAD_BATCH_MAX_SIZE,
+                max_wait=settings.LEAD_BATCH_MAX_WAIT_MS / 1000,
+            )
+
+        broker = build_event_broker()
+        if broker is not None:
+            await broker.start()
+        self.event_broker = broker
+
+        if settings.EMAIL_DISPATCHER_ENABLED:
+            self.email_dispatcher = EmailDispatcher(
+                self.session_factory,
+                self.email,
+                batch_size=settings.EMAIL_DISPATCH_BATCH_SIZE,
+                max_attempts=settings.EMAIL_DISPATCH_MAX_ATTEMPTS,
+                poll_interval=settings.EMAIL_DISPATCH_POLL_SECONDS,
+            )
+            self.email_dispatcher.start()
+
+    async def close(self) -> None:
+        # Live streams end first, then queued leads are flushed while the pool
+        # is still open; the engine goes last.
+        if self.event_broker is not None:
+            await self.event_broker.stop()
+            self.event_broker = None
+        if self.lead_batch_writer is not None:
+            await self.lead_batch_writer.close()
+            self.lead_batch_writer = None
+        if self.email_dispatcher is not None:
+            await self.email_dispatcher.stop()
+            self.email_dispatcher = None
+        self.password_hasher.shutdown()
+        if isinstance(self.storage, S3StorageBackend):
+            await self.storage.close()
+        if self.read_engine is not None:
+            await self.read_engine.dispose()
+        await self.engine.dispose()
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import csv
+import enum
+import io
 import uuid
+from collections.abc import Iterable, Sequence
 from datetime import datetime
 
-from pydantic import BaseModel, EmailStr, field_validator, model_validator
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
+from pydantic_core import to_json, to_jsonable_python
 
 from app.models.lead import LeadStatus
 
+MAX_BULK_STATUS_IDS = 1000
+RESUME_URL_PREFIX = "/uploads/"
+
 
 class LeadCreate(BaseModel):
     first_name: str
@@ -35,7 +43,7 @@ class LeadResponse(BaseModel):
                 first_name=data.first_name,
                 last_name=data.last_name,
                 email=data.email,
-                resume_url=f"/uploads/{data.resume_path}",
+                resume_url=RESUME_URL_PREFIX + data.resume_path,
                 status=data.status,
                 created_at=data.created_at,
                 updated_at=data.updated_at,
@@ -43,9 +51,100 @@ class LeadResponse(BaseModel):
         return handler(data)
 
 
+class CountMode(str, enum.Enum):
+    """How ``LeadListResponse.count`` is computed."""
+
+    EXACT = "exact"  # COUNT(*) over the table
+    CACHED = "cached"  # transactionally maintained rollup counter
+    ESTIMATE = "estimate"  # planner statistics where available, else cached
+
+
 class LeadListResponse(BaseModel):
     items: list[LeadResponse]
     count: int
+    next_cursor: str | None = None
+
+
+def lead_row_dict(row: Sequence) -> dict:
+    """Map a ``LEAD_LIST_COLUMNS`` tuple to ``LeadResponse`` fields."""
+    id_, first_name, last_name, email, resume_path, status, created_at, updated_at = row
+    return {
+        "id": id_,
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": email,
+        "resume_url": RESUME_URL_PREFIX + resume_path,
+        "status": status,
+        "created_at": created_at,
+        "updated_at": updated_at,
+    }
+
+
+def dump_lead_list(rows: Iterable[Sequence], count: int, next_cursor: str | None) -> bytes:
+    """Encode a page of ``LEAD_LIST_COLUMNS`` tuples as ``LeadListResponse`` JSON.
+
+    The bytes are identical to ``LeadListResponse(...).model_dump_json()`` but
+    no model is validated per row: the rows come straight from the database
+    with the types the response fields already declare, so the page is built
+    as plain dicts and encoded in a single pydantic-core call.
+    """
+    return to_json(
+        {"items": [lead_row_dict(row) for row in rows], "count": count, "next_cursor": next_cursor}
+    )
+
+
+class LeadChangesResponse(BaseModel):
+    items: list[LeadResponse]
+    next_since: str | None = None
+    has_more: bool = False
+
+
+def dump_lead_changes(rows: Iterable[Sequence], next_since: str | None, has_more: bool) -> bytes:
+    """Encode ``LEAD_LIST_COLUMNS`` tuples as ``LeadChangesResponse`` JSON; see :func:`dump_lead_list`."""
+    return to_json(
+        {
+            "items": [lead_row_dict(row) for row in rows],
+            "next_since": next_since,
+            "has_more": has_more,
+        }
+    )
+
+
+class LeadEvent(str, enum.Enum):
+    """Server-Sent Event names on the live lead stream."""
+
+    CREATED = "lead.created"  # data: LeadResponse
+    STATUS_CHANGED = "lead.status_changed"  # data: LeadResponse
+    IMPORTED = "leads.imported"  # data: {"created": n}; refetch to see them
+    STATUS_CHANGED_MANY = "leads.status_changed"  # data: {"updated": n, "status": ...}; refetch
+
+
+class ExportFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+def dump_lead_rows_ndjson(rows: Iterable[Sequence]) -> bytes:
+    """Encode ``LEAD_LIST_COLUMNS`` tuples as NDJSON, one ``LeadResponse`` per line."""
+    return b"".join(to_json(lead_row_dict(row)) + b"\n" for row in rows)
+
+
+def lead_csv_header() -> bytes:
+    return _csv_lines([list(LeadResponse.model_fields)])
+
+
+def dump_lead_rows_csv(rows: Iterable[Sequence]) -> bytes:
+    """Encode ``LEAD_LIST_COLUMNS`` tuples as CSV in ``LeadResponse`` column order.
+
+    Values are rendered as in the JSON API (ISO 8601 timestamps, enum values).
+    """
+    return _csv_lines(to_jsonable_python(lead_row_dict(row)).values() for row in rows)
+
+
+def _csv_lines(rows: Iterable[Iterable]) -> bytes:
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    return buf.getvalue().encode()
 
 
 class LeadStatusUpdate(BaseModel):
@@ -57,3 +156,44 @@ class LeadStatusUpdate(BaseModel):
         if v != LeadStatus.REACHED_OUT:
             raise ValueError("Status can only be updated to REACHED_OUT")
         return v
+
+
+class LeadBulkStatusUpdate(LeadStatusUpdate):
+    ids: list[uuid.UUID] = Field(min_length=1, max_length=MAX_BULK_STATUS_IDS)
+
+
+class BulkStatusOutcome(str, enum.Enum):
+    UPDATED = "updated"
+    CONFLICT = "conflict"  # lead exists but is not PENDING
+    NOT_FOUND = "not_found"
+
+
+class LeadBulkStatusItem(BaseModel):
+    id: uuid.UUID
+    outcome: BulkStatusOutcome
+
+
+class LeadBulkStatusResponse(BaseModel):
+    updated: int
+    results: list[LeadBulkStatusItem]
+
+
+class ImportOutcome(str, enum.Enum):
+    CREATED = "created"
+    REJECTED = "rejected"
+
+
+class LeadImportResult(BaseModel):
+    """One line of a bulk import's NDJSON response, for manifest row *row*."""
+
+    row: int
+    outcome: ImportOutcome
+    id: uuid.UUID | None = None
+    errors: list[str] | None = None
+
+
+class LeadImportSummary(BaseModel):
+    """The final line of a bulk import's NDJSON response."""
+
+    created: int
+    rejected: int
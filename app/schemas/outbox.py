@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class OutboxStats(BaseModel):
+    pending: int
+    dead: int
+    sent_total: int
+    failed_total: int
+    dead_total: int
+    drain_rate_per_second: float
@@ -0,0 +1,122 @@
+"""Run the API on every available CPU: ``python -m app.serve``.
+
+The parent process runs the migrations once, binds the listening socket, and
+then supervises ``WEB_WORKERS`` uvicorn worker processes that all accept from
+that one socket.  Each worker imports the app and runs its lifespan itself,
+so nothing is shared between workers: each one has its own connection pool,
+hashing pool and outbox dispatcher.  The parent:
+
+- replaces a worker that dies;
+- replaces a worker that has served its ``WEB_MAX_REQUESTS``, which bounds
+  the memory any one process can accumulate.  The budget gets a random
+  jitter, so workers don't all restart at once.  While a replacement starts
+  up, the other workers keep serving and new connections wait in the
+  socket's backlog;
+- on SIGTERM or SIGINT, stops accepting connections and lets every worker
+  finish its requests, for at most ``WEB_GRACEFUL_TIMEOUT`` seconds, and run
+  its shutdown.
+
+    python -m app.serve [--workers 4] [--port 8000] [--no-migrate]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import os
+
+import uvicorn
+from alembic import command
+from alembic.config import Config
+from uvicorn.supervisors import Multiprocess
+
+from app.config import settings
+from app.core.events import InProcessBroker
+from app.resources import build_event_broker
+
+logger = logging.getLogger("app.serve")
+
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on: its affinity mask, capped by a cgroup v2 CPU quota.
+
+    In a container ``os.cpu_count()`` reports the host's CPUs, so a
+    ``--cpus 2`` limit on a 64-core machine would otherwise start 64 workers.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not on Linux
+        cpus = os.cpu_count() or 1
+    try:
+        with open(CGROUP_CPU_MAX) as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1)
+
+
+def worker_count(requested: int = 0) -> int:
+    """*requested*, or one worker per available CPU.
+
+    The app is async, so a single worker already overlaps its I/O.  Only the
+    CPU-bound parts (bcrypt, serialization, multipart parsing) need more
+    processes, and more processes than CPUs only add context switches.
+    """
+    return requested if requested > 0 else available_cpus()
+
+
+def run_migrations(config_file: str = "alembic.ini") -> None:
+    command.upgrade(Config(config_file), "head")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS, help="0: one per available CPU")
+    parser.add_argument("--max-requests", type=int, default=settings.WEB_MAX_REQUESTS, help="0: never recycle")
+    parser.add_argument("--max-requests-jitter", type=int, default=settings.WEB_MAX_REQUESTS_JITTER)
+    parser.add_argument("--graceful-timeout", type=int, default=settings.WEB_GRACEFUL_TIMEOUT)
+    parser.add_argument("--no-migrate", action="store_true", help="skip alembic upgrade head")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if not args.no_migrate:
+        logger.info("Running database migrations")
+        run_migrations()
+
+    workers = worker_count(args.workers)
+    logger.info(
+        "Starting %d workers on %s:%d; each opens up to %d database connections",
+        workers, args.host, args.port, settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+    )
+    if workers > 1 and isinstance(build_event_broker(), InProcessBroker):
+        logger.warning(
+            "Lead events are fanned out in process: an event stream only sees leads its own "
+            "worker handled. Use LEAD_EVENTS_BACKEND=postgres to reach every worker."
+        )
+    config = uvicorn.Config(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        limit_max_requests=args.max_requests or None,
+        limit_max_requests_jitter=args.max_requests_jitter,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+    # Bound here, before any worker exists, so all of them accept from one
+    # socket and a restarting worker never leaves the port closed.
+    sock = config.bind_socket()
+    try:
+        Multiprocess(config, sockets=[sock]).run()
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,17 @@ from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException, status
 from jose import JWTError, jwt
+from passlib.context import CryptContext
 
 from app.config import settings
+from app.core.token_cache import TokenCache
 
 ALGORITHM = "HS256"
 DEFAULT_EXPIRE_MINUTES = 30
 
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+token_cache = TokenCache(maxsize=settings.TOKEN_CACHE_SIZE)
+
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.email import EmailBackend
+from app.core.timing import span
+from app.models.email_outbox import EmailOutbox, OutboxStatus
+from app.models.lead import utcnow
+from app.repositories.outbox_repository import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+# Window over which drain_rate is averaged.
+RATE_WINDOW_SECONDS = 60.0
+
+
+class EmailDispatcher:
+    """Background worker that delivers queued ``email_outbox`` rows.
+
+    Each pass leases a batch of due messages, sends them concurrently through
+    *email*, then records the outcome: delivered messages are marked SENT,
+    failures are retried with exponential backoff and jitter, and messages
+    that fail ``max_attempts`` times are moved to DEAD for manual follow-up.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        email: EmailBackend,
+        *,
+        batch_size: int = 50,
+        max_attempts: int = 5,
+        backoff_base: float = 2.0,
+        backoff_max: float = 300.0,
+        poll_interval: float = 1.0,
+        lease: float = 60.0,
+    ):
+        self.session_factory = session_factory
+        self.email = email
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self.lease = timedelta(seconds=lease)
+
+        self.sent_total = 0
+        self.failed_total = 0
+        self.dead_total = 0
+        self._sent_log: deque[tuple[float, int]] = deque()
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+    async def drain_once(self) -> int:
+        """Process one batch of due messages and return how many were attempted."""
+        async with self.session_factory() as session:
+            repo = OutboxRepository(session)
+            messages = await repo.claim_batch(self.batch_size, self.lease)
+            if not messages:
+                return 0
+
+            results = await asyncio.gather(
+                *(self._send(m) for m in messages), return_exceptions=True
+            )
+
+            sent: list[EmailOutbox] = []
+            failed = []
+            for message, result in zip(messages, results):
+                if not isinstance(result, BaseException):
+                    sent.append(message)
+                    continue
+                error = f"{type(result).__name__}: {result}"
+                if message.attempts >= self.max_attempts:
+                    logger.error(
+                        "Email %s dead-lettered after %d attempts: %s",
+                        message.id, message.attempts, error,
+                    )
+                    failed.append((message, error, None))
+                    self.dead_total += 1
+                else:
+                    logger.warning(
+                        "Email %s failed on attempt %d, will retry: %s",
+                        message.id, message.attempts, error,
+                    )
+                    failed.append((message, error, utcnow() + self._backoff(message.attempts)))
+                self.failed_total += 1
+
+            await repo.record_delivery(sent, failed)
+
+        self.sent_total += len(sent)
+        self._sent_log.append((time.monotonic(), len(sent)))
+        return len(messages)
+
+    async def _send(self, message: EmailOutbox) -> None:
+        with span("email.send"):
+            await self.email.send(to=message.recipient, subject=message.subject, body=message.body)
+
+    def _backoff(self, attempts: int) -> timedelta:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+    async def run(self) -> None:
+        """Drain continuously until :meth:`stop` is called."""
+        while not self._stopping.is_set():
+            try:
+                handled = await self.drain_once()
+            except Exception:
+                logger.exception("Email dispatcher pass failed")
+                handled = 0
+            # A full batch suggests a backlog, so go again without sleeping.
+            if handled < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self.run(), name="email-dispatcher")
+
+    async def stop(self) -> None:
+        """Let the in-flight batch finish, then stop the worker."""
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    def drain_rate(self) -> float:
+        """Messages delivered per second, averaged over the last minute."""
+        cutoff = time.monotonic() - RATE_WINDOW_SECONDS
+        while self._sent_log and self._sent_log[0][0] < cutoff:
+            self._sent_log.popleft()
+        return sum(count for _, count in self._sent_log) / RATE_WINDOW_SECONDS
+
+    async def stats(self) -> dict:
+        async with self.session_factory() as session:
+            depth = await OutboxRepository(session).count_by_status()
+        return {
+            "pending": depth[OutboxStatus.PENDING],
+            "dead": depth[OutboxStatus.DEAD],
+            "sent_total": self.sent_total,
+            "failed_total": self.failed_total,
+            "dead_total": self.dead_total,
+            "drain_rate_per_second": self.drain_rate(),
+        }
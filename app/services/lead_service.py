@@ -2,19 +2,39 @@ from __future__ import annotations
 
 import logging
 import uuid
+from collections.abc import AsyncIterator
+from datetime import timedelta
 
-from fastapi import HTTPException, UploadFile
+from fastapi import HTTPException
+from pydantic import ValidationError
+from pydantic_core import to_json
+from sqlalchemy import Row
 
 from app.config import settings
+from app.core.bulk_import import ManifestReader, ResumeArchive
 from app.core.email import (
-    EmailBackend,
+    attorney_import_summary_email,
     attorney_notification_email,
     prospect_confirmation_email,
 )
+from app.core.events import EventBroker, format_sse
+from app.core.pagination import decode_keyset, encode_keyset
 from app.core.storage import StorageBackend
-from app.models.lead import Lead, LeadStatus
-from app.repositories.lead_repository import LeadRepository
-from app.schemas.lead import LeadCreate
+from app.core.timing import span
+from app.core.uploads import SpooledUpload, UploadRejected
+from app.models.lead import Lead, LeadStatus, utcnow
+from app.repositories.lead_batch_writer import LeadBatchWriter
+from app.repositories.lead_repository import LeadFilter, LeadRepository
+from app.repositories.outbox_repository import OutboxRepository
+from app.schemas.lead import (
+    BulkStatusOutcome,
+    CountMode,
+    ImportOutcome,
+    LeadCreate,
+    LeadEvent,
+    LeadImportResult,
+    LeadResponse,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,51 +44,281 @@ class LeadService:
         self,
         repo: LeadRepository,
         storage: StorageBackend,
-        email: EmailBackend,
+        outbox: OutboxRepository,
+        batch_writer: LeadBatchWriter | None = None,
+        events: EventBroker | None = None,
     ):
         self.repo = repo
         self.storage = storage
-        self.email = email
-
-    async def submit_lead(self, data: LeadCreate, resume: UploadFile) -> Lead:
-        resume_path = await self.storage.save(resume, resume.filename or "upload.pdf")
+        self.outbox = outbox
+        self.batch_writer = batch_writer
+        self.events = events
 
-        lead = await self.repo.create(
-            lead_data=data.model_dump(),
-            resume_path=resume_path,
-        )
+    async def _publish(self, event: LeadEvent, data: bytes | str, event_id: str | None = None) -> None:
+        """Push a live event after the write it describes has committed.
 
+        Live events are best effort: a broker failure is logged and never fails
+        the request, since clients can always catch up through the change feed.
+        """
+        if self.events is None:
+            return
         try:
-            subj, body = prospect_confirmation_email(lead.first_name)
-            await self.email.send(to=lead.email, subject=subj, body=body)
+            with span("events.publish"):
+                await self.events.publish(format_sse(event.value, data, event_id))
         except Exception:
-            logger.exception("Failed to send confirmation email to %s", lead.email)
+            logger.exception("Publishing %s failed", event.value)
 
-        try:
-            subj, body = attorney_notification_email(
-                lead.first_name, lead.last_name, lead.email,
+    async def _publish_lead(self, event: LeadEvent, lead: Lead) -> None:
+        await self._publish(
+            event,
+            LeadResponse.model_validate(lead).model_dump_json(),
+            encode_keyset(lead.updated_at, lead.id),
+        )
+
+    async def submit_lead(self, data: LeadCreate, resume: SpooledUpload) -> Lead:
+        with span("storage.save"):
+            resume_path = await self.storage.save_from_path(
+                resume.path, resume.filename, digest=resume.digest
             )
-            await self.email.send(to=settings.ATTORNEY_EMAIL, subject=subj, body=body)
-        except Exception:
-            logger.exception("Failed to send attorney notification for lead %s", lead.id)
 
+        # Notifications are staged in the outbox and committed atomically with
+        # the lead; EmailDispatcher sends them after the request has returned.
+        emails = [
+            (data.email, *prospect_confirmation_email(data.first_name)),
+            (
+                settings.ATTORNEY_EMAIL,
+                *attorney_notification_email(data.first_name, data.last_name, data.email),
+            ),
+        ]
+        with span("db.create"):
+            if self.batch_writer is not None:
+                lead = await self.batch_writer.create(data.model_dump(), resume_path, emails)
+            else:
+                await self.outbox.enqueue_many(emails)
+                lead = await self.repo.create(
+                    lead_data=data.model_dump(),
+                    resume_path=resume_path,
+                )
+        await self._publish_lead(LeadEvent.CREATED, lead)
         return lead
 
+    async def import_leads(
+        self, manifest: ManifestReader, archive: ResumeArchive, batch_size: int = 1000
+    ) -> AsyncIterator[list[LeadImportResult]]:
+        """Import every manifest row, yielding each batch's per-row results in order.
+
+        Rows are validated with ``LeadCreate`` and their resumes extracted and
+        stored *batch_size* at a time. Each batch of accepted rows is inserted
+        with its prospect confirmations in one transaction. The attorney gets
+        a single summary email for the import instead of one per lead.
+        """
+        created = rejected = 0
+        start = 1
+        while batch := await manifest.next_batch(batch_size, start):
+            start += len(batch)
+            results = await self._import_batch(batch, archive)
+            accepted = sum(1 for r in results if r.outcome == ImportOutcome.CREATED)
+            created += accepted
+            rejected += len(results) - accepted
+            if accepted:
+                # One event per batch; a frame per imported lead would swamp
+                # every subscriber's queue.
+                await self._publish(LeadEvent.IMPORTED, to_json({"created": accepted}))
+            yield results
+
+        if created:
+            await self.outbox.enqueue_many(
+                [(settings.ATTORNEY_EMAIL, *attorney_import_summary_email(created, rejected))],
+                commit=True,
+            )
+
+    async def _import_batch(
+        self, batch: list[tuple[int, dict | str]], archive: ResumeArchive
+    ) -> list[LeadImportResult]:
+        results: dict[int, LeadImportResult] = {}
+        accepted: list[tuple[int, LeadCreate, str]] = []
+        for number, record in batch:
+            if isinstance(record, str):
+                results[number] = _rejected(number, [record])
+                continue
+            errors = []
+            try:
+                data = LeadCreate.model_validate(record)
+            except ValidationError as exc:
+                errors = [f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()]
+            resume = record.get("resume")
+            if not isinstance(resume, str) or not resume:
+                errors.append("resume: Field required")
+            if errors:
+                results[number] = _rejected(number, errors)
+            else:
+                accepted.append((number, data, resume))
+
+        uploads = await archive.extract_many([resume for _, _, resume in accepted])
+        rows: list[tuple[int, dict, tuple[str, str, str]]] = []
+        try:
+            for (number, data, _), upload in zip(accepted, uploads):
+                if isinstance(upload, UploadRejected):
+                    results[number] = _rejected(number, [f"resume: {upload}"])
+                    continue
+                with span("storage.save"):
+                    resume_path = await self.storage.save_from_path(
+                        upload.path, upload.filename, digest=upload.digest
+                    )
+                row = {**data.model_dump(), "id": uuid.uuid4(), "resume_path": resume_path}
+                rows.append((number, row, (data.email, *prospect_confirmation_email(data.first_name))))
+        finally:
+            for upload in uploads:
+                if isinstance(upload, SpooledUpload):
+                    upload.discard()
+
+        if rows and not await self._insert_import_rows(rows):
+            # Isolate the offending row(s): retry each lead on its own.
+            for item in rows:
+                if not await self._insert_import_rows([item]):
+                    number, row, _ = item
+                    await self.storage.delete(row["resume_path"])
+                    results[number] = _rejected(number, ["Lead could not be saved"])
+        for number, row, _ in rows:
+            results.setdefault(
+                number, LeadImportResult(row=number, outcome=ImportOutcome.CREATED, id=row["id"])
+            )
+        return [results[number] for number, _ in batch]
+
+    async def _insert_import_rows(self, rows: list[tuple[int, dict, tuple[str, str, str]]]) -> bool:
+        # Stamped here, not as each resume is stored: the change feed trusts
+        # created_at to be no older than the commit by more than its settle
+        # delay, and storing a batch's resumes can take longer than that.
+        now = utcnow()
+        for _, row, _ in rows:
+            row["created_at"] = row["updated_at"] = now
+        try:
+            with span("db.create"):
+                await self.outbox.enqueue_many([email for _, _, email in rows])
+                await self.repo.insert_many([row for _, row, _ in rows])
+        except Exception:
+            logger.exception("Bulk insert of %d leads failed", len(rows))
+            await self.repo.rollback()
+            return False
+        return True
+
     async def get_lead(self, lead_id: uuid.UUID) -> Lead:
-        lead = await self.repo.get_by_id(lead_id)
+        with span("db.get"):
+            lead = await self.repo.get_by_id(lead_id)
         if lead is None:
             raise HTTPException(status_code=404, detail="Lead not found")
         return lead
 
-    async def list_leads(self, skip: int = 0, limit: int = 50) -> tuple[list[Lead], int]:
-        return await self.repo.get_all(skip=skip, limit=limit)
+    async def list_leads(
+        self,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: str | None = None,
+        count_mode: CountMode = CountMode.CACHED,
+        where: LeadFilter = LeadFilter(),
+    ) -> tuple[list[Row], int, str | None]:
+        """Return ``(rows, total, next_cursor)`` for the leads matching *where*.
+
+        *rows* are ``LEAD_LIST_COLUMNS`` tuples rather than ``Lead`` entities;
+        see :func:`app.schemas.lead.dump_lead_list`. The rollup counters cover
+        the whole table and each status, so *total* is an exact count whenever
+        *where* filters on anything else.
+
+        *next_cursor* is ``None`` on the last page. Passing it back as *cursor*
+        continues from that point regardless of rows inserted in the meantime.
+        """
+        after = None
+        if cursor is not None:
+            try:
+                after = decode_keyset(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        with span("db.count"):
+            if count_mode == CountMode.CACHED and where == LeadFilter(status=where.status):
+                total = await self.repo.count_cached(where.status)
+            elif where or count_mode == CountMode.EXACT:
+                total = await self.repo.count(where)
+            elif count_mode == CountMode.ESTIMATE:
+                total = await self.repo.count_estimate()
+        # Fetch one extra row to learn whether another page exists.
+        with span("db.page"):
+            leads = await self.repo.get_page_rows(skip=skip, limit=limit + 1, after=after, where=where)
+        next_cursor = None
+        if len(leads) > limit:
+            leads = leads[:limit]
+            next_cursor = encode_keyset(leads[-1].created_at, leads[-1].id)
+        return leads, total, next_cursor
+
+    async def list_changes(
+        self, since: str | None = None, limit: int = 500
+    ) -> tuple[list[Row], str | None, bool]:
+        """Return ``(rows, next_since, has_more)`` for leads changed after *since*.
+
+        *since* is a watermark from an earlier call, or ``None`` to start from
+        the beginning. Changes younger than ``LEAD_CHANGES_SETTLE_SECONDS`` are
+        held back: a transaction that stamped ``updated_at`` but has not yet
+        committed could otherwise land behind a watermark a client already
+        holds. When nothing has changed, *since* is handed back unchanged.
+        """
+        after = None
+        if since is not None:
+            try:
+                after = decode_keyset(since)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid watermark")
+
+        until = utcnow() - timedelta(seconds=settings.LEAD_CHANGES_SETTLE_SECONDS)
+        with span("db.page"):
+            rows = await self.repo.get_changes(after, limit + 1, until)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if rows:
+            since = encode_keyset(rows[-1].updated_at, rows[-1].id)
+        return rows, since, has_more
+
+    def export_leads(self, where: LeadFilter = LeadFilter()) -> AsyncIterator[list[Row]]:
+        """Stream every matching lead, oldest first, in batches of ``LEAD_LIST_COLUMNS`` tuples."""
+        return self.repo.stream_rows(where, batch_size=settings.LEAD_EXPORT_BATCH_SIZE)
 
     async def mark_reached_out(self, lead_id: uuid.UUID) -> Lead:
-        lead = await self.repo.get_by_id(lead_id)
-        if lead is None:
-            raise HTTPException(status_code=404, detail="Lead not found")
-        if lead.status == LeadStatus.REACHED_OUT:
+        with span("db.update"):
+            lead = await self.repo.transition_status(lead_id, LeadStatus.PENDING, LeadStatus.REACHED_OUT)
+        if lead is not None:
+            await self._publish_lead(LeadEvent.STATUS_CHANGED, lead)
+            return lead
+        # Only the failure path pays for a second query to tell 404 from 409.
+        if await self.repo.exists(lead_id):
             raise HTTPException(status_code=409, detail="Lead already marked as REACHED_OUT")
+        raise HTTPException(status_code=404, detail="Lead not found")
 
-        lead = await self.repo.update_status(lead_id, LeadStatus.REACHED_OUT)
-        return lead
+    async def mark_many_reached_out(
+        self, lead_ids: list[uuid.UUID]
+    ) -> list[tuple[uuid.UUID, BulkStatusOutcome]]:
+        """Transition every PENDING lead in *lead_ids*; report an outcome per id."""
+        unique_ids = list(dict.fromkeys(lead_ids))
+        with span("db.update"):
+            rows, skipped = await self.repo.transition_status_many(
+                unique_ids, LeadStatus.PENDING, LeadStatus.REACHED_OUT
+            )
+        # One event for the whole call, like an import: a notify per row would
+        # serialize up to MAX_BULK_STATUS_IDS broker round trips in the request.
+        if rows:
+            await self._publish(
+                LeadEvent.STATUS_CHANGED_MANY,
+                to_json({"updated": len(rows), "status": LeadStatus.REACHED_OUT.value}),
+            )
+        updated = {row.id for row in rows}
+        outcomes = []
+        for lead_id in unique_ids:
+            if lead_id in updated:
+                outcomes.append((lead_id, BulkStatusOutcome.UPDATED))
+            elif lead_id in skipped:
+                outcomes.append((lead_id, BulkStatusOutcome.CONFLICT))
+            else:
+                outcomes.append((lead_id, BulkStatusOutcome.NOT_FOUND))
+        return outcomes
+
+
+def _rejected(row: int, errors: list[str]) -> LeadImportResult:
+    return LeadImportResult(row=row, outcome=ImportOutcome.REJECTED, errors=errors)
@@ -0,0 +1,84 @@
+"""Bulk import throughput and memory: one manifest plus a zip of resumes.
+
+Builds an NDJSON (or ``--csv``) manifest of ``--rows`` leads and a zip with one
+small resume per lead, posts both to ``POST /api/v1/leads/import`` in-process,
+and reports rows/s and the growth in peak RSS over the import.  Peak RSS should
+stay roughly constant as ``--rows`` grows:
+
+    PYTHONPATH=. python -m benchmarks.bench_bulk_import --rows 100000
+
+Defaults to a throwaway SQLite file; pass ``--database-url`` to run against
+Postgres (where rows are loaded with COPY).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import resource
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+from app.config import settings
+from benchmarks.common import CREDENTIALS, RESUME, bench_client
+
+
+def build_inputs(directory: Path, rows: int, as_csv: bool) -> tuple[Path, Path]:
+    manifest = directory / ("leads.csv" if as_csv else "leads.ndjson")
+    archive = directory / "resumes.zip"
+    with open(manifest, "w", newline="") as f, zipfile.ZipFile(archive, "w") as zf:
+        writer = csv.writer(f) if as_csv else None
+        if writer:
+            writer.writerow(["first_name", "last_name", "email", "resume"])
+        for i in range(rows):
+            row = ["Bench", f"Lead{i}", f"lead{i}@example.com", f"cv/{i}.pdf"]
+            if writer:
+                writer.writerow(row)
+            else:
+                f.write(json.dumps(dict(zip(("first_name", "last_name", "email", "resume"), row))) + "\n")
+            zf.writestr(f"cv/{i}.pdf", RESUME[1])
+    return manifest, archive
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./bench_bulk_import.db")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=settings.LEAD_IMPORT_BATCH_SIZE)
+    parser.add_argument("--csv", action="store_true", help="send a CSV manifest instead of NDJSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.UPLOAD_DIR = str(Path(tmp) / "uploads")
+        settings.LEAD_IMPORT_BATCH_SIZE = args.batch_size
+        manifest, archive = build_inputs(Path(tmp), args.rows, args.csv)
+
+        async with bench_client(args.database_url) as client:
+            token = (await client.post("/api/v1/auth/login", data=CREDENTIALS)).json()["access_token"]
+            baseline = peak_rss_mb()
+            started = time.perf_counter()
+            with open(manifest, "rb") as m, open(archive, "rb") as a:
+                resp = await client.post(
+                    "/api/v1/leads/import",
+                    files={"manifest": (manifest.name, m), "resumes": (archive.name, a)},
+                    headers={"Authorization": f"Bearer {token}"},
+                    timeout=None,
+                )
+            elapsed = time.perf_counter() - started
+            summary = json.loads(resp.text.rstrip().rsplit("\n", 1)[-1])
+
+    print(f"rows={args.rows:,} batch={args.batch_size} status={resp.status_code} {summary}")
+    print(f"{args.rows / elapsed:,.0f} rows/s over {elapsed:.1f}s")
+    print(f"peak RSS {peak_rss_mb():.0f} MB (+{peak_rss_mb() - baseline:.0f} MB during import)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""Concurrent resume downloads: full bodies, byte ranges and 304 revalidations.
+
+Submits one lead with a ``--size-mb`` resume, then issues ``--requests``
+authenticated downloads ``--concurrency`` at a time in each mode and reports
+latency and throughput.  Runs in-process by default; pass ``--base-url`` to
+load-test a live server (``uvicorn app.main:app``).
+
+    PYTHONPATH=. python -m benchmarks.bench_downloads --concurrency 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from httpx import AsyncClient
+
+from benchmarks.bench_uploads import make_client
+from benchmarks.common import CREDENTIALS, summarize
+
+
+async def run_mode(
+    client: AsyncClient, url: str, headers: dict, args, expect: int
+) -> tuple[list[float], int, float]:
+    gate = asyncio.Semaphore(args.concurrency)
+    samples: list[float] = []
+    received = 0
+
+    async def fetch() -> None:
+        nonlocal received
+        async with gate:
+            started = time.perf_counter()
+            resp = await client.get(url, headers=headers)
+            samples.append(time.perf_counter() - started)
+            assert resp.status_code == expect, resp.status_code
+            received += len(resp.content)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(fetch() for _ in range(args.requests)))
+    return samples, received, time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./bench_downloads.db")
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--size-mb", type=float, default=4.9)
+    args = parser.parse_args()
+
+    resume = b"%PDF-1.4\n" + b"0" * int(args.size_mb * 1024 * 1024 - 9)
+    async with make_client(args) as client:
+        token = (await client.post("/api/v1/auth/login", data=CREDENTIALS)).json()["access_token"]
+        auth = {"Authorization": f"Bearer {token}"}
+        lead = await client.post(
+            "/api/v1/leads",
+            data={"first_name": "Bench", "last_name": "Download", "email": "dl@example.com"},
+            files={"resume": ("resume.pdf", resume, "application/pdf")},
+        )
+        url = lead.json()["resume_url"]
+        etag = (await client.get(url, headers=auth)).headers["etag"]
+
+        modes = [
+            ("full", auth, 200),
+            ("range 64KiB", {**auth, "Range": "bytes=0-65535"}, 206),
+            ("304", {**auth, "If-None-Match": etag}, 304),
+        ]
+        for name, headers, expect in modes:
+            samples, received, elapsed = await run_mode(client, url, headers, args, expect)
+            print(
+                f"{name:<12} {summarize(samples)}  "
+                f"{args.requests / elapsed:8.1f} req/s {received / elapsed / 1024 / 1024:8.1f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
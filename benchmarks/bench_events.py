@@ -0,0 +1,65 @@
+"""Live-event fan-out cost with many idle subscribers.
+
+Registers ``--subscribers`` consumers on an ``InProcessBroker`` (each one
+waiting on its subscription, like an open SSE response), publishes
+``--events`` lead-sized frames, and reports the time spent inside
+``publish`` and until every subscriber has received every frame.
+
+    PYTHONPATH=. python -m benchmarks.bench_events --subscribers 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from app.core.events import InProcessBroker, format_sse
+from benchmarks.common import summarize
+
+FRAME = format_sse("lead.created", "x" * 300, "watermark")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--events", type=int, default=100)
+    args = parser.parse_args()
+
+    broker = InProcessBroker()
+    received = 0
+    done = asyncio.Event()
+
+    async def consume(subscription) -> None:
+        nonlocal received
+        while await subscription.get() is not None:
+            received += 1
+            if received == args.subscribers * args.events:
+                done.set()
+
+    consumers = [
+        asyncio.create_task(consume(broker.subscribe(max_pending=args.events)))
+        for _ in range(args.subscribers)
+    ]
+    await asyncio.sleep(0)
+
+    publish: list[float] = []
+    started = time.perf_counter()
+    for _ in range(args.events):
+        t0 = time.perf_counter()
+        await broker.publish(FRAME)
+        publish.append(time.perf_counter() - t0)
+        await asyncio.sleep(0)
+    await done.wait()
+    elapsed = time.perf_counter() - started
+
+    await broker.stop()
+    await asyncio.gather(*consumers)
+    deliveries = args.subscribers * args.events
+    print(f"subscribers={args.subscribers:,} events={args.events} dropped={broker.dropped_total}")
+    print(f"publish  {summarize(publish)}")
+    print(f"delivered {deliveries:,} frames in {elapsed:.2f}s ({deliveries / elapsed:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
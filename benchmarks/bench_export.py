@@ -0,0 +1,64 @@
+"""Export throughput and memory for ``GET /api/v1/leads/export``.
+
+Seeds ``--rows`` leads, streams the full export in-process without holding the
+body, and reports rows/s, bytes sent and the growth in peak RSS.  Peak RSS
+should not grow with ``--rows``:
+
+    PYTHONPATH=. python -m benchmarks.bench_export --rows 1000000 --format ndjson --gzip
+
+Defaults to a throwaway SQLite file; pass ``--database-url`` to run against
+Postgres (the target database should be empty or disposable).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import resource
+import time
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmarks.bench_pagination import seed
+from benchmarks.common import CREDENTIALS, bench_client
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./bench_export.db")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    parser.add_argument("--gzip", action="store_true")
+    args = parser.parse_args()
+
+    async with bench_client(args.database_url) as client:
+        engine = create_async_engine(args.database_url)
+        await seed(engine, args.rows)
+        await engine.dispose()
+
+        token = (await client.post("/api/v1/auth/login", data=CREDENTIALS)).json()["access_token"]
+        baseline = peak_rss_mb()
+        sent = 0
+        started = time.perf_counter()
+        async with client.stream(
+            "GET",
+            "/api/v1/leads/export",
+            params={"format": args.format, "gzip": args.gzip},
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=None,
+        ) as resp:
+            async for chunk in resp.aiter_raw():
+                sent += len(chunk)
+        elapsed = time.perf_counter() - started
+
+    print(f"rows={args.rows:,} format={args.format} gzip={args.gzip} status={resp.status_code}")
+    print(f"{args.rows / elapsed:,.0f} rows/s, {sent / 2**20:.1f} MiB in {elapsed:.1f}s")
+    print(f"peak RSS {peak_rss_mb():.0f} MB (+{peak_rss_mb() - baseline:.0f} MB during export)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
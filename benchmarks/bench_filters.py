@@ -0,0 +1,114 @@
+"""Filtered lead-list latency on a large table.
+
+Seeds the leads table with synthetic rows spread across statuses and a
+small pool of names, then times one filtered page (and the exact filtered
+count the list endpoint returns alongside it) for each filter the list
+endpoint supports.  With the filter indexes in place every page should
+stay in the low milliseconds regardless of table size.
+
+    PYTHONPATH=. python -m benchmarks.bench_filters --rows 1000000
+
+Defaults to a throwaway SQLite file; pass ``--database-url`` to run against
+Postgres (the target database should be empty or disposable).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database import Base
+from app.models.lead import Lead, LeadStatus
+from app.repositories.lead_repository import LeadFilter, LeadRepository
+
+SEED_CHUNK = 10_000
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+FIRST_NAMES = ["Ada", "Alan", "Grace", "Edsger", "Barbara", "Donald", "Frances", "Ken"]
+LAST_NAMES = ["Lovelace", "Turing", "Hopper", "Dijkstra", "Liskov", "Knuth", "Allen", "Thompson"]
+
+
+def _status(i: int) -> str:
+    # One lead in twenty has been reached out to, as in a working pipeline.
+    return (LeadStatus.REACHED_OUT if i % 20 == 0 else LeadStatus.PENDING).value
+
+
+async def seed(engine, rows: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        existing = (await conn.execute(select(func.count()).select_from(Lead))).scalar_one()
+        for offset in range(existing, rows, SEED_CHUNK):
+            batch = [
+                {
+                    "id": uuid.uuid4(),
+                    "first_name": FIRST_NAMES[i % len(FIRST_NAMES)],
+                    "last_name": f"{LAST_NAMES[i // 7 % len(LAST_NAMES)]}{i}",
+                    "email": f"lead{i}@example.com",
+                    "resume_path": f"{i}.pdf",
+                    "status": _status(i),
+                    "created_at": START + timedelta(seconds=i),
+                    "updated_at": START + timedelta(seconds=i),
+                }
+                for i in range(offset, min(offset + SEED_CHUNK, rows))
+            ]
+            await conn.execute(insert(Lead), batch)
+
+
+async def time_filter(
+    session: AsyncSession, where: LeadFilter, limit: int, repeats: int
+) -> tuple[float, float, int]:
+    """Median (page ms, count ms) and the match count for *where*."""
+    repo = LeadRepository(session)
+    pages, counts = [], []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await repo.get_page_rows(limit=limit, where=where)
+        pages.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        matched = await repo.count(where)
+        counts.append(time.perf_counter() - started)
+    return statistics.median(pages) * 1000, statistics.median(counts) * 1000, matched
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./bench_filters.db")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.database_url)
+    await seed(engine, args.rows)
+
+    middle = START + timedelta(seconds=args.rows // 2)
+    cases = {
+        "none": LeadFilter(),
+        "status=REACHED_OUT": LeadFilter(status=LeadStatus.REACHED_OUT),
+        "created, 1h window": LeadFilter(
+            created_after=middle, created_before=middle + timedelta(hours=1)
+        ),
+        "status + created": LeadFilter(status=LeadStatus.REACHED_OUT, created_after=middle),
+        "email": LeadFilter(email=f"LEAD{args.rows // 3}@example.com"),
+        "name=grace": LeadFilter(name="grace"),
+        "name=knuth12": LeadFilter(name="knuth12"),
+    }
+
+    print(f"{'filter':>20} {'matches':>10} {'page ms':>9} {'count ms':>9}")
+    async with AsyncSession(engine) as session:
+        for label, where in cases.items():
+            page_ms, count_ms, matched = await time_filter(
+                session, where, args.limit, args.repeats
+            )
+            print(f"{label:>20} {matched:>10,} {page_ms:>9.2f} {count_ms:>9.2f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
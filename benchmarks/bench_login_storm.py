@@ -0,0 +1,90 @@
+"""Latency of /health and lead submission while a login storm runs.
+
+Runs ``--logins`` concurrent login loops against the in-process app and, at the
+same time, measures ``GET /health`` and ``POST /api/v1/leads`` latency.  With
+bcrypt on the hashing pool the probes stay fast; ``--inline`` restores the
+old behaviour of verifying on the event loop for comparison.
+
+    PYTHONPATH=. python -m benchmarks.bench_login_storm --seconds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+from httpx import AsyncClient
+
+from app.api.dependencies import get_password_hasher
+from app.core.hashing import PasswordHasher
+from app.main import app
+from app.services.auth_service import pwd_context
+from benchmarks.common import CREDENTIALS, RESUME, bench_client, summarize
+
+
+class InlineHasher(PasswordHasher):
+    """Verifies on the event loop, as logins did before the hashing pool."""
+
+    async def verify(self, plain: str, hashed: str) -> bool:
+        return self.context.verify(plain, hashed)
+
+
+async def login_loop(client: AsyncClient, deadline: float, statuses: Counter) -> None:
+    while time.perf_counter() < deadline:
+        resp = await client.post("/api/v1/auth/login", data=CREDENTIALS)
+        statuses[resp.status_code] += 1
+        if resp.status_code == 429:
+            await asyncio.sleep(0.05)
+
+
+async def probe_loop(client: AsyncClient, deadline: float, kind: str, samples: list[float]) -> None:
+    i = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        if kind == "health":
+            resp = await client.get("/health")
+        else:
+            resp = await client.post(
+                "/api/v1/leads",
+                data={"first_name": "Bench", "last_name": f"Probe{i}", "email": f"probe{i}@example.com"},
+                files={"resume": RESUME},
+            )
+        assert resp.status_code < 300, resp.text
+        samples.append(time.perf_counter() - started)
+        i += 1
+        await asyncio.sleep(0.01)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./bench_login_storm.db")
+    parser.add_argument("--logins", type=int, default=32, help="concurrent login loops")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--inline", action="store_true", help="verify bcrypt on the event loop")
+    args = parser.parse_args()
+
+    if args.inline:
+        inline = InlineHasher(pwd_context, workers=1, max_pending=0)
+        app.dependency_overrides[get_password_hasher] = lambda: inline
+
+    async with bench_client(args.database_url) as client:
+        deadline = time.perf_counter() + args.seconds
+        statuses: Counter = Counter()
+        health: list[float] = []
+        submit: list[float] = []
+        await asyncio.gather(
+            *(login_loop(client, deadline, statuses) for _ in range(args.logins)),
+            probe_loop(client, deadline, "health", health),
+            probe_loop(client, deadline, "submit", submit),
+        )
+
+    print(f"mode: {'inline' if args.inline else 'hashing pool'}, login storm: {args.logins} loops")
+    print(f"logins by status: {dict(statuses)}")
+    print(f"GET /health        {summarize(health)}")
+    print(f"POST /api/v1/leads {summarize(submit)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""Offset vs. keyset pagination latency at increasing page depths.
+
+Seeds the leads table with synthetic rows, then times fetching one page at
+several depths using OFFSET and using a ``(created_at, id)`` cursor.  Offset
+latency grows with depth; cursor latency should stay flat.
+
+    PYTHONPATH=. python -m benchmarks.bench_pagination --rows 1000000
+
+Defaults to a throwaway SQLite file; pass ``--database-url`` to run against
+Postgres (the target database should be empty or disposable).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database import Base
+from app.models.lead import Lead
+from app.repositories.lead_repository import LeadRepository
+
+SEED_CHUNK = 10_000
+
+
+async def seed(engine, rows: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        existing = (await conn.execute(select(func.count()).select_from(Lead))).scalar_one()
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for offset in range(existing, rows, SEED_CHUNK):
+            batch = [
+                {
+                    "id": uuid.uuid4(),
+                    "first_name": "Bench",
+                    "last_name": f"Lead{i}",
+                    "email": f"lead{i}@example.com",
+                    "resume_path": f"{i}.pdf",
+                    "status": "PENDING",
+                    "created_at": start + timedelta(seconds=i),
+                    "updated_at": start + timedelta(seconds=i),
+                }
+                for i in range(offset, min(offset + SEED_CHUNK, rows))
+            ]
+            await conn.execute(insert(Lead), batch)
+
+
+async def time_page(session: AsyncSession, repeats: int, **kwargs) -> float:
+    repo = LeadRepository(session)
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await repo.get_all(**kwargs)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./bench_pagination.db")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.database_url)
+    await seed(engine, args.rows)
+
+    print(f"{'depth (rows)':>14} {'offset ms':>10} {'cursor ms':>10}")
+    async with AsyncSession(engine) as session:
+        depth = args.limit
+        while depth < args.rows:
+            anchor = (
+                await session.execute(
+                    select(Lead.created_at, Lead.id)
+                    .order_by(Lead.created_at.desc(), Lead.id.desc())
+                    .offset(depth - 1)
+                    .limit(1)
+                )
+            ).one()
+            offset_ms = await time_page(session, args.repeats, skip=depth, limit=args.limit)
+            cursor_ms = await time_page(
+                session, args.repeats, limit=args.limit, after=(anchor.created_at, anchor.id)
+            )
+            print(f"{depth:>14,} {offset_ms:>10.2f} {cursor_ms:>10.2f}")
+            depth *= 10
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
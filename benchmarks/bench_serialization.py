@@ -0,0 +1,76 @@
+"""Entity + response_model vs. projection + direct JSON for one list page.
+
+Times fetching and encoding a single page of leads both ways: loading ``Lead``
+entities and validating a ``LeadResponse`` per row (what the list endpoint did
+through ``response_model``), and selecting ``LEAD_LIST_COLUMNS`` tuples and
+encoding them with ``dump_lead_list``.  Reports the query and encode stages
+separately so the two can be told apart.
+
+    PYTHONPATH=. python -m benchmarks.bench_serialization --limit 500
+
+Defaults to a throwaway SQLite file; pass ``--database-url`` to run against
+Postgres (the target database should be empty or disposable).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.repositories.lead_repository import LeadRepository
+from app.schemas.lead import LeadListResponse, LeadResponse, dump_lead_list
+from benchmarks.bench_pagination import seed
+
+
+def _model_dump(leads) -> bytes:
+    return LeadListResponse(
+        items=[LeadResponse.model_validate(lead) for lead in leads], count=len(leads)
+    ).model_dump_json().encode()
+
+
+def _fast_dump(rows) -> bytes:
+    return dump_lead_list(rows, len(rows), None)
+
+
+async def time_path(session: AsyncSession, repeats: int, fetch, encode) -> tuple[float, float]:
+    query, serialize = [], []
+    for _ in range(repeats):
+        session.expunge_all()
+        started = time.perf_counter()
+        rows = await fetch()
+        fetched = time.perf_counter()
+        encode(rows)
+        query.append(fetched - started)
+        serialize.append(time.perf_counter() - fetched)
+    return statistics.median(query) * 1000, statistics.median(serialize) * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./bench_serialization.db")
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.database_url)
+    await seed(engine, args.limit)
+
+    async with AsyncSession(engine) as session:
+        repo = LeadRepository(session)
+        paths = {
+            "entities + models": (lambda: repo.get_all(limit=args.limit), _model_dump),
+            "projection + to_json": (lambda: repo.get_page_rows(limit=args.limit), _fast_dump),
+        }
+        print(f"{'path':<22} {'query ms':>9} {'encode ms':>10} {'total ms':>9}")
+        for name, (fetch, encode) in paths.items():
+            query_ms, encode_ms = await time_path(session, args.repeats, fetch, encode)
+            print(f"{name:<22} {query_ms:>9.2f} {encode_ms:>10.2f} {query_ms + encode_ms:>9.2f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""Parallel resume uploads: local disk vs. S3-compatible storage.
+
+Spools ``--files`` resumes of ``--size-mb`` each and hands them to each
+backend's ``save_from_path``, ``--concurrency`` at a time, reporting latency
+and MB/s.  Files larger than ``--part-size-mb`` go to S3 as multipart
+uploads with ``--part-concurrency`` parts in flight.  S3 defaults to the
+in-process stand-in used by the tests (so it measures the client side:
+signing, part scheduling, the connection pool); pass ``--endpoint-url`` and
+credentials to measure a real service such as MinIO:
+
+    PYTHONPATH=. python -m benchmarks.bench_storage --size-mb 32 \\
+        --endpoint-url http://localhost:9000 --bucket resumes \\
+        --access-key minioadmin --secret-key minioadmin
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+from app.core.s3 import S3StorageBackend
+from app.core.storage import LocalStorageBackend, StorageBackend
+from benchmarks.common import summarize
+from tests.fake_s3 import ACCESS_KEY, REGION, SECRET_KEY, FakeS3
+
+MB = 1024 * 1024
+
+
+async def run(storage: StorageBackend, spool: Path, payload: bytes, args) -> tuple[list[float], float]:
+    paths = []
+    for _ in range(args.files):
+        path = spool / f".{uuid.uuid4().hex}.part"
+        path.write_bytes(payload)
+        paths.append(path)
+
+    gate = asyncio.Semaphore(args.concurrency)
+    samples: list[float] = []
+
+    async def upload(path: Path) -> None:
+        async with gate:
+            started = time.perf_counter()
+            await storage.save_from_path(path, "resume.pdf")
+            samples.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(upload(path) for path in paths))
+    return samples, time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=64)
+    parser.add_argument("--size-mb", type=float, default=4.9)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--part-size-mb", type=float, default=8)
+    parser.add_argument("--part-concurrency", type=int, default=4)
+    parser.add_argument("--endpoint-url", default=None)
+    parser.add_argument("--bucket", default="resumes")
+    parser.add_argument("--region", default=REGION)
+    parser.add_argument("--access-key", default=ACCESS_KEY)
+    parser.add_argument("--secret-key", default=SECRET_KEY)
+    args = parser.parse_args()
+
+    payload = b"%PDF-1.4\n" + b"0" * (int(args.size_mb * MB) - 9)
+    part_size = int(args.part_size_mb * MB)
+    fake = None if args.endpoint_url else FakeS3()
+    s3 = S3StorageBackend(
+        args.bucket,
+        access_key=args.access_key,
+        secret_key=args.secret_key,
+        region=args.region,
+        endpoint_url=args.endpoint_url or "http://s3.bench",
+        key_prefix="bench/",
+        part_size=part_size,
+        upload_concurrency=args.part_concurrency,
+        transport=httpx.ASGITransport(app=fake) if fake else None,
+    )
+
+    mode = "multipart" if len(payload) >= part_size else "single PUT"
+    print(f"{args.files} uploads of {args.size_mb} MB, concurrency {args.concurrency}, S3 {mode}")
+    with tempfile.TemporaryDirectory() as tmp:
+        spool = Path(tmp) / ".incoming"
+        spool.mkdir()
+        backends = {
+            "local": LocalStorageBackend(str(Path(tmp) / "uploads")),
+            "s3 (stand-in)" if fake else "s3": s3,
+        }
+        for label, storage in backends.items():
+            samples, elapsed = await run(storage, spool, payload, args)
+            total_mb = args.files * len(payload) / MB
+            print(f"{label:>14}  {summarize(samples)}  {total_mb / elapsed:8.1f} MB/s")
+    await s3.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
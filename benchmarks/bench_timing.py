@@ -0,0 +1,81 @@
+"""Overhead of TimingMiddleware and span() per request.
+
+Calls a minimal ASGI app directly (no HTTP client, no server) ``--requests``
+times, bare and wrapped in ``TimingMiddleware``, with ``--spans`` spans per
+request, and reports the added cost per request and per span.  The best of
+``--repeats`` runs is used for each so scheduler noise does not count as
+overhead.
+
+    PYTHONPATH=. python -m benchmarks.bench_timing --requests 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from app.core.timing import TimingMiddleware, span
+
+START = {"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]}
+BODY = {"type": "http.response.body", "body": b"ok"}
+
+
+class _Route:
+    path = "/items/{item_id}"
+
+
+def make_app(spans: int):
+    stages = [f"stage{i}" for i in range(spans)]
+
+    async def app(scope, receive, send):
+        scope["route"] = _Route
+        for stage in stages:
+            with span(stage):
+                pass
+        await send(dict(START))
+        await send(BODY)
+
+    return app
+
+
+async def run(app, requests: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for i in range(requests):
+        scope = {"type": "http", "method": "GET", "path": f"/items/{i % 100}"}
+        await app(scope, receive, send)
+    return time.perf_counter() - started
+
+
+async def best(app, requests: int, repeats: int) -> float:
+    return min([await run(app, requests) for _ in range(repeats)])
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--spans", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    bare = make_app(0)
+    plain = await best(bare, args.requests, args.repeats)
+    wrapped = await best(TimingMiddleware(bare), args.requests, args.repeats)
+    no_header = await best(TimingMiddleware(bare, server_timing=False), args.requests, args.repeats)
+    spanned = await best(TimingMiddleware(make_app(args.spans)), args.requests, args.repeats)
+
+    per = 1e6 / args.requests
+    print(f"bare app                    {plain * per:6.2f} us/request")
+    print(f"+ middleware                {(wrapped - plain) * per:6.2f} us/request")
+    print(f"+ middleware, no header     {(no_header - plain) * per:6.2f} us/request")
+    print(f"+ {args.spans} spans                   {(spanned - wrapped) * per / max(args.spans, 1):6.2f} us/span")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
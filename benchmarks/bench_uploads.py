@@ -0,0 +1,69 @@
+"""Throughput of concurrent 5 MB resume submissions.
+
+Posts ``--requests`` lead submissions, ``--concurrency`` at a time, each with a
+``--size-mb`` PDF, and reports request latency and aggregate MB/s.  Runs
+against the in-process app by default; pass ``--base-url`` to drive a live
+server instead (for example ``uvicorn app.main:app``).
+
+    PYTHONPATH=. python -m benchmarks.bench_uploads --concurrency 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from httpx import AsyncClient
+
+from benchmarks.common import bench_client, summarize
+
+
+@asynccontextmanager
+async def make_client(args):
+    if args.base_url:
+        async with AsyncClient(base_url=args.base_url, timeout=60) as client:
+            yield client
+    else:
+        async with bench_client(args.database_url) as client:
+            yield client
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./bench_uploads.db")
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--size-mb", type=float, default=4.9)
+    args = parser.parse_args()
+
+    resume = b"%PDF-1.4\n" + b"0" * int(args.size_mb * 1024 * 1024 - 9)
+    gate = asyncio.Semaphore(args.concurrency)
+    samples: list[float] = []
+
+    async with make_client(args) as client:
+        async def submit(i: int) -> None:
+            async with gate:
+                started = time.perf_counter()
+                resp = await client.post(
+                    "/api/v1/leads",
+                    data={"first_name": "Bench", "last_name": f"Upload{i}", "email": f"up{i}@example.com"},
+                    files={"resume": ("resume.pdf", resume, "application/pdf")},
+                )
+                samples.append(time.perf_counter() - started)
+                assert resp.status_code == 201, resp.text
+
+        started = time.perf_counter()
+        await asyncio.gather(*(submit(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    total_mb = args.requests * len(resume) / (1024 * 1024)
+    print(f"{args.requests} uploads of {args.size_mb} MB, concurrency {args.concurrency}")
+    print(f"latency     {summarize(samples)}")
+    print(f"throughput  {args.requests / elapsed:.1f} req/s, {total_mb / elapsed:.1f} MB/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
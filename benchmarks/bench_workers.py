@@ -0,0 +1,128 @@
+"""Throughput of ``python -m app.serve`` as the worker count grows.
+
+For each count in ``--workers``, seeds a fresh SQLite schema (or
+``--database-url``) with ``--seed`` leads, starts the runner on it, waits for
+``/health``, and runs a ``bench_load`` workload against it over HTTP for
+``--seconds``.  It reports req/s and
+latency per worker count, plus each count's speedup over the first.
+
+The load generator is a single process on the same machine, so it competes
+with the workers for CPU.  Scaling flattens once the workers plus the
+generator outnumber the CPUs (``available_cpus()`` is printed first).  The
+default ``reads`` mix is CPU-bound in serialization; ``login-storm`` is
+CPU-bound in bcrypt.  Mixes that submit leads need Postgres, whose
+``gen_random_uuid()`` the outbox table uses, so pass a Postgres
+``--database-url`` for those.
+
+    PYTHONPATH=. python -m benchmarks.bench_workers --workers 1 2 4 --seconds 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from httpx import AsyncClient
+from sqlalchemy import insert
+
+from app.models.lead import Lead
+from app.serve import available_cpus
+from benchmarks.bench_load import WORKLOADS, Workload, drive, latency, login
+from benchmarks.common import fresh_engine
+
+
+async def wait_until_healthy(client: AsyncClient, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except Exception:
+            if time.perf_counter() > deadline:
+                raise
+        await asyncio.sleep(0.2)
+
+
+async def seed(database_url: str, rows: int) -> list[str]:
+    """A fresh schema with *rows* leads, inserted directly so any mix can read them."""
+    engine = await fresh_engine(database_url)
+    now = datetime.now(timezone.utc)
+    leads = [
+        {
+            "id": uuid.uuid4(),
+            "first_name": "Bench",
+            "last_name": f"Lead{i}",
+            "email": f"lead{i}@example.com",
+            "resume_path": f"{i}.pdf",
+            "status": "PENDING",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(rows)
+    ]
+    async with engine.begin() as conn:
+        if leads:
+            await conn.execute(insert(Lead), leads)
+    await engine.dispose()
+    return [str(lead["id"]) for lead in leads]
+
+
+async def measure(workers: int, args) -> dict:
+    lead_ids = await seed(args.database_url, args.seed)
+
+    env = {**os.environ, "DATABASE_URL": args.database_url, "WEB_MAX_REQUESTS": "0"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--workers", str(workers), "--port", str(args.port), "--no-migrate"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        async with AsyncClient(base_url=f"http://127.0.0.1:{args.port}", timeout=60) as client:
+            await wait_until_healthy(client)
+            workload = Workload(client, await login(client))
+            workload.lead_ids.extend(lead_ids)
+            workload.pending.extend(lead_ids)
+            weights = WORKLOADS[args.workload]
+            await drive(workload, weights, args.concurrency, args.warmup)
+            results, elapsed = await drive(workload, weights, args.concurrency, args.seconds)
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+    everything = [s for samples in results.samples.values() for s in samples]
+    return latency(everything, elapsed, sum(results.failures.values()))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./bench_workers.db")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="reads")
+    parser.add_argument("--concurrency", type=int, default=32, help="simulated users")
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=1000, help="leads inserted before each run")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{args.workload} workload, {args.concurrency} users, {available_cpus()} CPUs available")
+    print(f"{'workers':>7} {'req/s':>9} {'speedup':>8} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    first = None
+    for workers in args.workers:
+        row = await measure(workers, args)
+        first = first or row["rps"]
+        print(
+            f"{workers:7d} {row['rps']:9.1f} {row['rps'] / first:7.2f}x "
+            f"{row['p50_ms']:9.2f} {row['p99_ms']:9.2f} {row['errors']:7d}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""Helpers shared by the benchmark scripts."""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.dependencies import get_db
+from app.database import Base
+from app.main import app
+
+RESUME = ("resume.pdf", b"%PDF-1.4 benchmark resume\n" + b"0" * 4096, "application/pdf")
+CREDENTIALS = {"username": "attorney@alma.com", "password": "password123"}
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(samples: list[float]) -> str:
+    ms = [s * 1000 for s in samples]
+    return (
+        f"n={len(ms):<6} p50={percentile(ms, 50):7.2f}ms "
+        f"p99={percentile(ms, 99):7.2f}ms max={max(ms, default=0):7.2f}ms"
+    )
+
+
+async def fresh_engine(database_url: str, **engine_kwargs) -> AsyncEngine:
+    """Create an engine and (re)build the schema from scratch."""
+    engine = create_async_engine(database_url, **engine_kwargs)
+
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine.sync_engine, "connect")
+        def _register_sqlite_functions(dbapi_conn, _connection_record):
+            dbapi_conn.create_function("gen_random_uuid", 0, lambda: uuid.uuid4().hex)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+@asynccontextmanager
+async def bench_client(database_url: str) -> AsyncGenerator[AsyncClient, None]:
+    """An in-process client for ``app.main:app`` backed by a fresh schema."""
+    engine = await fresh_engine(database_url)
+
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def _get_db() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _get_db
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://bench", follow_redirects=True
+        ) as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        await engine.dispose()
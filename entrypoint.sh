@@ -1,8 +1,5 @@
 #!/bin/sh
 set -e
 
-echo "Running database migrations..."
-alembic upgrade head
-
-echo "Starting application..."
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000
+# Runs the migrations once, then one worker per available CPU (WEB_WORKERS).
+exec python -m app.serve --host 0.0.0.0 --port 8000
@@ -9,7 +9,8 @@ the Lead model's server_default.
 from __future__ import annotations
 
 import uuid
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import contextmanager
 
 import pytest
 from httpx import ASGITransport, AsyncClient
@@ -18,9 +19,11 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlalchemy.pool import StaticPool
 
 from app.api.dependencies import get_db
-from app.database import Base
+from app.database import Base, instrument_engine, track_queries
 from app.main import app
 from app.models.lead import Lead  # noqa: F401 — register model metadata
+from app.models.email_outbox import EmailOutbox  # noqa: F401
+from app.models.lead_counter import LeadCounter  # noqa: F401
 
 # ---------------------------------------------------------------------------
 # Test engine
@@ -39,6 +42,8 @@ def _register_sqlite_functions(dbapi_conn, _connection_record):
     dbapi_conn.create_function("gen_random_uuid", 0, lambda: uuid.uuid4().hex)
 
 
+instrument_engine(test_engine, "test")
+
 TestSessionLocal = async_sessionmaker(
     test_engine, class_=AsyncSession, expire_on_commit=False
 )
@@ -87,6 +92,19 @@ async def auth_headers(client: AsyncClient) -> dict[str, str]:
     return {"Authorization": f"Bearer {token}"}
 
 
+@pytest.fixture
+def max_queries():
+    """``with max_queries(2): ...`` fails if the block runs more than 2 SQL statements."""
+
+    @contextmanager
+    def budget(limit: int) -> Iterator[None]:
+        with track_queries() as stats:
+            yield
+        assert stats.statements <= limit, f"{stats.statements} SQL statements, budget is {limit}"
+
+    return budget
+
+
 @pytest.fixture
 def sample_resume_file() -> tuple[str, bytes, str]:
     return ("resume.pdf", b"%PDF-1.4 test content", "application/pdf")
@@ -105,3 +123,22 @@ async def sample_lead(client: AsyncClient, sample_resume_file) -> dict:
     )
     assert resp.status_code == 201
     return resp.json()
+
+
+@pytest.fixture
+def submit_leads(client: AsyncClient, sample_resume_file):
+    """``await submit_leads(n)`` submits *n* leads and returns their responses, oldest first."""
+
+    async def submit(n: int) -> list[dict]:
+        leads = []
+        for i in range(n):
+            resp = await client.post(
+                "/api/v1/leads",
+                data={"first_name": f"Lead{i}", "last_name": "Doe", "email": f"lead{i}@example.com"},
+                files={"resume": sample_resume_file},
+            )
+            assert resp.status_code == 201
+            leads.append(resp.json())
+        return leads
+
+    return submit
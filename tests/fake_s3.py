@@ -0,0 +1,143 @@
+"""An in-memory S3 stand-in for tests and benchmarks.
+
+Implements the slice of the S3 REST API that S3StorageBackend uses — PUT,
+ranged GET, DELETE and multipart uploads, path-style — and checks every
+request's SigV4 signature (header or presigned) the way S3 would, from the
+request as it arrived on the wire.  Mount it with
+``httpx.ASGITransport(app=FakeS3(...))``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import uuid
+from urllib.parse import parse_qsl
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.s3 import UNSIGNED_PAYLOAD, SigV4Signer
+
+ACCESS_KEY = "test-access-key"
+SECRET_KEY = "test-secret-key"
+REGION = "us-east-1"
+
+
+def _error(status: int, code: str) -> Response:
+    body = f"<Error><Code>{code}</Code><Message>{code}</Message></Error>"
+    return Response(body, status_code=status, media_type="application/xml")
+
+
+class FakeS3:
+    def __init__(self, part_delay: float = 0.0, fail_part: int | None = None) -> None:
+        self.signer = SigV4Signer(ACCESS_KEY, SECRET_KEY, REGION)
+        self.objects: dict[str, bytes] = {}
+        self.uploads: dict[str, dict[int, bytes]] = {}
+        self.requests: list[tuple[str, str]] = []  # (method, query keys)
+        self.part_delay = part_delay
+        self.fail_part = fail_part
+        self.parts_in_flight = 0
+        self.max_parts_in_flight = 0
+
+    def _authorized(self, request: Request) -> bool:
+        path = request.scope["raw_path"].decode()
+        query = parse_qsl(request.scope["query_string"].decode(), keep_blank_values=True)
+        params = dict(query)
+        if "X-Amz-Signature" in params:
+            query = [(k, v) for k, v in query if k != "X-Amz-Signature"]
+            headers = {"host": request.headers["host"]}
+            expected = self.signer.signature(
+                request.method, path, query, headers, UNSIGNED_PAYLOAD, params["X-Amz-Date"]
+            )
+            return expected == params["X-Amz-Signature"]
+
+        match = re.fullmatch(
+            r"AWS4-HMAC-SHA256 Credential=[^,]+, SignedHeaders=([^,]+), Signature=(\w+)",
+            request.headers.get("authorization", ""),
+        )
+        if match is None:
+            return False
+        headers = {name: request.headers[name] for name in match[1].split(";")}
+        expected = self.signer.signature(
+            request.method,
+            path,
+            query,
+            headers,
+            request.headers["x-amz-content-sha256"],
+            request.headers["x-amz-date"],
+        )
+        return expected == match[2]
+
+    async def __call__(self, scope, receive, send) -> None:
+        request = Request(scope, receive)
+        response = await self._handle(request)
+        await response(scope, receive, send)
+
+    async def _handle(self, request: Request) -> Response:
+        params = dict(request.query_params)
+        self.requests.append((request.method, ",".join(sorted(params))))
+        if not self._authorized(request):
+            return _error(403, "SignatureDoesNotMatch")
+        key = request.url.path.split("/", 2)[2]
+
+        if request.method == "POST" and "uploads" in params:
+            upload_id = uuid.uuid4().hex
+            self.uploads[upload_id] = {}
+            body = f"<InitiateMultipartUploadResult><UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>"
+            return Response(body, media_type="application/xml")
+        if "uploadId" in params:
+            return await self._multipart(request, key, params)
+        if request.method == "PUT":
+            self.objects[key] = await request.body()
+            return Response(headers={"ETag": f'"{uuid.uuid4().hex}"'})
+        if request.method == "DELETE":
+            self.objects.pop(key, None)
+            return Response(status_code=204)
+        if request.method == "GET":
+            return self._get(request, key)
+        return _error(405, "MethodNotAllowed")
+
+    async def _multipart(self, request: Request, key: str, params: dict) -> Response:
+        parts = self.uploads.get(params["uploadId"])
+        if parts is None:
+            return _error(404, "NoSuchUpload")
+        if request.method == "PUT":
+            number = int(params["partNumber"])
+            self.parts_in_flight += 1
+            self.max_parts_in_flight = max(self.max_parts_in_flight, self.parts_in_flight)
+            try:
+                body = await request.body()
+                await asyncio.sleep(self.part_delay)
+            finally:
+                self.parts_in_flight -= 1
+            if number == self.fail_part:
+                return _error(500, "InternalError")
+            parts[number] = body
+            return Response(headers={"ETag": f'"part-{number}"'})
+        if request.method == "POST":
+            order = [int(n) for n in re.findall(rb"<PartNumber>(\d+)</PartNumber>", await request.body())]
+            self.objects[key] = b"".join(parts[n] for n in order)
+            del self.uploads[params["uploadId"]]
+            return Response("<CompleteMultipartUploadResult/>", media_type="application/xml")
+        if request.method == "DELETE":
+            del self.uploads[params["uploadId"]]
+            return Response(status_code=204)
+        return _error(405, "MethodNotAllowed")
+
+    def _get(self, request: Request, key: str) -> Response:
+        if key not in self.objects:
+            return _error(404, "NoSuchKey")
+        data = self.objects[key]
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", request.headers.get("range", ""))
+        if match is None:
+            return Response(data)
+        start = int(match[1])
+        end = min(int(match[2]) if match[2] else len(data) - 1, len(data) - 1)
+        if start >= len(data):
+            return _error(416, "InvalidRange")
+        return Response(
+            data[start : end + 1],
+            status_code=206,
+            headers={"Content-Range": f"bytes {start}-{end}/{len(data)}"},
+        )
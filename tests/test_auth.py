@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+import time
+
 from httpx import AsyncClient
 
+from app.api.dependencies import get_password_hasher
+from app.core.hashing import REJECTED, PasswordHasher
+from app.main import app
+from app.services.auth_service import pwd_context
+
 
 async def test_login_success(client: AsyncClient):
     resp = await client.post(
@@ -21,3 +29,44 @@ async def test_login_invalid_credentials(client: AsyncClient):
     )
     assert resp.status_code == 401
     assert resp.json()["detail"] == "Invalid credentials"
+
+
+async def test_login_does_not_block_event_loop(client: AsyncClient):
+    """Requests keep flowing while bcrypt runs on the hashing pool."""
+    started = time.perf_counter()
+    login = asyncio.create_task(
+        client.post(
+            "/api/v1/auth/login",
+            data={"username": "attorney@alma.com", "password": "password123"},
+        )
+    )
+    await asyncio.sleep(0.05)  # let the login reach bcrypt
+    health = await client.get("/health")
+    health_done = time.perf_counter() - started
+    assert (await login).status_code == 200
+    login_done = time.perf_counter() - started
+
+    assert health.status_code == 200
+    # An inline verify would hold the loop until the login finished.
+    assert health_done < login_done / 2
+
+
+async def test_login_rejected_when_hashing_pool_is_full(client: AsyncClient):
+    full = PasswordHasher(pwd_context, workers=1, max_pending=0)
+    app.dependency_overrides[get_password_hasher] = lambda: full
+    rejected = REJECTED.value()
+    await full._slots.acquire()  # occupy the only slot
+    try:
+        resp = await client.post(
+            "/api/v1/auth/login",
+            data={"username": "attorney@alma.com", "password": "password123"},
+        )
+    finally:
+        app.dependency_overrides.pop(get_password_hasher, None)
+        full._slots.release()
+        full.shutdown()
+
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == "1"
+    assert REJECTED.value() == rejected + 1
+    assert "password_hash_rejected_total" in (await client.get("/metrics")).text
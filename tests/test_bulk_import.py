@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import io
+import json
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.email_outbox import EmailOutbox
+from app.models.lead import Lead
+from app.services import lead_service
+from tests.conftest import TestSessionLocal
+
+PDF = b"%PDF-1.4 imported resume"
+
+
+def _zip(members: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+def _lines(resp) -> list[dict]:
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+async def _import(client: AsyncClient, headers: dict, manifest: tuple[str, bytes], archive: bytes):
+    return await client.post(
+        "/api/v1/leads/import",
+        files={
+            "manifest": (manifest[0], manifest[1], "text/plain"),
+            "resumes": ("resumes.zip", archive, "application/zip"),
+        },
+        headers=headers,
+    )
+
+
+async def test_import_requires_auth(client: AsyncClient):
+    resp = await _import(client, {}, ("leads.csv", b""), _zip({}))
+    assert resp.status_code == 401
+
+
+async def test_import_csv_reports_each_row(client: AsyncClient, auth_headers: dict, monkeypatch):
+    monkeypatch.setattr(settings, "LEAD_IMPORT_BATCH_SIZE", 2)
+    manifest = (
+        "first_name,last_name,email,resume\n"
+        "Ada,Lovelace,ada@example.com,cv/ada.pdf\n"
+        "Bad,Email,not-an-email,cv/ada.pdf\n"
+        "Grace,Hopper,grace@example.com,missing.pdf\n"
+        "Alan,Turing,alan@example.com,cv/alan.pdf\n"
+        "Fake,Pdf,fake@example.com,fake.pdf\n"
+    ).encode()
+    archive = _zip({"cv/ada.pdf": PDF, "cv/alan.pdf": PDF, "fake.pdf": b"not a pdf"})
+
+    resp = await _import(client, auth_headers, ("leads.csv", manifest), archive)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    *results, summary = _lines(resp)
+
+    assert [(r["row"], r["outcome"]) for r in results] == [
+        (1, "created"),
+        (2, "rejected"),
+        (3, "rejected"),
+        (4, "created"),
+        (5, "rejected"),
+    ]
+    assert "email" in results[1]["errors"][0]
+    assert "not in the archive" in results[2]["errors"][0]
+    assert "not a valid '.pdf'" in results[4]["errors"][0]
+    assert summary == {"created": 2, "rejected": 3}
+
+    listed = (await client.get("/api/v1/leads", headers=auth_headers)).json()
+    assert listed["count"] == 2
+    assert {item["id"] for item in listed["items"]} == {results[0]["id"], results[3]["id"]}
+    resume = await client.get(listed["items"][0]["resume_url"], headers=auth_headers)
+    assert resume.content == PDF
+
+
+async def test_import_ndjson_batches_notifications(client: AsyncClient, auth_headers: dict):
+    rows = [
+        {"first_name": f"P{i}", "last_name": "Lead", "email": f"p{i}@example.com", "resume": "cv.pdf"}
+        for i in range(3)
+    ]
+    manifest = ("\n".join(json.dumps(r) for r in rows) + "\n\n[1]\n").encode()
+
+    resp = await _import(client, auth_headers, ("leads.ndjson", manifest), _zip({"cv.pdf": PDF}))
+    *results, summary = _lines(resp)
+    assert summary == {"created": 3, "rejected": 1}
+    assert results[3] == {"row": 4, "outcome": "rejected", "errors": ["Each line must be a JSON object"]}
+
+    async with TestSessionLocal() as session:
+        recipients = (await session.execute(select(EmailOutbox.recipient))).scalars().all()
+    # One confirmation per prospect, one summary for the attorney.
+    assert sorted(recipients) == sorted([r["email"] for r in rows] + [settings.ATTORNEY_EMAIL])
+
+
+async def test_imported_rows_are_stamped_at_insert(client: AsyncClient, auth_headers: dict, monkeypatch):
+    # Every utcnow() call is a second later, as if each resume took that long
+    # to store: rows stamped per resume would end up seconds before the commit.
+    clock = iter(datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=i) for i in range(1000))
+    monkeypatch.setattr(lead_service, "utcnow", lambda: next(clock))
+    manifest = "first_name,last_name,email,resume\n" + "".join(
+        f"P{i},Lead,p{i}@example.com,cv.pdf\n" for i in range(3)
+    )
+    resp = await _import(client, auth_headers, ("leads.csv", manifest.encode()), _zip({"cv.pdf": PDF}))
+    assert _lines(resp)[-1] == {"created": 3, "rejected": 0}
+
+    async with TestSessionLocal() as session:
+        stamps = (await session.execute(select(Lead.created_at, Lead.updated_at))).all()
+    assert len({stamp for row in stamps for stamp in row}) == 1
+
+
+async def test_import_rejects_bad_archive(client: AsyncClient, auth_headers: dict):
+    resp = await client.post(
+        "/api/v1/leads/import",
+        files={
+            "manifest": ("leads.csv", b"first_name\n", "text/csv"),
+            "resumes": ("resumes.zip", b"PK\x03\x04 truncated", "application/zip"),
+        },
+        headers=auth_headers,
+    )
+    assert resp.status_code == 422
+    assert "not a valid zip" in resp.json()["detail"]
+
+
+async def test_import_rejects_unknown_manifest_type(client: AsyncClient, auth_headers: dict):
+    resp = await _import(client, auth_headers, ("leads.xlsx", b"PK"), _zip({}))
+    assert resp.status_code == 422
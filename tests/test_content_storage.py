@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import io
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+from httpx import AsyncClient
+
+from app.api.dependencies import get_storage
+from app.commands.dedupe_uploads import dedupe_uploads
+from app.core.storage import ContentAddressedStorageBackend, LocalStorageBackend
+from app.main import app
+
+PDF = b"%PDF-1.4 same resume" * 500
+FORM = {"first_name": "Ada", "last_name": "Lovelace", "email": "ada@example.com"}
+
+
+@pytest.fixture
+def storage(tmp_path: Path):
+    storage = ContentAddressedStorageBackend(str(tmp_path))
+    app.dependency_overrides[get_storage] = lambda: storage
+    yield storage
+    app.dependency_overrides.pop(get_storage, None)
+
+
+def _stored_files(storage: ContentAddressedStorageBackend) -> list[str]:
+    return sorted(storage.stored_names())
+
+
+async def test_identical_uploads_share_one_reference_counted_file(
+    storage: ContentAddressedStorageBackend,
+):
+    first = await storage.save(UploadFile(io.BytesIO(PDF)), "cv.pdf")
+    second = await storage.save(UploadFile(io.BytesIO(PDF)), "resume.pdf")
+    other = await storage.save(UploadFile(io.BytesIO(PDF + b"!")), "cv.pdf")
+
+    assert first == second == f"{hashlib.sha256(PDF).hexdigest()}.pdf"
+    assert _stored_files(storage) == sorted([first, other])
+
+    await storage.delete(first)
+    assert (await storage.get_path(first)).read_bytes() == PDF
+    await storage.delete(second)
+    assert _stored_files(storage) == [other]
+    assert not (storage.refs_dir / first).exists()
+
+
+async def test_resubmitted_resume_is_stored_once(
+    client: AsyncClient, auth_headers: dict, storage: ContentAddressedStorageBackend
+):
+    urls = []
+    for i in range(3):
+        resp = await client.post(
+            "/api/v1/leads",
+            data=FORM | {"email": f"ada{i}@example.com"},
+            files={"resume": ("cv.pdf", PDF, "application/pdf")},
+        )
+        assert resp.status_code == 201
+        urls.append(resp.json()["resume_url"])
+
+    assert len(set(urls)) == 1
+    assert urls[0] == f"/uploads/{hashlib.sha256(PDF).hexdigest()}.pdf"
+    assert len(_stored_files(storage)) == 1
+    resp = await client.get(urls[0], headers=auth_headers)
+    assert resp.content == PDF
+
+    report = await storage.report()
+    assert (report.files, report.references) == (1, 3)
+    assert report.saved_bytes == 2 * len(PDF)
+
+
+async def test_migration_links_legacy_duplicates_in_place(tmp_path: Path):
+    legacy = LocalStorageBackend(str(tmp_path))
+    names = [await legacy.save(UploadFile(io.BytesIO(PDF)), "cv.pdf") for _ in range(3)]
+    unique = await legacy.save(UploadFile(io.BytesIO(b"%PDF-1.4 unique")), "cv.pdf")
+
+    storage = ContentAddressedStorageBackend(str(tmp_path))
+    before = await storage.report()
+    assert (before.files, before.saved_bytes) == (4, 0)
+
+    assert await dedupe_uploads(storage) == (4, 2)
+    after = await storage.report()
+    assert after.files == 2
+    assert after.references == 4
+    assert after.saved_bytes == 2 * len(PDF)
+    # Legacy names still resolve, now to the shared copy.
+    paths = [await storage.get_path(name) for name in names]
+    assert len({path.stat().st_ino for path in paths}) == 1
+    assert all(path.read_bytes() == PDF for path in paths)
+
+    # New uploads of the same content reuse it, and a rerun changes nothing.
+    shared = await storage.save(UploadFile(io.BytesIO(PDF)), "cv.pdf")
+    assert (await storage.get_path(shared)).stat().st_ino == paths[0].stat().st_ino
+    assert await dedupe_uploads(storage) == (6, 0)
+
+    # Deleting the last counted reference leaves the legacy names intact.
+    await storage.delete(shared)
+    await storage.delete(unique)
+    assert all(path.read_bytes() == PDF for path in paths)
+    assert not (await storage.get_path(unique)).exists()
+
+
+async def test_deleting_an_adopted_unique_file_removes_its_shared_copy(tmp_path: Path):
+    legacy = LocalStorageBackend(str(tmp_path))
+    name = await legacy.save(UploadFile(io.BytesIO(PDF)), "cv.pdf")
+
+    storage = ContentAddressedStorageBackend(str(tmp_path))
+    assert await storage.adopt(name) is False
+    assert (await storage.report()).references == 1
+
+    await storage.delete(name)
+    assert _stored_files(storage) == []
+    assert not any(path.is_file() for path in tmp_path.rglob("*"))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.api.dependencies import get_email_dispatcher
+from app.config import settings
+from app.core.email import ConsoleEmailBackend
+from app.main import app
+from app.models.email_outbox import EmailOutbox, OutboxStatus
+from app.services.email_dispatcher import EmailDispatcher
+from tests.conftest import TestSessionLocal
+
+
+class FailingEmailBackend:
+    def __init__(self):
+        self.calls = 0
+
+    async def send(self, to: str, subject: str, body: str) -> None:
+        self.calls += 1
+        raise ConnectionError("provider unavailable")
+
+
+async def _outbox() -> list[EmailOutbox]:
+    async with TestSessionLocal() as session:
+        result = await session.execute(select(EmailOutbox).order_by(EmailOutbox.recipient))
+        return list(result.scalars().all())
+
+
+async def test_submit_lead_queues_emails_instead_of_sending(sample_lead: dict):
+    messages = await _outbox()
+    assert sorted(m.recipient for m in messages) == sorted(
+        [sample_lead["email"], settings.ATTORNEY_EMAIL]
+    )
+    assert all(m.status == OutboxStatus.PENDING for m in messages)
+
+
+async def test_dispatcher_delivers_queued_emails(sample_lead: dict):
+    dispatcher = EmailDispatcher(TestSessionLocal, ConsoleEmailBackend())
+
+    assert await dispatcher.drain_once() == 2
+    assert await dispatcher.drain_once() == 0
+
+    assert all(m.status == OutboxStatus.SENT for m in await _outbox())
+    stats = await dispatcher.stats()
+    assert stats["pending"] == 0
+    assert stats["sent_total"] == 2
+    assert stats["drain_rate_per_second"] > 0
+
+
+async def test_dispatcher_retries_then_dead_letters(sample_lead: dict):
+    backend = FailingEmailBackend()
+    dispatcher = EmailDispatcher(
+        TestSessionLocal, backend, max_attempts=2, backoff_base=0, lease=0
+    )
+
+    await dispatcher.drain_once()
+    messages = await _outbox()
+    assert all(m.status == OutboxStatus.PENDING and m.attempts == 1 for m in messages)
+    assert all("provider unavailable" in m.last_error for m in messages)
+
+    await dispatcher.drain_once()
+    assert all(m.status == OutboxStatus.DEAD for m in await _outbox())
+    assert backend.calls == 4
+    assert await dispatcher.drain_once() == 0
+    assert (await dispatcher.stats())["dead"] == 2
+
+
+async def test_outbox_stats_endpoint(client: AsyncClient, auth_headers: dict, sample_lead: dict):
+    dispatcher = EmailDispatcher(TestSessionLocal, ConsoleEmailBackend())
+    app.dependency_overrides[get_email_dispatcher] = lambda: dispatcher
+    try:
+        resp = await client.get("/api/v1/outbox/stats", headers=auth_headers)
+    finally:
+        del app.dependency_overrides[get_email_dispatcher]
+    assert resp.status_code == 200
+    assert resp.json()["pending"] == 2
+
+
+async def test_outbox_stats_unavailable_without_dispatcher(client: AsyncClient, auth_headers: dict):
+    resp = await client.get("/api/v1/outbox/stats", headers=auth_headers)
+    assert resp.status_code == 503
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.api.dependencies import get_lead_batch_writer
+from app.main import app
+from app.models.email_outbox import EmailOutbox
+from app.models.lead_counter import LeadCounter
+from app.repositories.lead_batch_writer import LeadBatchWriter
+from tests.conftest import TestSessionLocal
+
+EMAILS = [("someone@example.com", "subject", "body")]
+
+
+def _lead(i: int) -> dict:
+    return {"first_name": f"Lead{i}", "last_name": "Doe", "email": f"lead{i}@example.com"}
+
+
+async def _scalar(stmt):
+    async with TestSessionLocal() as session:
+        return (await session.execute(stmt)).scalar_one()
+
+
+async def test_concurrent_creates_share_one_batch():
+    writer = LeadBatchWriter(TestSessionLocal, max_wait=0.05)
+    leads = await asyncio.gather(*(writer.create(_lead(i), f"{i}.pdf", EMAILS) for i in range(5)))
+
+    assert writer.batches_written == 1
+    assert [lead.first_name for lead in leads] == [f"Lead{i}" for i in range(5)]
+    assert [lead.resume_path for lead in leads] == [f"{i}.pdf" for i in range(5)]
+    assert len({lead.id for lead in leads}) == 5
+    assert await _scalar(select(func.count()).select_from(EmailOutbox)) == 5
+    assert await _scalar(select(LeadCounter.value).where(LeadCounter.name == "total")) == 5
+
+
+async def test_full_batch_flushes_without_waiting():
+    writer = LeadBatchWriter(TestSessionLocal, max_batch=2, max_wait=60)
+    await asyncio.wait_for(
+        asyncio.gather(*(writer.create(_lead(i), "x.pdf", []) for i in range(4))), timeout=5
+    )
+    assert writer.batches_written == 2
+
+
+async def test_failing_row_does_not_fail_its_batch():
+    writer = LeadBatchWriter(TestSessionLocal, max_wait=0.05)
+    bad = {**_lead(1), "first_name": None}
+    results = await asyncio.gather(
+        writer.create(_lead(0), "a.pdf", EMAILS),
+        writer.create(bad, "b.pdf", EMAILS),
+        writer.create(_lead(2), "c.pdf", EMAILS),
+        return_exceptions=True,
+    )
+    assert results[0].first_name == "Lead0"
+    assert isinstance(results[1], IntegrityError)
+    assert results[2].first_name == "Lead2"
+    assert await _scalar(select(func.count()).select_from(EmailOutbox)) == 2
+
+
+@pytest.fixture
+def batch_writer():
+    writer = LeadBatchWriter(TestSessionLocal, max_wait=0.01)
+    app.dependency_overrides[get_lead_batch_writer] = lambda: writer
+    yield writer
+    del app.dependency_overrides[get_lead_batch_writer]
+
+
+async def test_submissions_go_through_batch_writer(
+    client: AsyncClient, batch_writer: LeadBatchWriter, sample_resume_file
+):
+    resp = await client.post(
+        "/api/v1/leads", data=_lead(0), files={"resume": sample_resume_file}
+    )
+    assert resp.status_code == 201
+    assert resp.json()["first_name"] == "Lead0"
+    assert resp.json()["status"] == "PENDING"
+    assert batch_writer.leads_written == 1
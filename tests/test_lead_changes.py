@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+
+from app.config import settings
+from app.repositories.lead_repository import LeadRepository
+from tests.conftest import TestSessionLocal
+
+
+@pytest.fixture(autouse=True)
+def _no_settle_delay(monkeypatch):
+    monkeypatch.setattr(settings, "LEAD_CHANGES_SETTLE_SECONDS", 0)
+
+
+async def _drain(client: AsyncClient, headers: dict, since: str | None, limit: int = 500):
+    """Follow the feed until it is caught up; return (ids in order, final watermark)."""
+    ids: list[str] = []
+    while True:
+        params = {"limit": limit} | ({"since": since} if since else {})
+        resp = await client.get("/api/v1/leads/changes", params=params, headers=headers)
+        assert resp.status_code == 200
+        body = resp.json()
+        ids.extend(item["id"] for item in body["items"])
+        since = body["next_since"]
+        if not body["has_more"]:
+            return ids, since
+
+
+async def test_changes_requires_auth(client: AsyncClient):
+    resp = await client.get("/api/v1/leads/changes")
+    assert resp.status_code == 401
+
+
+async def test_changes_reports_new_and_updated_leads(
+    client: AsyncClient, auth_headers: dict, submit_leads
+):
+    leads = await submit_leads(3)
+    ids, watermark = await _drain(client, auth_headers, None, limit=2)
+    assert ids == [lead["id"] for lead in leads]
+
+    # Caught up: nothing new, and the watermark is handed back unchanged.
+    again, same = await _drain(client, auth_headers, watermark)
+    assert again == [] and same == watermark
+
+    await client.patch(
+        f"/api/v1/leads/{leads[0]['id']}/status",
+        json={"status": "REACHED_OUT"},
+        headers=auth_headers,
+    )
+    [new] = await submit_leads(1)
+    ids, _ = await _drain(client, auth_headers, watermark)
+    assert ids == [leads[0]["id"], new["id"]]
+
+
+async def test_changes_pages_through_identical_timestamps(
+    client: AsyncClient, auth_headers: dict
+):
+    stamp = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "first_name": "Same",
+            "last_name": f"Stamp{i}",
+            "email": f"same{i}@example.com",
+            "resume_path": f"{i}.pdf",
+            "created_at": stamp,
+            "updated_at": stamp,
+        }
+        for i in range(5)
+    ]
+    async with TestSessionLocal() as session:
+        await LeadRepository(session).insert_many(rows)
+
+    ids, _ = await _drain(client, auth_headers, None, limit=2)
+    assert ids == sorted(str(row["id"]) for row in rows)
+
+
+async def test_changes_holds_back_unsettled_writes(
+    client: AsyncClient, auth_headers: dict, submit_leads, monkeypatch
+):
+    await submit_leads(1)
+    monkeypatch.setattr(settings, "LEAD_CHANGES_SETTLE_SECONDS", 60)
+    ids, watermark = await _drain(client, auth_headers, None)
+    assert ids == [] and watermark is None
+
+
+async def test_changes_invalid_watermark(client: AsyncClient, auth_headers: dict):
+    resp = await client.get(
+        "/api/v1/leads/changes", params={"since": "garbage"}, headers=auth_headers
+    )
+    assert resp.status_code == 400
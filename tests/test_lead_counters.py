@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from httpx import AsyncClient
+from sqlalchemy import select, update
+
+from app.models.lead_counter import LeadCounter
+from tests.conftest import TestSessionLocal
+
+
+async def _counters() -> dict[str, int]:
+    async with TestSessionLocal() as session:
+        rows = await session.execute(select(LeadCounter.name, LeadCounter.value))
+        return dict(rows.all())
+
+
+async def test_counters_track_submissions_and_status_changes(
+    client: AsyncClient, auth_headers: dict, sample_lead: dict
+):
+    assert await _counters() == {"total": 1, "PENDING": 1, "REACHED_OUT": 0}
+
+    resp = await client.patch(
+        f"/api/v1/leads/{sample_lead['id']}/status",
+        json={"status": "REACHED_OUT"},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    assert await _counters() == {"total": 1, "PENDING": 0, "REACHED_OUT": 1}
+
+
+async def test_list_leads_count_modes_agree(
+    client: AsyncClient, auth_headers: dict, sample_lead: dict
+):
+    counts = {}
+    for mode in ("exact", "cached", "estimate"):
+        resp = await client.get(
+            "/api/v1/leads", params={"count_mode": mode}, headers=auth_headers
+        )
+        assert resp.status_code == 200
+        counts[mode] = resp.json()["count"]
+    # SQLite has no planner statistics, so "estimate" falls back to the counter.
+    assert counts == {"exact": 1, "cached": 1, "estimate": 1}
+
+
+async def test_list_leads_rejects_unknown_count_mode(client: AsyncClient, auth_headers: dict):
+    resp = await client.get(
+        "/api/v1/leads", params={"count_mode": "bogus"}, headers=auth_headers
+    )
+    assert resp.status_code == 422
+
+
+async def test_counters_track_bulk_status_changes(
+    client: AsyncClient, auth_headers: dict, sample_lead: dict
+):
+    resp = await client.patch(
+        "/api/v1/leads/status",
+        json={"status": "REACHED_OUT", "ids": [sample_lead["id"]]},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    assert await _counters() == {"total": 1, "PENDING": 0, "REACHED_OUT": 1}
+
+
+async def test_status_filtered_list_reads_the_status_counter(
+    client: AsyncClient, auth_headers: dict, sample_lead: dict
+):
+    # Skew the counter so the response shows which count it came from.
+    async with TestSessionLocal() as session:
+        await session.execute(
+            update(LeadCounter).where(LeadCounter.name == "PENDING").values(value=7)
+        )
+        await session.commit()
+
+    async def count(**params) -> int:
+        resp = await client.get("/api/v1/leads", params=params, headers=auth_headers)
+        assert resp.status_code == 200
+        return resp.json()["count"]
+
+    assert await count(status="PENDING") == 7
+    assert await count(status="PENDING", count_mode="exact") == 1
+    assert await count(status="PENDING", name="Ja") == 1
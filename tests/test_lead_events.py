@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.api.dependencies import get_event_broker
+from app.core.events import InProcessBroker, format_sse
+from app.main import app
+
+
+@pytest.fixture
+def broker():
+    broker = InProcessBroker()
+    app.dependency_overrides[get_event_broker] = lambda: broker
+    yield broker
+    app.dependency_overrides.pop(get_event_broker, None)
+
+
+def _parse(frame: bytes) -> tuple[str, dict, str | None]:
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().splitlines())
+    return fields["event"], json.loads(fields["data"]), fields.get("id")
+
+
+async def test_fan_out_reaches_every_subscriber_and_drops_slow_ones():
+    broker = InProcessBroker()
+    fast = [broker.subscribe(max_pending=2) for _ in range(1000)]
+    slow = broker.subscribe(max_pending=2)
+
+    for i in range(3):
+        await broker.publish(format_sse("tick", str(i)))
+        for subscription in fast:
+            assert await subscription.get() == format_sse("tick", str(i))
+
+    assert slow.dropped
+    assert await slow.get() is None
+    assert len(broker) == 1000 and broker.dropped_total == 1
+
+    await broker.stop()
+    assert [await subscription.get() for subscription in fast] == [None] * 1000
+
+
+async def test_lead_writes_publish_events(
+    client: AsyncClient, auth_headers: dict, sample_resume_file, broker
+):
+    subscription = broker.subscribe(max_pending=10)
+    resp = await client.post(
+        "/api/v1/leads",
+        data={"first_name": "Live", "last_name": "Lead", "email": "live@example.com"},
+        files={"resume": sample_resume_file},
+    )
+    lead = resp.json()
+    event, data, event_id = _parse(await subscription.get())
+    assert (event, data) == ("lead.created", lead)
+
+    await client.patch(
+        f"/api/v1/leads/{lead['id']}/status", json={"status": "REACHED_OUT"}, headers=auth_headers
+    )
+    event, data, next_id = _parse(await subscription.get())
+    assert event == "lead.status_changed" and data["status"] == "REACHED_OUT"
+    assert next_id != event_id
+
+    # Event ids are change-feed watermarks.
+    resp = await client.get(
+        "/api/v1/leads/changes", params={"since": next_id}, headers=auth_headers
+    )
+    assert resp.json()["items"] == []
+
+
+async def test_bulk_status_update_publishes_one_event(
+    client: AsyncClient, auth_headers: dict, submit_leads, broker
+):
+    ids = [lead["id"] for lead in await submit_leads(3)]
+    subscription = broker.subscribe(max_pending=10)
+    resp = await client.patch(
+        "/api/v1/leads/status", json={"status": "REACHED_OUT", "ids": ids}, headers=auth_headers
+    )
+    assert resp.json()["updated"] == 3
+
+    event, data, event_id = _parse(await subscription.get())
+    assert (event, data, event_id) == ("leads.status_changed", {"updated": 3, "status": "REACHED_OUT"}, None)
+    # Nothing else was queued ahead of a frame published afterwards.
+    await broker.publish(format_sse("tick", "0"))
+    assert await subscription.get() == format_sse("tick", "0")
+
+
+async def test_stream_endpoint_delivers_frames(
+    client: AsyncClient, auth_headers: dict, sample_resume_file, broker
+):
+    stream = asyncio.create_task(client.get("/api/v1/leads/stream", headers=auth_headers))
+    while not len(broker):
+        await asyncio.sleep(0.01)
+    await client.post(
+        "/api/v1/leads",
+        data={"first_name": "Live", "last_name": "Lead", "email": "live@example.com"},
+        files={"resume": sample_resume_file},
+    )
+    await broker.stop()  # ends the stream so the buffered response completes
+
+    resp = await stream
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    frames = resp.content.split(b"\n\n")
+    assert frames[0] == b"retry: 3000"
+    assert _parse(frames[1])[0] == "lead.created"
+    assert len(broker) == 0
+
+
+async def test_stream_requires_auth_and_a_broker(client: AsyncClient, auth_headers: dict):
+    assert (await client.get("/api/v1/leads/stream")).status_code == 401
+    resp = await client.get("/api/v1/leads/stream", headers=auth_headers)
+    assert resp.status_code == 503
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+
+from httpx import AsyncClient
+
+from app.config import settings
+
+
+async def _listed(client: AsyncClient, headers: dict) -> list[dict]:
+    resp = await client.get("/api/v1/leads", headers=headers)
+    return list(reversed(resp.json()["items"]))
+
+
+async def test_export_requires_auth(client: AsyncClient):
+    resp = await client.get("/api/v1/leads/export")
+    assert resp.status_code == 401
+
+
+async def test_export_ndjson_matches_api_layout(
+    client: AsyncClient, auth_headers: dict, submit_leads, monkeypatch
+):
+    monkeypatch.setattr(settings, "LEAD_EXPORT_BATCH_SIZE", 2)
+    await submit_leads(5)
+
+    resp = await client.get(
+        "/api/v1/leads/export", params={"format": "ndjson"}, headers=auth_headers
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in resp.text.splitlines()] == await _listed(
+        client, auth_headers
+    )
+
+
+async def test_export_csv_uses_response_columns(
+    client: AsyncClient, auth_headers: dict, submit_leads
+):
+    await submit_leads(3)
+
+    resp = await client.get("/api/v1/leads/export", headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert 'filename="leads.csv"' in resp.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert rows == await _listed(client, auth_headers)
+
+
+async def test_export_filters(client: AsyncClient, auth_headers: dict, submit_leads):
+    leads = await submit_leads(4)
+    await client.patch(
+        f"/api/v1/leads/{leads[0]['id']}/status",
+        json={"status": "REACHED_OUT"},
+        headers=auth_headers,
+    )
+
+    def ids(resp) -> list[str]:
+        return [json.loads(line)["id"] for line in resp.text.splitlines()]
+
+    resp = await client.get(
+        "/api/v1/leads/export",
+        params={"format": "ndjson", "status": "PENDING"},
+        headers=auth_headers,
+    )
+    assert ids(resp) == [lead["id"] for lead in leads[1:]]
+
+    resp = await client.get(
+        "/api/v1/leads/export",
+        params={
+            "format": "ndjson",
+            "created_after": leads[0]["created_at"],
+            "created_before": leads[3]["created_at"],
+        },
+        headers=auth_headers,
+    )
+    assert ids(resp) == [leads[1]["id"], leads[2]["id"]]
+
+
+async def test_export_gzip(client: AsyncClient, auth_headers: dict, submit_leads):
+    await submit_leads(2)
+    plain = await client.get("/api/v1/leads/export", headers=auth_headers)
+
+    async with client.stream(
+        "GET", "/api/v1/leads/export", params={"gzip": True}, headers=auth_headers
+    ) as resp:
+        assert resp.headers["content-encoding"] == "gzip"
+        raw = b"".join([chunk async for chunk in resp.aiter_raw()])
+    assert gzip.decompress(raw) == plain.content
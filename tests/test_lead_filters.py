@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from app.models.lead import LeadStatus
+from app.repositories.lead_repository import LeadFilter, LeadRepository
+from tests.conftest import TestSessionLocal, test_engine
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+PEOPLE = [
+    ("Ada", "Lovelace", "Ada@Example.com"),
+    ("Alan", "Turing", "alan@example.com"),
+    ("Grace", "Hopper", "grace@example.com"),
+    ("Adele", "Goldberg", "adele@example.com"),
+    ("Barbara", "Adams", "barbara@example.com"),
+    ("Percy", "100%_Real", "percy@example.com"),
+]
+
+
+@pytest.fixture
+async def leads() -> list[dict]:
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "first_name": first,
+            "last_name": last,
+            "email": email,
+            "resume_path": f"{i}.pdf",
+            "created_at": START + timedelta(days=i),
+            "updated_at": START + timedelta(days=i),
+        }
+        for i, (first, last, email) in enumerate(PEOPLE)
+    ]
+    async with TestSessionLocal() as session:
+        repo = LeadRepository(session)
+        await repo.insert_many(rows)
+        for row in rows[::2]:
+            await repo.transition_status(row["id"], LeadStatus.PENDING, LeadStatus.REACHED_OUT)
+    return rows
+
+
+async def _names(client: AsyncClient, headers: dict, **params) -> tuple[list[str], int]:
+    resp = await client.get("/api/v1/leads", params=params, headers=headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    return [item["first_name"] for item in body["items"]], body["count"]
+
+
+async def test_filter_by_status_and_created_range(
+    client: AsyncClient, auth_headers: dict, leads: list[dict]
+):
+    assert await _names(client, auth_headers, status="PENDING") == (["Percy", "Adele", "Alan"], 3)
+    assert await _names(
+        client,
+        auth_headers,
+        status="REACHED_OUT",
+        created_after=(START + timedelta(days=1)).isoformat(),
+        created_before=(START + timedelta(days=5)).isoformat(),
+    ) == (["Barbara", "Grace"], 2)
+
+
+async def test_filter_by_email_is_exact_and_case_insensitive(
+    client: AsyncClient, auth_headers: dict, leads: list[dict]
+):
+    assert await _names(client, auth_headers, email="ada@example.COM") == (["Ada"], 1)
+    assert await _names(client, auth_headers, email="ada@example") == ([], 0)
+
+
+async def test_filter_by_name_prefix_matches_first_or_last_name(
+    client: AsyncClient, auth_headers: dict, leads: list[dict]
+):
+    assert await _names(client, auth_headers, name="ad") == (["Barbara", "Adele", "Ada"], 3)
+    assert await _names(client, auth_headers, name="100%_") == (["Percy"], 1)
+    assert await _names(client, auth_headers, name="10_") == ([], 0)
+
+
+async def test_filter_by_name_prefix_with_non_ascii_capitals(
+    client: AsyncClient, auth_headers: dict, leads: list[dict]
+):
+    async with TestSessionLocal() as session:
+        await LeadRepository(session).insert_many(
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "first_name": "Éloïse",
+                    "last_name": "Ødegård",
+                    "email": "eloise@example.com",
+                    "resume_path": "eloise.pdf",
+                    "created_at": START,
+                    "updated_at": START,
+                }
+            ]
+        )
+    assert await _names(client, auth_headers, name="Élo") == (["Éloïse"], 1)
+    assert await _names(client, auth_headers, name="ØDE") == (["Éloïse"], 1)
+
+
+async def test_filters_compose_with_cursor_pagination(
+    client: AsyncClient, auth_headers: dict, leads: list[dict]
+):
+    resp = await client.get(
+        "/api/v1/leads", params={"name": "a", "limit": 1}, headers=auth_headers
+    )
+    seen = [resp.json()["items"][0]["first_name"]]
+    while cursor := resp.json()["next_cursor"]:
+        resp = await client.get(
+            "/api/v1/leads", params={"name": "a", "limit": 1, "cursor": cursor}, headers=auth_headers
+        )
+        seen.extend(item["first_name"] for item in resp.json()["items"])
+    assert seen == ["Barbara", "Adele", "Alan", "Ada"]
+    assert resp.json()["count"] == 4
+
+
+# ---------------------------------------------------------------------------
+# Query plans: each filter must be served by its index, not a table scan.
+# ---------------------------------------------------------------------------
+
+
+async def _page_plan(where: LeadFilter, **page) -> str:
+    """EXPLAIN QUERY PLAN for the page query ``get_page_rows`` actually sends."""
+    captured: list[tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "ORDER BY" in statement:
+            captured.append((statement, parameters))
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with TestSessionLocal() as session:
+            await LeadRepository(session).get_page_rows(limit=50, where=where, **page)
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", capture)
+
+    statement, parameters = captured[-1]
+    async with test_engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return "\n".join(row[-1] for row in result)
+
+
+@pytest.mark.parametrize(
+    ("where", "index"),
+    [
+        (LeadFilter(status=LeadStatus.PENDING), "ix_leads_status_created_at_id"),
+        (
+            LeadFilter(status=LeadStatus.PENDING, created_after=START),
+            "ix_leads_status_created_at_id",
+        ),
+        (LeadFilter(created_after=START, created_before=START), "ix_leads_created_at_id"),
+        (LeadFilter(email="ada@example.com"), "ix_leads_lower_email"),
+        (LeadFilter(name="ad"), "ix_leads_lower_first_name"),
+        (LeadFilter(name="ad"), "ix_leads_lower_last_name"),
+    ],
+)
+async def test_filter_query_plans_use_indexes(where: LeadFilter, index: str):
+    plan = await _page_plan(where)
+    assert index in plan
+    assert "SCAN leads" not in plan.splitlines()  # no full table scan
+
+
+async def test_status_filter_pages_by_cursor_without_sorting():
+    plan = await _page_plan(
+        LeadFilter(status=LeadStatus.PENDING), after=(START, uuid.UUID(int=0))
+    )
+    assert "ix_leads_status_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime, timezone
 
 from httpx import AsyncClient
 
+from app.models.lead import LeadStatus
+from app.repositories.lead_repository import LeadRepository
+from app.schemas.lead import (
+    MAX_BULK_STATUS_IDS,
+    LeadListResponse,
+    LeadResponse,
+    dump_lead_list,
+)
+from tests.conftest import TestSessionLocal
+
 
 async def test_list_leads_requires_auth(client: AsyncClient):
     resp = await client.get("/api/v1/leads")
@@ -67,3 +78,156 @@ async def test_update_lead_already_reached_out(
         headers=auth_headers,
     )
     assert resp.status_code == 409
+
+
+async def test_list_leads_cursor_walks_every_lead_once(
+    client: AsyncClient, auth_headers: dict, submit_leads
+):
+    created = await submit_leads(5)
+
+    seen: list[str] = []
+    resp = await client.get("/api/v1/leads", params={"limit": 2}, headers=auth_headers)
+    while True:
+        assert resp.status_code == 200
+        body = resp.json()
+        seen.extend(item["id"] for item in body["items"])
+        if body["next_cursor"] is None:
+            break
+        # New submissions mid-walk must not shift or repeat later pages.
+        await submit_leads(1)
+        resp = await client.get(
+            "/api/v1/leads",
+            params={"limit": 2, "cursor": body["next_cursor"]},
+            headers=auth_headers,
+        )
+
+    assert seen == [lead["id"] for lead in reversed(created)]
+
+
+async def test_list_leads_offset_pagination_still_supported(
+    client: AsyncClient, auth_headers: dict, submit_leads
+):
+    created = await submit_leads(3)
+    resp = await client.get(
+        "/api/v1/leads", params={"skip": 1, "limit": 1}, headers=auth_headers
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["count"] == 3
+    assert [item["id"] for item in body["items"]] == [created[1]["id"]]
+    assert body["next_cursor"] is not None
+
+
+async def test_list_leads_fast_path_matches_model_serialization(
+    client: AsyncClient, auth_headers: dict, submit_leads
+):
+    await submit_leads(3)
+    resp = await client.get("/api/v1/leads", params={"limit": 2}, headers=auth_headers)
+    assert resp.headers["content-type"] == "application/json"
+
+    async with TestSessionLocal() as session:
+        leads = await LeadRepository(session).get_all(limit=2)
+    expected = LeadListResponse(
+        items=[LeadResponse.model_validate(lead) for lead in leads],
+        count=3,
+        next_cursor=resp.json()["next_cursor"],
+    )
+    assert resp.content == expected.model_dump_json().encode()
+
+
+def test_dump_lead_list_matches_model_dump_json():
+    row = (
+        uuid.uuid4(),
+        "Zoë",
+        "O\"Brien",
+        "zoe@example.com",
+        "abc.pdf",
+        LeadStatus.REACHED_OUT,
+        datetime(2026, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc),
+        datetime(2026, 1, 2, 3, 4, 6),
+    )
+    item = LeadResponse(
+        id=row[0],
+        first_name=row[1],
+        last_name=row[2],
+        email=row[3],
+        resume_url="/uploads/abc.pdf",
+        status=row[5],
+        created_at=row[6],
+        updated_at=row[7],
+    )
+    for rows, items, cursor in (([row], [item], "c"), ([], [], None)):
+        expected = LeadListResponse(items=items, count=7, next_cursor=cursor)
+        assert dump_lead_list(rows, 7, cursor) == expected.model_dump_json().encode()
+
+
+async def test_list_leads_invalid_cursor(client: AsyncClient, auth_headers: dict):
+    resp = await client.get(
+        "/api/v1/leads", params={"cursor": "not-a-cursor"}, headers=auth_headers
+    )
+    assert resp.status_code == 400
+
+
+async def test_update_lead_status_not_found(client: AsyncClient, auth_headers: dict):
+    resp = await client.patch(
+        f"/api/v1/leads/{uuid.uuid4()}/status",
+        json={"status": "REACHED_OUT"},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 404
+
+
+async def test_update_lead_status_bumps_updated_at(
+    client: AsyncClient, auth_headers: dict, sample_lead: dict
+):
+    resp = await client.patch(
+        f"/api/v1/leads/{sample_lead['id']}/status",
+        json={"status": "REACHED_OUT"},
+        headers=auth_headers,
+    )
+    assert resp.json()["updated_at"] > sample_lead["updated_at"]
+
+
+async def test_bulk_update_lead_status(
+    client: AsyncClient, auth_headers: dict, submit_leads
+):
+    pending, already = await submit_leads(2)
+    await client.patch(
+        f"/api/v1/leads/{already['id']}/status",
+        json={"status": "REACHED_OUT"},
+        headers=auth_headers,
+    )
+    missing = str(uuid.uuid4())
+
+    resp = await client.patch(
+        "/api/v1/leads/status",
+        json={"status": "REACHED_OUT", "ids": [pending["id"], already["id"], missing, pending["id"]]},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["updated"] == 1
+    assert body["results"] == [
+        {"id": pending["id"], "outcome": "updated"},
+        {"id": already["id"], "outcome": "conflict"},
+        {"id": missing, "outcome": "not_found"},
+    ]
+
+    lead = await client.get(f"/api/v1/leads/{pending['id']}", headers=auth_headers)
+    assert lead.json()["status"] == "REACHED_OUT"
+
+
+async def test_bulk_update_lead_status_validation(client: AsyncClient, auth_headers: dict):
+    for ids in ([], [str(uuid.uuid4()) for _ in range(MAX_BULK_STATUS_IDS + 1)]):
+        resp = await client.patch(
+            "/api/v1/leads/status",
+            json={"status": "REACHED_OUT", "ids": ids},
+            headers=auth_headers,
+        )
+        assert resp.status_code == 422
+    resp = await client.patch(
+        "/api/v1/leads/status",
+        json={"status": "PENDING", "ids": [str(uuid.uuid4())]},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 422
@@ -0,0 +1,69 @@
+"""SQL statement budgets per endpoint.
+
+An endpoint that starts issuing an extra query per request (a lazy load, a
+refresh after commit, a second existence check) fails here, not in production.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from httpx import AsyncClient
+
+from app.config import settings
+from app.database import STATEMENTS_PER_REQUEST
+
+LEADS = "/api/v1/leads/"
+
+
+async def test_submit_lead_budget(client: AsyncClient, sample_resume_file, max_queries):
+    # Outbox emails, the lead, the rollup counters; nothing read back.
+    with max_queries(3):
+        resp = await client.post(
+            LEADS,
+            data={"first_name": "Bud", "last_name": "Get", "email": "budget@example.com"},
+            files={"resume": sample_resume_file},
+        )
+    assert resp.status_code == 201
+    assert resp.json()["status"] == "PENDING"
+
+
+async def test_read_budgets(client: AsyncClient, auth_headers: dict, sample_lead, max_queries):
+    with max_queries(2):
+        assert (await client.get(LEADS, headers=auth_headers)).status_code == 200
+    with max_queries(2):
+        resp = await client.get(LEADS, params={"status": "PENDING", "limit": 1}, headers=auth_headers)
+        assert resp.json()["count"] == 1
+    with max_queries(1):
+        assert (await client.get(f"{LEADS}{sample_lead['id']}", headers=auth_headers)).status_code == 200
+    with max_queries(1):
+        assert (await client.get(f"{LEADS}changes", headers=auth_headers)).status_code == 200
+
+
+async def test_status_update_budget(client: AsyncClient, auth_headers: dict, sample_lead, max_queries):
+    # The conditional UPDATE ... RETURNING and the counter update.
+    with max_queries(2):
+        resp = await client.patch(
+            f"{LEADS}{sample_lead['id']}/status", json={"status": "REACHED_OUT"}, headers=auth_headers
+        )
+    assert resp.status_code == 200
+
+
+async def test_statements_are_recorded_per_route(client: AsyncClient, auth_headers: dict):
+    before = STATEMENTS_PER_REQUEST.count(LEADS)
+    statements = STATEMENTS_PER_REQUEST.sum(LEADS)
+    await client.get(LEADS, headers=auth_headers)
+    assert STATEMENTS_PER_REQUEST.count(LEADS) == before + 1
+    assert STATEMENTS_PER_REQUEST.sum(LEADS) == statements + 2
+
+
+async def test_slow_queries_are_logged_without_values(
+    client: AsyncClient, auth_headers: dict, monkeypatch, caplog
+):
+    monkeypatch.setattr(settings, "SLOW_QUERY_SECONDS", 0.0)
+    with caplog.at_level(logging.WARNING, logger="app.database"):
+        await client.get(LEADS, params={"email": "secret@example.com"}, headers=auth_headers)
+
+    slow = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Slow query")]
+    assert any("FROM leads" in message and "parameters: (str)" in message for message in slow)
+    assert not any("secret@example.com" in message for message in slow)
@@ -0,0 +1,149 @@
+"""Read/write routing with a read replica, on two SQLite files.
+
+Nothing replicates between the files, so a lead is visible on the replica
+only once a test copies it there: exactly the lag a real replica can have.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from app.api.dependencies import READ_PRIMARY_COOKIE, get_db, get_resources
+from app.config import settings
+from app.core.email import ConsoleEmailBackend
+from app.core.storage import LocalStorageBackend
+from app.database import Base, build_session_factory
+from app.main import app
+from app.models.lead import Lead
+from app.resources import Resources
+
+LEADS = "/api/v1/leads/"
+
+
+async def _sqlite_file(path: Path) -> AsyncEngine:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _register(dbapi_conn, _record):
+        dbapi_conn.create_function("gen_random_uuid", 0, lambda: uuid.uuid4().hex)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+@pytest.fixture
+async def replicated(tmp_path: Path, monkeypatch) -> AsyncGenerator[Resources, None]:
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    primary = await _sqlite_file(tmp_path / "primary.db")
+    replica = await _sqlite_file(tmp_path / "replica.db")
+    resources = Resources(
+        engine=primary,
+        session_factory=build_session_factory(primary),
+        storage=LocalStorageBackend(str(tmp_path / "uploads")),
+        email=ConsoleEmailBackend(),
+        read_engine=replica,
+        read_session_factory=build_session_factory(replica),
+    )
+
+    async def primary_db() -> AsyncGenerator[AsyncSession, None]:
+        async with resources.session_factory() as session:
+            yield session
+
+    previous_get_db = app.dependency_overrides[get_db]
+    app.dependency_overrides[get_db] = primary_db
+    app.dependency_overrides[get_resources] = lambda: resources
+    try:
+        yield resources
+    finally:
+        app.dependency_overrides[get_db] = previous_get_db
+        app.dependency_overrides.pop(get_resources, None)
+        await primary.dispose()
+        await replica.dispose()
+
+
+async def _replicate(resources: Resources) -> None:
+    async with resources.engine.connect() as source:
+        rows = (await source.execute(select(Lead.__table__))).mappings().all()
+    async with resources.read_engine.begin() as target:
+        await target.execute(Lead.__table__.delete())
+        if rows:
+            await target.execute(insert(Lead.__table__), [dict(row) for row in rows])
+
+
+async def test_reads_go_to_the_replica_and_writes_pin_the_writer_to_the_primary(
+    replicated: Resources, client: AsyncClient, auth_headers: dict, sample_resume_file
+):
+    resp = await client.post(
+        LEADS,
+        data={"first_name": "Rep", "last_name": "Lica", "email": "rep@example.com"},
+        files={"resume": sample_resume_file},
+    )
+    assert resp.status_code == 201
+    assert READ_PRIMARY_COOKIE in resp.cookies
+    lead_id = resp.json()["id"]
+
+    # The writer sees its lead straight away, from the primary.
+    assert (await client.get(f"{LEADS}{lead_id}", headers=auth_headers)).status_code == 200
+    assert (await client.get(LEADS, headers=auth_headers)).json()["count"] == 1
+
+    # Anyone else reads the replica, which has not caught up yet.
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as other:
+        assert (await other.get(f"{LEADS}{lead_id}", headers=auth_headers)).status_code == 404
+        await _replicate(replicated)
+        assert (await other.get(f"{LEADS}{lead_id}", headers=auth_headers)).status_code == 200
+        assert READ_PRIMARY_COOKIE not in (await other.get(LEADS, headers=auth_headers)).cookies
+
+
+async def test_status_updates_pin_and_the_pin_expires(
+    replicated: Resources, client: AsyncClient, auth_headers: dict, sample_lead: dict
+):
+    await _replicate(replicated)
+    client.cookies.clear()
+    resp = await client.patch(
+        f"{LEADS}{sample_lead['id']}/status", json={"status": "REACHED_OUT"}, headers=auth_headers
+    )
+    assert resp.status_code == 200
+
+    # Pinned: the update is visible although the replica still says PENDING.
+    resp = await client.get(f"{LEADS}{sample_lead['id']}", headers=auth_headers)
+    assert resp.json()["status"] == "REACHED_OUT"
+
+    client.cookies.set(READ_PRIMARY_COOKIE, f"{time.time() - 1:.3f}")
+    resp = await client.get(f"{LEADS}{sample_lead['id']}", headers=auth_headers)
+    assert resp.json()["status"] == "PENDING"
+
+
+async def test_without_a_replica_reads_use_the_primary_and_nothing_is_pinned(
+    client: AsyncClient, auth_headers: dict, sample_lead: dict
+):
+    resp = await client.patch(
+        f"{LEADS}{sample_lead['id']}/status", json={"status": "REACHED_OUT"}, headers=auth_headers
+    )
+    assert READ_PRIMARY_COOKIE not in resp.cookies
+    resp = await client.get(f"{LEADS}{sample_lead['id']}", headers=auth_headers)
+    assert resp.json()["status"] == "REACHED_OUT"
+
+
+async def test_lifespan_opens_and_closes_the_replica_pool(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    monkeypatch.setattr(settings, "READ_DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "LEAD_EVENTS_BACKEND", "off")
+    monkeypatch.setattr(settings, "EMAIL_DISPATCHER_ENABLED", False)
+    monkeypatch.setattr(settings, "DB_POOL_WARMUP", 2)
+    monkeypatch.setattr(app.state, "resources", Resources.build())
+
+    resources = app.state.resources
+    async with app.router.lifespan_context(app):
+        assert resources.read_engine.url.database.endswith("replica.db")
+        assert resources.read_engine.pool.checkedin() == 2
+    assert resources.read_engine.pool.checkedin() == 0
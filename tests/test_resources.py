@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.dependencies import get_resources
+from app.config import settings
+from app.core.email import ConsoleEmailBackend
+from app.core.storage import LocalStorageBackend
+from app.main import app
+from app.resources import Resources
+from tests.conftest import TestSessionLocal, test_engine
+
+
+@pytest.fixture
+def lifespan_settings(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "local")
+    monkeypatch.setattr(settings, "LEAD_EVENTS_BACKEND", "memory")
+    monkeypatch.setattr(settings, "LEAD_BATCH_WRITER_ENABLED", True)
+    monkeypatch.setattr(settings, "DB_POOL_WARMUP", 3)
+    # The app's container was built from the settings at import; the original
+    # is put back after the test.
+    monkeypatch.setattr(app.state, "resources", Resources.build())
+    return tmp_path
+
+
+async def test_lifespan_builds_once_warms_the_pool_and_drains(
+    lifespan_settings: Path, auth_headers: dict
+):
+    resources = app.state.resources
+    async with app.router.lifespan_context(app):
+        assert resources.engine.pool.checkedin() == 3
+        assert (lifespan_settings / "uploads").is_dir()
+        assert resources.lead_batch_writer is not None
+        assert resources.email_dispatcher is not None
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            for _ in range(3):
+                resp = await client.get("/uploads/missing.pdf", headers=auth_headers)
+                assert resp.status_code == 404
+            resp = await client.post(
+                "/api/v1/auth/login",
+                data={"username": "attorney@alma.com", "password": "password123"},
+            )
+            assert resp.status_code == 200
+        assert app.state.resources is resources
+
+    assert app.state.resources is not resources
+    assert resources.engine.pool.checkedin() == 0
+    assert resources.event_broker is None
+    assert resources.lead_batch_writer is None
+    assert resources.email_dispatcher is None
+    with pytest.raises(RuntimeError):  # the hashing pool is shut down
+        await resources.password_hasher.hash("password123")
+
+
+async def test_dependencies_share_one_container_without_lifespan(
+    client: AsyncClient, sample_resume_file
+):
+    built = app.state.resources
+    for i in range(2):
+        resp = await client.post(
+            "/api/v1/leads",
+            data={"first_name": "Ann", "last_name": "Lee", "email": f"ann{i}@example.com"},
+            files={"resume": sample_resume_file},
+        )
+        assert resp.status_code == 201
+    assert app.state.resources is built
+    assert built.email_dispatcher is None and built.event_broker is None
+
+
+async def test_container_can_be_overridden(
+    client: AsyncClient, tmp_path: Path, sample_resume_file
+):
+    storage = LocalStorageBackend(str(tmp_path))
+    resources = Resources(
+        engine=test_engine,
+        session_factory=TestSessionLocal,
+        storage=storage,
+        email=ConsoleEmailBackend(),
+    )
+    app.dependency_overrides[get_resources] = lambda: resources
+    try:
+        resp = await client.post(
+            "/api/v1/leads",
+            data={"first_name": "Ann", "last_name": "Lee", "email": "ann@example.com"},
+            files={"resume": sample_resume_file},
+        )
+    finally:
+        app.dependency_overrides.pop(get_resources, None)
+
+    assert resp.status_code == 201
+    name = resp.json()["resume_url"].removeprefix("/uploads/")
+    assert await storage.get_path(name) is not None
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from httpx import AsyncClient
+
+from app.api.dependencies import get_storage
+from app.main import app
+
+
+async def test_download_requires_auth(client: AsyncClient, sample_lead: dict):
+    resp = await client.get(sample_lead["resume_url"])
+    assert resp.status_code == 401
+
+
+async def test_download_resume(
+    client: AsyncClient, auth_headers: dict, sample_lead: dict, sample_resume_file
+):
+    resp = await client.get(sample_lead["resume_url"], headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.content == sample_resume_file[1]
+    assert resp.headers["content-type"] == "application/pdf"
+    assert resp.headers["accept-ranges"] == "bytes"
+    assert resp.headers["etag"].startswith('"')
+    assert "last-modified" in resp.headers
+
+
+async def test_download_conditional_get(client: AsyncClient, auth_headers: dict, sample_lead: dict):
+    first = await client.get(sample_lead["resume_url"], headers=auth_headers)
+
+    by_etag = await client.get(
+        sample_lead["resume_url"],
+        headers={**auth_headers, "If-None-Match": first.headers["etag"]},
+    )
+    assert by_etag.status_code == 304
+    assert by_etag.content == b""
+    assert by_etag.headers["etag"] == first.headers["etag"]
+
+    by_date = await client.get(
+        sample_lead["resume_url"],
+        headers={**auth_headers, "If-Modified-Since": first.headers["last-modified"]},
+    )
+    assert by_date.status_code == 304
+
+    stale = await client.get(
+        sample_lead["resume_url"], headers={**auth_headers, "If-None-Match": '"stale"'}
+    )
+    assert stale.status_code == 200
+
+
+async def test_download_byte_range(
+    client: AsyncClient, auth_headers: dict, sample_lead: dict, sample_resume_file
+):
+    resp = await client.get(
+        sample_lead["resume_url"], headers={**auth_headers, "Range": "bytes=0-7"}
+    )
+    assert resp.status_code == 206
+    assert resp.content == sample_resume_file[1][:8]
+    assert resp.headers["content-range"].startswith("bytes 0-7/")
+
+
+async def test_download_unknown_or_unsafe_names(client: AsyncClient, auth_headers: dict):
+    for path in ("/uploads/missing.pdf", "/uploads/.incoming", "/uploads/..%2F.env"):
+        resp = await client.get(path, headers=auth_headers)
+        assert resp.status_code == 404, path
+
+
+class _RemoteStorage:
+    """Stands in for a backend that keeps no local files."""
+
+    files = {"remote.pdf": b"%PDF-1.4 remote"}
+
+    async def get_path(self, filename: str):
+        return None
+
+    async def get_url(self, filename: str):
+        return None
+
+    async def open_stream(self, filename: str):
+        if filename not in self.files:
+            raise FileNotFoundError(filename)
+        yield self.files[filename]
+
+
+async def test_download_streams_from_remote_backend(client: AsyncClient, auth_headers: dict):
+    app.dependency_overrides[get_storage] = _RemoteStorage
+    try:
+        found = await client.get("/uploads/remote.pdf", headers=auth_headers)
+        missing = await client.get("/uploads/other.pdf", headers=auth_headers)
+    finally:
+        del app.dependency_overrides[get_storage]
+    assert found.status_code == 200
+    assert found.content == b"%PDF-1.4 remote"
+    assert missing.status_code == 404
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import os
+
+from app import serve
+
+
+def test_workers_follow_the_cpu_affinity_mask(monkeypatch, tmp_path):
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 1, 2, 3}, raising=False)
+    monkeypatch.setattr(serve, "CGROUP_CPU_MAX", str(tmp_path / "missing"))
+    assert serve.available_cpus() == 4
+    assert serve.worker_count() == 4
+    assert serve.worker_count(2) == 2
+
+
+def test_workers_are_capped_by_the_cgroup_quota(monkeypatch, tmp_path):
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(64)), raising=False)
+    cpu_max = tmp_path / "cpu.max"
+    monkeypatch.setattr(serve, "CGROUP_CPU_MAX", str(cpu_max))
+
+    cpu_max.write_text("150000 100000\n")  # --cpus 1.5
+    assert serve.available_cpus() == 2
+    cpu_max.write_text("50000 100000\n")
+    assert serve.available_cpus() == 1
+    cpu_max.write_text("max 100000\n")
+    assert serve.available_cpus() == 64
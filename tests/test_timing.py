@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from httpx import ASGITransport, AsyncClient
+
+from app.core.timing import REQUEST_DURATION, STAGE_DURATION, TimingMiddleware, span
+
+LEADS = "/api/v1/leads/"
+
+
+async def test_lead_submission_reports_its_stages(client: AsyncClient, sample_resume_file):
+    created = REQUEST_DURATION.count("POST", LEADS, "201")
+    resp = await client.post(
+        LEADS,
+        data={"first_name": "Tim", "last_name": "Ing", "email": "tim@example.com"},
+        files={"resume": sample_resume_file},
+    )
+    assert resp.status_code == 201
+
+    stages = dict(entry.split(";dur=") for entry in resp.headers["server-timing"].split(", "))
+    # "sql" is the total of the statements, which run inside "db.create".
+    assert list(stages) == ["multipart", "storage.save", "sql", "db.create", "app"]
+    # Each duration is rounded to 0.01 ms.
+    spans = sum(float(ms) for name, ms in stages.items() if name not in ("app", "sql"))
+    assert float(stages["app"]) + 0.05 >= spans
+    assert REQUEST_DURATION.count("POST", LEADS, "201") == created + 1
+
+    metrics = (await client.get("/metrics")).text
+    assert f'http_request_stage_seconds_count{{route="{LEADS}",stage="storage.save"}}' in metrics
+    assert (
+        f'http_request_duration_seconds_bucket{{method="POST",route="{LEADS}",status="201",le="+Inf"}}'
+        in metrics
+    )
+
+
+async def test_routes_are_labelled_by_template(client: AsyncClient, auth_headers: dict, sample_lead):
+    template = "/api/v1/leads/{lead_id}"
+    before = REQUEST_DURATION.count("GET", template, "200")
+    resp = await client.get(f"/api/v1/leads/{sample_lead['id']}", headers=auth_headers)
+    assert resp.headers["server-timing"].startswith("sql;dur=")
+    assert "db.get;dur=" in resp.headers["server-timing"]
+    assert REQUEST_DURATION.count("GET", template, "200") == before + 1
+
+    unmatched = REQUEST_DURATION.count("GET", "unmatched", "404")
+    assert (await client.get("/no/such/page")).status_code == 404
+    assert REQUEST_DURATION.count("GET", "unmatched", "404") == unmatched + 1
+
+
+async def test_spans_outside_requests_and_disabled_header():
+    before = STAGE_DURATION.count("background", "test.stage")
+    with span("test.stage"):
+        pass
+    assert STAGE_DURATION.count("background", "test.stage") == before + 1
+
+    async def plain(scope, receive, send):
+        with span("test.stage"):
+            await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    app = TimingMiddleware(plain, server_timing=False)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/")
+    assert resp.status_code == 204 and "server-timing" not in resp.headers
+    assert STAGE_DURATION.count("unmatched", "test.stage") >= 1
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from app.config import settings
+from app.core.token_cache import LOOKUPS, TokenCache
+from app.services.auth_service import create_access_token, token_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_token_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+@pytest.fixture
+def lookups():
+    """``lookups()`` is ``(hits, misses)`` counted since the test started."""
+    start = LOOKUPS.value("hit"), LOOKUPS.value("miss")
+    return lambda: (LOOKUPS.value("hit") - start[0], LOOKUPS.value("miss") - start[1])
+
+
+async def test_repeat_requests_hit_the_cache(client: AsyncClient, auth_headers: dict, lookups):
+    for _ in range(3):
+        resp = await client.get("/api/v1/leads", headers=auth_headers)
+        assert resp.status_code == 200
+    assert lookups() == (2, 1)
+
+    metrics = (await client.get("/metrics")).text
+    assert 'auth_token_cache_lookups_total{result="hit"}' in metrics
+
+
+async def test_tampered_token_still_rejected(client: AsyncClient, auth_headers: dict):
+    assert (await client.get("/api/v1/leads", headers=auth_headers)).status_code == 200
+
+    tampered = auth_headers["Authorization"][:-2] + "xx"
+    resp = await client.get("/api/v1/leads", headers={"Authorization": tampered})
+    assert resp.status_code == 401
+    assert resp.json()["detail"] == "Invalid or expired token"
+
+
+async def test_expired_token_evicted_and_rejected(client: AsyncClient):
+    token = create_access_token({"sub": "attorney@alma.com"}, expires_delta=timedelta(seconds=1))
+    headers = {"Authorization": f"Bearer {token}"}
+    assert (await client.get("/api/v1/leads", headers=headers)).status_code == 200
+    assert len(token_cache) == 1
+
+    await asyncio.sleep(2)
+    resp = await client.get("/api/v1/leads", headers=headers)
+    assert resp.status_code == 401
+    assert len(token_cache) == 0
+
+
+async def test_cache_can_be_disabled(
+    client: AsyncClient, auth_headers: dict, monkeypatch, lookups
+):
+    monkeypatch.setattr(settings, "TOKEN_CACHE_ENABLED", False)
+    for _ in range(2):
+        assert (await client.get("/api/v1/leads", headers=auth_headers)).status_code == 200
+    assert lookups() == (0, 0)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TokenCache(maxsize=2)
+    exp = time.time() + 60
+    cache.put("a", {"exp": exp})
+    cache.put("b", {"exp": exp})
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.put("c", {"exp": exp})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
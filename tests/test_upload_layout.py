@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import uuid
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+from httpx import AsyncClient
+
+from app.api.dependencies import get_storage
+from app.commands.shard_uploads import shard_uploads
+from app.core.storage import ContentAddressedStorageBackend, LocalStorageBackend, shard_path
+from app.main import app
+
+PDF = b"%PDF-1.4 resume body"
+
+
+def _flat_files(root: Path, count: int) -> list[str]:
+    """Files as the flat layout stored them, directly under *root*."""
+    names = []
+    for i in range(count):
+        name = f"{uuid.uuid4().hex}.pdf"
+        (root / name).write_bytes(PDF + str(i).encode())
+        names.append(name)
+    return names
+
+
+@pytest.fixture
+def storage(tmp_path: Path):
+    storage = LocalStorageBackend(str(tmp_path))
+    app.dependency_overrides[get_storage] = lambda: storage
+    yield storage
+    app.dependency_overrides.pop(get_storage, None)
+
+
+async def test_new_files_are_sharded_by_name(storage: LocalStorageBackend, tmp_path: Path):
+    name = await storage.save(UploadFile(io.BytesIO(PDF)), "cv.pdf")
+    path = await storage.get_path(name)
+    assert path == tmp_path / name[:2] / name[2:4] / name
+    assert path.read_bytes() == PDF
+    await storage.delete(name)
+    assert not path.exists()
+
+
+async def test_legacy_flat_names_keep_working(
+    client: AsyncClient, auth_headers: dict, storage: LocalStorageBackend, tmp_path: Path
+):
+    [name] = _flat_files(tmp_path, 1)
+    resp = await client.get(f"/uploads/{name}", headers=auth_headers)
+    assert resp.status_code == 200 and resp.content == PDF + b"0"
+    assert b"".join([chunk async for chunk in storage.open_stream(name)]) == PDF + b"0"
+
+    await storage.delete(name)
+    assert not (tmp_path / name).exists()
+
+
+async def test_shard_uploads_moves_files_in_batches_and_resumes(
+    client: AsyncClient, auth_headers: dict, storage: LocalStorageBackend, tmp_path: Path
+):
+    names = _flat_files(tmp_path, 25)
+    # An earlier run was interrupted after linking one file but before
+    # removing its flat name, and after moving a few others.
+    shard_path(tmp_path, names[0]).parent.mkdir(parents=True)
+    shard_path(tmp_path, names[0]).hardlink_to(tmp_path / names[0])
+    assert await storage.reshard(names[1:4]) == 3
+
+    batches = []
+    assert await shard_uploads(storage, batch_size=10, progress=batches.append) == 22
+    assert batches == [10, 20, 22]
+    assert storage.flat_names() == []
+    assert sorted(storage.stored_names()) == sorted(names)
+    for i, name in enumerate(names):
+        assert shard_path(tmp_path, name).read_bytes() == PDF + str(i).encode()
+    resp = await client.get(f"/uploads/{names[-1]}", headers=auth_headers)
+    assert resp.content == PDF + b"24"
+
+
+async def test_shard_uploads_moves_reference_counts(tmp_path: Path):
+    storage = ContentAddressedStorageBackend(str(tmp_path))
+    # A deduplicated file and its count as the flat layout stored them.
+    name = f"{hashlib.sha256(PDF).hexdigest()}.pdf"
+    (tmp_path / name).write_bytes(PDF)
+    (storage.refs_dir / name).write_bytes(b"2")
+
+    # Saving the same content finds the flat copy and bumps the flat count.
+    assert await storage.save(UploadFile(io.BytesIO(PDF)), "cv.pdf") == name
+    assert not shard_path(tmp_path, name).exists()
+
+    assert await shard_uploads(storage) == 1
+    assert not (storage.refs_dir / name).exists()
+    assert shard_path(storage.refs_dir, name).read_bytes() == b"3"
+    for _ in range(3):
+        assert (await storage.get_path(name)).read_bytes() == PDF
+        await storage.delete(name)
+    assert not (await storage.get_path(name)).exists()
+    assert not shard_path(storage.refs_dir, name).exists()
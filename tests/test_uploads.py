@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from httpx import AsyncClient
+
+from app.api.routes.leads import MAX_FILE_SIZE
+from app.config import settings
+from app.core.storage import shard_path
+
+FORM = {"first_name": "Alice", "last_name": "Smith", "email": "alice@example.com"}
+SPOOL_DIR = Path(settings.UPLOAD_DIR) / ".incoming"
+
+
+def _spooled_files() -> set[Path]:
+    return set(SPOOL_DIR.glob("*")) if SPOOL_DIR.exists() else set()
+
+
+async def test_accepted_resume_is_stored_intact(client: AsyncClient):
+    content = b"PK\x03\x04" + b"docx body" * 1000
+    before = _spooled_files()
+    resp = await client.post(
+        "/api/v1/leads",
+        data=FORM,
+        files={"resume": ("cv.docx", content, "application/octet-stream")},
+    )
+    assert resp.status_code == 201
+    stored = shard_path(
+        Path(settings.UPLOAD_DIR), resp.json()["resume_url"].removeprefix("/uploads/")
+    )
+    assert stored.read_bytes() == content
+    assert _spooled_files() == before
+
+
+async def test_resume_content_must_match_extension(client: AsyncClient):
+    resp = await client.post(
+        "/api/v1/leads",
+        data=FORM,
+        files={"resume": ("resume.pdf", b"MZ\x90\x00 not a pdf", "application/pdf")},
+    )
+    assert resp.status_code == 422
+    assert "Invalid file type" in resp.json()["detail"]
+
+
+async def test_oversized_resume_is_rejected_while_streaming(client: AsyncClient):
+    chunk = b"0" * (256 * 1024)
+    chunks_sent = 0
+    boundary = "testboundary"
+    head = "".join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{k}"\r\n\r\n{v}\r\n'
+        for k, v in FORM.items()
+    )
+    head += (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="resume"; filename="big.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n%PDF-1.4\n"
+    )
+
+    async def body():
+        nonlocal chunks_sent
+        yield head.encode()
+        for _ in range(4 * MAX_FILE_SIZE // len(chunk)):
+            chunks_sent += 1
+            yield chunk
+
+    before = _spooled_files()
+    resp = await client.post(
+        "/api/v1/leads",
+        content=body(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+    assert resp.status_code == 422
+    assert resp.json()["detail"].startswith("File too large")
+    # Parsing stopped just past the limit rather than reading all 20 MB.
+    assert chunks_sent <= MAX_FILE_SIZE // len(chunk) + 2
+    assert _spooled_files() == before
+
+
+async def test_declared_oversized_body_is_rejected_up_front(client: AsyncClient):
+    resp = await client.post(
+        "/api/v1/leads",
+        content=b"",
+        headers={
+            "Content-Type": "multipart/form-data; boundary=x",
+            "Content-Length": str(10 * MAX_FILE_SIZE),
+        },
+    )
+    assert resp.status_code == 422
+    assert resp.json()["detail"].startswith("File too large")
+
+
+async def test_truncated_body_leaves_nothing_spooled(client: AsyncClient):
+    boundary = "testboundary"
+    body = "".join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{k}"\r\n\r\n{v}\r\n'
+        for k, v in FORM.items()
+    )
+    body += (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="resume"; filename="cut.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n%PDF-1.4 cut off before the closing boundary"
+    )
+    resp = await client.post(
+        "/api/v1/leads",
+        content=body.encode(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+    assert resp.status_code == 422
+    assert resp.json()["detail"] == "Malformed multipart body"
+    assert not _spooled_files()